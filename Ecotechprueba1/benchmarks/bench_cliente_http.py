@@ -0,0 +1,125 @@
+# benchmarks/bench_cliente_http.py
+"""
+ClienteMindicador contra un servidor HTTP local que imita a mindicador.cl (sin red):
+
+1) requests.get suelto (una conexión TCP por consulta) vs la sesión del cliente (keep-alive).
+2) Servidor inestable (503 intercalados): los reintentos con backoff los absorben.
+3) Servidor caído (503 siempre): el cortacircuitos se abre y las siguientes
+   consultas fallan al instante en vez de esperar reintentos y timeouts.
+4) Servidor colgado: el timeout de lectura corta la espera.
+
+    python benchmarks/bench_cliente_http.py [consultas]
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model.cliente_mindicador import CircuitoAbierto, ClienteMindicador
+
+CONSULTAS = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True  # cabeceras y cuerpo van en escrituras separadas
+    modo = 'ok'                    # 'ok', 'inestable' (1 de cada 3 → 503), 'caido', 'colgado'
+    pedidos = 0
+
+    def do_GET(self):
+        _Stub.pedidos += 1
+        if self.modo == 'colgado':
+            time.sleep(1.0)
+        if self.modo == 'caido' or (self.modo == 'inestable' and _Stub.pedidos % 3 == 0):
+            return self._responder(503, {'error': 'mantención'})
+        codigo = self.path.strip('/').split('/')[0]
+        self._responder(200, {'codigo': codigo, 'serie': [{'fecha': '2025-01-02T03:00:00.000Z', 'valor': 38416.69}]})
+
+    def _responder(self, estado, cuerpo):
+        datos = json.dumps(cuerpo).encode()
+        self.send_response(estado)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def log_message(self, *args):
+        pass
+
+
+def medir(funcion, n):
+    inicio = time.perf_counter()
+    for _ in range(n):
+        funcion()
+    return (time.perf_counter() - inicio) / n
+
+
+def main():
+    import requests
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), _Stub)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}/api"
+    ClienteMindicador.ESPERA_BASE = 0.01  # esperas cortas para que el benchmark no dure minutos
+    ClienteMindicador.TIMEOUT_LECTURA = 0.2
+    ClienteMindicador.ENFRIAMIENTO = 0.5
+    cliente = ClienteMindicador(url_base=url)
+
+    print(f"Servidor local {url}, {CONSULTAS} consultas por caso")
+    suelto = medir(lambda: requests.get(f"{url}/uf", timeout=12).json(), CONSULTAS)
+    sesion = medir(lambda: cliente.serie('uf'), CONSULTAS)
+    print(f"  1) requests.get suelto {suelto * 1000:6.2f} ms  |  sesión keep-alive {sesion * 1000:6.2f} ms "
+          f"({suelto / sesion:.1f}x)")
+
+    _Stub.modo, _Stub.pedidos = 'inestable', 0
+    fallidas = 0
+    for _ in range(CONSULTAS):
+        try:
+            cliente.serie('dolar', '2025-01-02')
+        except requests.exceptions.HTTPError:
+            fallidas += 1
+    reintentos = cliente.estadisticas()['endpoints']['dolar/fecha']['reintentos']
+    print(f"  2) inestable: {CONSULTAS - fallidas}/{CONSULTAS} correctas, {reintentos} reintentos")
+
+    _Stub.modo = 'caido'
+    tiempos, rapidas = [], 0
+    for _ in range(10):
+        inicio = time.perf_counter()
+        try:
+            cliente.serie('euro')
+        except CircuitoAbierto:
+            rapidas += 1
+        except requests.exceptions.HTTPError:
+            pass
+        tiempos.append(time.perf_counter() - inicio)
+    estado = cliente.estadisticas()
+    print(f"  3) caído: 3 primeras {sum(tiempos[:3]) / 3 * 1000:.1f} ms c/u (con reintentos), "
+          f"{rapidas} rechazadas por el circuito en {sum(tiempos[3:]) / 7 * 1e6:.0f} µs c/u; "
+          f"circuito {estado['estado']}")
+    _Stub.modo = 'ok'
+    time.sleep(ClienteMindicador.ENFRIAMIENTO)
+    cliente.serie('euro')
+    print(f"     vuelve el servidor tras el enfriamiento: circuito {cliente.estado}")
+
+    _Stub.modo = 'colgado'
+    inicio = time.perf_counter()
+    try:
+        cliente.serie('utm')
+    except requests.exceptions.Timeout:
+        pass
+    print(f"  4) colgado: se abandona a los {(time.perf_counter() - inicio) * 1000:.0f} ms "
+          f"({ClienteMindicador.REINTENTOS + 1} intentos de {ClienteMindicador.TIMEOUT_LECTURA * 1000:.0f} ms)")
+
+    print("  Latencias por endpoint:")
+    for nombre, e in cliente.estadisticas()['endpoints'].items():
+        print(f"    {nombre:<12} {e['llamadas']:>5} llamadas {e['errores']:>3} errores {e['reintentos']:>4} reintentos "
+              f"p50 {e['p50_ms']} ms p95 {e['p95_ms']} ms")
+    cliente.cerrar()
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_filas.py
+"""
+Filas dict (iterar) vs compactas (iterar_compacto: 'tupla' y 'registro') al
+recorrer registro_tiempo en SQLite en memoria:
+
+1) Memoria retenida por fila al guardar todo el resultado en una lista (tracemalloc),
+   y cuánto de eso es el contenedor (dict / tupla) sin contar los valores.
+2) Filas por segundo en un recorrido completo sin guardar nada (exportación).
+
+    python benchmarks/bench_filas.py [registros]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import DatabaseConnection
+
+REGISTROS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+QUERY = "SELECT id, empleado_id, proyecto_id, fecha, horas, descripcion FROM registro_tiempo ORDER BY id"
+
+
+def preparar(modelo, empleados=300):
+    with modelo.cursor(escritura=True) as cursor:
+        cursor.execute("INSERT INTO proyecto (nombre, fecha_inicio) VALUES ('Grande', '2025-01-01')")
+        cursor.executemany("INSERT INTO empleado (nombre, email, fecha_contratacion, salario) "
+                           "VALUES (%s, %s, '2025-01-01', 1000)",
+                           [(f"E{i}", f"e{i}@eco.cl") for i in range(empleados)])
+        cursor.executemany("INSERT INTO registro_tiempo (empleado_id, proyecto_id, fecha, horas, descripcion) "
+                           "VALUES (%s, 1, %s, 0.1, %s)",
+                           [(i % empleados + 1, f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}", f"tarea {i % 50}")
+                            for i in range(REGISTROS)])
+
+
+def main():
+    DatabaseConnection.configurar('sqlite', ':memory:')
+    from model.inicializador_bd import InicializadorBDCompleto
+    from model.registro_tiempo import RegistroTiempo
+    InicializadorBDCompleto.inicializar(mostrar=lambda *a: None)
+    modelo = RegistroTiempo.compartido()
+    preparar(modelo)
+
+    formas = (
+        ('dict (iterar)', lambda: modelo.iterar(QUERY)),
+        ('tupla', lambda: modelo.iterar_compacto(QUERY, formato='tupla')),
+        ('registro (__slots__)', lambda: modelo.iterar_compacto(QUERY, formato='registro')),
+    )
+    print(f"Recorrido de {REGISTROS:,} registros (6 columnas) en SQLite en memoria")
+    print(f"  {'formato':<22} {'bytes/fila':>10} {'contenedor':>10} {'filas/s':>12}")
+    resultados = {}
+    for nombre, filas in formas:
+        # Memoria: todo el resultado retenido en una lista
+        tracemalloc.start()
+        lista = list(filas())
+        por_fila = tracemalloc.get_traced_memory()[0] / len(lista)
+        tracemalloc.stop()
+        assert len(lista) == REGISTROS
+        contenedor = sys.getsizeof(lista[0])  # sin los valores, que son los mismos objetos en los tres
+        del lista
+
+        # Velocidad: recorrido completo leyendo una columna, sin retener filas
+        inicio = time.perf_counter()
+        total = 0
+        for fila in filas():
+            total += fila[4] if nombre == 'tupla' else fila['horas']
+        por_segundo = REGISTROS / (time.perf_counter() - inicio)
+        resultados[nombre] = (por_fila, por_segundo)
+        print(f"  {nombre:<22} {por_fila:>10.0f} {contenedor:>10} {por_segundo:>12,.0f}")
+
+    base_mem, base_vel = resultados['dict (iterar)']
+    for nombre, (mem, vel) in list(resultados.items())[1:]:
+        print(f"  → {nombre}: {base_mem / mem:.1f}x menos memoria, {vel / base_vel:.2f}x filas/s")
+    DatabaseConnection.close_connection()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_indicadores.py
+"""
+AlmacenIndicadores: tiempo por consulta según el nivel que la sirve. La API de
+mindicador.cl se reemplaza por una función con latencia fija (sin red), sobre
+SQLite en memoria:
+
+1) Primera consulta de 30 fechas históricas → API (y escritura en segundo plano).
+2) Las mismas, otra vez → memoria.
+3) Con la memoria vaciada (otro proceso, reinicio) → tabla indicador_economico.
+4) Sin conexión: hoy servido de lo último conocido.
+
+    python benchmarks/bench_indicadores.py [latencia_api_ms]
+"""
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import DatabaseConnection
+
+LATENCIA = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.3
+FECHAS = [(date.today() - timedelta(days=d)).isoformat() for d in range(1, 31)]
+
+
+def main():
+    DatabaseConnection.configurar('sqlite', ':memory:')
+    from model.almacen_indicadores import AlmacenIndicadores, ValorIndicador
+    from model.inicializador_bd import InicializadorBDCompleto
+    InicializadorBDCompleto.inicializar(mostrar=lambda *a: None)
+
+    en_linea = [True]
+
+    def api_simulada(cls, codigo, fecha):
+        time.sleep(LATENCIA)
+        if not en_linea[0]:
+            raise ConnectionError("sin red")
+        return ValorIndicador(codigo, fecha or date.today().isoformat(), 37000 + len(fecha or ''), 'api')
+
+    AlmacenIndicadores._pedir_api = classmethod(api_simulada)
+
+    def medir(titulo, fecha_de=FECHAS):
+        origenes = set()
+        inicio = time.perf_counter()
+        for fecha in fecha_de:
+            origenes.add(AlmacenIndicadores.consultar('uf', fecha).origen)
+        por_consulta = (time.perf_counter() - inicio) / len(fecha_de)
+        print(f"  {titulo:<34} {'/'.join(sorted(origenes)):<22} {por_consulta * 1e6:>12,.1f} µs")
+        return por_consulta
+
+    print(f"{len(FECHAS)} fechas de UF, API simulada a {LATENCIA * 1000:.0f} ms")
+    print(f"  {'paso':<34} {'origen':<22} {'por consulta':>15}")
+    api = medir("1) primera vez")
+    AlmacenIndicadores.detener()  # espera la escritura en segundo plano
+    memoria = medir("2) repetida")
+    AlmacenIndicadores.limpiar()
+    tabla = medir("3) memoria vacía")
+    medir("   (y de nuevo)")
+
+    medir("hoy, en línea", [None])
+    en_linea[0] = False
+    AlmacenIndicadores._memoria.clear()
+    medir("4) hoy, sin conexión", [None])
+    medir("   histórico, sin conexión")
+
+    stats = AlmacenIndicadores.estadisticas()
+    print(f"  → memoria {api / memoria:,.0f}x y tabla {api / tabla:,.0f}x más rápidas que la API; "
+          f"{stats['escritos']} valores escritos en segundo plano, {stats['errores_escritura']} errores")
+    DatabaseConnection.close_connection()
+
+
+if __name__ == '__main__':
+    main()
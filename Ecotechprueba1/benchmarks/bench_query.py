@@ -0,0 +1,144 @@
+# benchmarks/bench_query.py
+"""
+Microbenchmark del camino caliente de BaseModel.ejecutar:
+clasificación por texto (strip().upper() por llamada) vs Query precompilada.
+Usa una conexión falsa para medir solo el costo en Python.
+
+    python benchmarks/bench_query.py
+"""
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import DatabaseConnection
+from model.base_model import BaseModel
+from model.query import Query
+
+QUERY = """
+    SELECT e.*, d.nombre AS departamento_nombre
+    FROM empleado e
+    LEFT JOIN departamento d ON e.departamento_id = d.id
+    WHERE e.id = %s
+"""
+
+
+class _Cursor:
+    lastrowid = 1
+    rowcount = 1
+    _fila = {'id': 1}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params):
+        pass
+
+    def fetchone(self):
+        return self._fila
+
+    def fetchall(self):
+        return [self._fila]
+
+
+class _Conn:
+    _cursor = _Cursor()
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def get_autocommit(self):
+        return True
+
+
+class _Pool:
+    _conn = _Conn()
+
+    def conexion(self):
+        return self
+
+    def __enter__(self):
+        return self._conn
+
+    def __exit__(self, *exc):
+        return False
+
+
+def ejecutar_antiguo(pool, query, params=None, fetch_one=False):
+    """Réplica del ejecutar() anterior (clasifica el texto en cada llamada)"""
+    with pool.conexion() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(query, params or ())
+            if query.strip().upper().startswith("SELECT"):
+                result = cursor.fetchone() if fetch_one else cursor.fetchall()
+                return result if result else ({} if fetch_one else [])
+            elif query.strip().upper().startswith("INSERT"):
+                conn.commit()
+                return cursor.lastrowid
+            else:
+                conn.commit()
+                return cursor.rowcount
+
+
+def actualizar_antiguo(pool, empleado_id, **campos):
+    sets = []
+    valores = []
+    for campo, valor in campos.items():
+        sets.append(f"{campo} = %s")
+        valores.append(valor)
+    valores.append(empleado_id)
+    query = f"UPDATE empleado SET {', '.join(sets)} WHERE id = %s"
+    return ejecutar_antiguo(pool, query, tuple(valores))
+
+
+def medir(nombre, funcion, n=200_000):
+    funcion()
+    segundos = min(timeit.repeat(funcion, number=n, repeat=5))
+    tracemalloc.start()
+    for _ in range(1000):
+        funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:<32} {segundos / n * 1e9:>8.0f} ns/llamada   pico {pico:>7} B / 1000 llamadas")
+    return segundos
+
+
+def main():
+    pool = _Pool()
+    DatabaseConnection._pool = pool
+    modelo = BaseModel()
+    campos = {'nombre': 'Ana', 'email': 'ana@eco.cl', 'salario': 100.0}
+
+    print("Clasificación de la sentencia (UPDATE: peor caso, dos strip/upper)")
+    texto = "UPDATE empleado SET nombre = %s WHERE id = %s"
+    a = medir("  antiguo (strip/upper x2)", lambda: texto.strip().upper().startswith("SELECT")
+              or texto.strip().upper().startswith("INSERT"), n=1_000_000)
+    b = medir("  Query.compilar (caché)", lambda: Query.compilar(texto).es_lectura
+              or Query.compilar(texto).es_insercion, n=1_000_000)
+    print(f"  → {a / b:.2f}x\n")
+
+    print("SELECT por id")
+    a = medir("  antiguo (strip/upper)", lambda: ejecutar_antiguo(pool, QUERY, (1,), True))
+    b = medir("  Query cacheada", lambda: modelo.ejecutar(QUERY, (1,), fetch_one=True))
+    print(f"  → {a / b:.2f}x\n")
+
+    print("UPDATE dinámico (3 columnas)")
+    a = medir("  antiguo (f-string + join)", lambda: actualizar_antiguo(pool, 1, **campos))
+    b = medir("  UPDATE cacheado por columnas",
+              lambda: modelo._actualizar_campos('empleado', 1, campos, campos.keys()))
+    print(f"  → {a / b:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
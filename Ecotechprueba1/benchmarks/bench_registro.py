@@ -0,0 +1,153 @@
+# benchmarks/bench_registro.py
+"""
+Registro de horas: camino anterior (buscar empleado + buscar proyecto con
+GROUP_CONCAT + INSERT = 3 idas y vueltas) vs RegistroTiempo.registrar
+(un INSERT ... SELECT que valida todo, incluido el tope diario).
+
+1) Conexiones falsas con latencia fija por sentencia: costo de red.
+2) SQLite en memoria con datos: trabajo de la base por registro.
+
+    python benchmarks/bench_registro.py [latencia_ms]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import DatabaseConnection
+from config.pool import PoolConexiones
+
+LATENCIA = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 1.0 / 1000
+SENTENCIAS = [0]
+
+
+class _Cursor:
+    lastrowid = 1
+    rowcount = 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        SENTENCIAS[0] += 1
+        time.sleep(LATENCIA)
+
+    def fetchone(self):
+        return {'id': 1}
+
+    def fetchall(self):
+        return [{'id': 1}]
+
+
+class _Conn:
+    open = True
+
+    def cursor(self, *args):
+        return _Cursor()
+
+    def get_autocommit(self):
+        return True
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+def registrar_antiguo(modelo, empleado_id, proyecto_id, fecha, horas, descripcion=""):
+    """Camino anterior: dos búsquedas completas y luego el INSERT"""
+    from model.empleado import Empleado
+    from model.proyecto import Proyecto
+    if not Empleado.compartido().buscar_por_id(empleado_id):
+        return None
+    if not Proyecto.compartido().buscar_por_id(proyecto_id):
+        return None
+    return modelo.ejecutar(modelo._SQL_INSERTAR, (
+        empleado_id, proyecto_id, fecha, round(horas, 2), descripcion.strip() or None
+    ))
+
+
+def medir(funcion, n):
+    inicio = time.perf_counter()
+    for i in range(n):
+        funcion(i)
+    return (time.perf_counter() - inicio) / n
+
+
+def silencioso(funcion):
+    def envoltura(i):
+        salida, sys.stdout = sys.stdout, open(os.devnull, 'w')
+        try:
+            funcion(i)
+        finally:
+            sys.stdout.close()
+            sys.stdout = salida
+    return envoltura
+
+
+def con_latencia(n=200):
+    from model.horas_diarias import HorasDiarias
+    from model.registro_tiempo import RegistroTiempo
+    DatabaseConnection._pool = PoolConexiones(_Conn, min_size=1, max_size=1)
+    HorasDiarias._con_triggers = True  # la conexión falsa no sabe responder por los triggers
+    modelo = RegistroTiempo()
+
+    resultados = {}
+    for nombre, funcion in (
+        ('antiguo (3 sentencias)', lambda i: registrar_antiguo(modelo, 1, 1, '2026-01-05', 1)),
+        ('INSERT ... SELECT', lambda i: modelo.registrar(1, 1, '2026-01-05', 1)),
+    ):
+        SENTENCIAS[0] = 0
+        segundos = medir(silencioso(funcion), n)
+        resultados[nombre] = segundos
+        print(f"  {nombre:<24} {segundos * 1000:>7.2f} ms/registro   {SENTENCIAS[0] / n:.0f} sentencias")
+    antiguo, nuevo = resultados.values()
+    print(f"  → {antiguo / nuevo:.1f}x")
+    DatabaseConnection._pool.cerrar()
+    DatabaseConnection._pool = None
+
+
+def con_sqlite(n=2000, empleados=300, registros=50_000):
+    DatabaseConnection.configurar('sqlite', ':memory:')
+    from model.inicializador_bd import InicializadorBDCompleto
+    from model.registro_tiempo import RegistroTiempo
+    InicializadorBDCompleto().inicializar(mostrar=lambda *a: None)
+    modelo = RegistroTiempo()
+
+    # Un proyecto con todo el personal asignado: el GROUP_CONCAT del camino antiguo lo recorre entero
+    with modelo.cursor(escritura=True) as cursor:
+        cursor.execute("INSERT INTO proyecto (nombre, fecha_inicio) VALUES ('Grande', '2025-01-01')")
+        cursor.executemany("INSERT INTO empleado (nombre, email, fecha_contratacion, salario) "
+                           "VALUES (%s, %s, '2025-01-01', 1000)",
+                           [(f"E{i}", f"e{i}@eco.cl") for i in range(empleados)])
+        cursor.executemany("INSERT INTO asignacion_proyecto (empleado_id, proyecto_id) VALUES (%s, 1)",
+                           [(i,) for i in range(1, empleados + 1)])
+        cursor.executemany("INSERT INTO registro_tiempo (empleado_id, proyecto_id, fecha, horas) "
+                           "VALUES (%s, 1, %s, 0.1)",
+                           [(i % empleados + 1, f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}")
+                            for i in range(registros)])
+
+    # Cada registro en un día distinto del empleado: ninguno choca con el tope
+    fecha = lambda i: f"2027-{i % 12 + 1:02d}-{i // 12 % 28 + 1:02d}"
+    antiguo = medir(silencioso(lambda i: registrar_antiguo(modelo, i % empleados + 1, 1, fecha(i), 0.5)), n)
+    nuevo = medir(silencioso(lambda i: modelo.registrar(i % empleados + 1, 1, fecha(i), 0.5)), n)
+    print(f"  {'antiguo (3 sentencias)':<24} {antiguo * 1e6:>7.0f} µs/registro")
+    print(f"  {'INSERT ... SELECT':<24} {nuevo * 1e6:>7.0f} µs/registro")
+    print(f"  → {antiguo / nuevo:.1f}x")
+    DatabaseConnection.close_connection()
+
+
+def main():
+    print(f"Latencia simulada por sentencia: {LATENCIA * 1000:.1f} ms")
+    con_latencia()
+    print("\nSQLite en memoria (300 empleados asignados, 50.000 registros)")
+    con_sqlite()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_tablero.py
+"""
+Tablero de reportes: las cuatro consultas en serie (modelos síncronos)
+vs asyncio.gather sobre ModeloAsincrono. Conexiones falsas con una
+latencia fija por sentencia simulan el viaje de ida y vuelta a MySQL.
+
+    python benchmarks/bench_tablero.py [latencia_ms]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import DatabaseConnection
+from config.pool import PoolConexiones
+
+LATENCIA = float(sys.argv[1]) / 1000 if len(sys.argv) > 1 else 0.02
+
+
+class _Cursor:
+    lastrowid = 0
+    rowcount = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        time.sleep(LATENCIA)  # libera el GIL, como la espera de red real
+
+    def fetchone(self):
+        return {'total': 0}
+
+    def fetchall(self):
+        return []
+
+
+class _Conn:
+    open = True
+
+    def cursor(self, *args):
+        return _Cursor()
+
+    def get_autocommit(self):
+        return True
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        pass
+
+
+def en_serie():
+    from model.registro_tiempo import RegistroTiempo
+    from model.indicador_economico import IndicadorEconomico
+    from model.consulta_indicador import ConsultaIndicador
+    RegistroTiempo.estadisticas_globales()
+    IndicadorEconomico().listar_todos_ultimos()
+    ConsultaIndicador().top_indicadores_global(10)
+    ConsultaIndicador().total_consultas_hoy()
+
+
+def main(repeticiones=10):
+    DatabaseConnection._pool = PoolConexiones(_Conn, min_size=4, max_size=10)
+    DatabaseConnection._pool.calentar()
+    from model.asincrono import obtener_tablero
+
+    en_serie()
+    obtener_tablero()
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        en_serie()
+    serie = (time.perf_counter() - inicio) / repeticiones
+
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        obtener_tablero()
+    paralelo = (time.perf_counter() - inicio) / repeticiones
+
+    print(f"Latencia simulada por sentencia: {LATENCIA * 1000:.0f} ms")
+    print(f"{'En serie':<20} {serie * 1000:>8.1f} ms/tablero")
+    print(f"{'asyncio.gather':<20} {paralelo * 1000:>8.1f} ms/tablero   ({serie / paralelo:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
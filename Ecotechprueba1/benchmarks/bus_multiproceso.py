@@ -0,0 +1,111 @@
+# benchmarks/bus_multiproceso.py
+"""
+Bus de invalidación con varios procesos sobre una misma base SQLite en archivo.
+
+El proceso principal cambia el nombre de un empleado N veces; cada lector lo
+tiene en CacheEntidades (buscar_por_id) y lo consulta en bucle. El retraso de
+propagación es lo que tarda cada lector en ver el nombre nuevo desde la escritura.
+Con el bus apagado (ECOTECH_BUS=0) los lectores no lo ven hasta que vence el TTL.
+
+    python benchmarks/bus_multiproceso.py [lectores] [cambios] [intervalo_bus_s]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def _configurar(ruta: str) -> None:
+    from config.database import DatabaseConnection
+    DatabaseConnection.configurar('sqlite', ruta)
+
+
+def lector(ruta: str, cambios: int) -> None:
+    """Proceso hijo: una línea JSON por cambio visto {'version', 'retraso'}"""
+    _configurar(ruta)
+    from model.bus_invalidacion import BusInvalidacion
+    from model.empleado import Empleado
+    BusInvalidacion.iniciar()
+    empleados = Empleado.compartido()
+    print(json.dumps({'listo': True}), flush=True)
+    vista = None
+    limite = time.time() + cambios * 2 + 30
+    while time.time() < limite:
+        nombre = empleados.buscar_por_id(1)['nombre']
+        if nombre != vista:
+            vista = nombre
+            version, _, marca = nombre.partition('@')
+            if marca:
+                print(json.dumps({'version': int(version), 'retraso': time.time() - float(marca)}), flush=True)
+                if int(version) == cambios:
+                    break
+        time.sleep(0.002)
+    print(json.dumps({'bus': BusInvalidacion.estadisticas()}), flush=True)
+    BusInvalidacion.detener()
+
+
+def main() -> None:
+    n_lectores = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    cambios = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    if len(sys.argv) > 3:
+        os.environ['ECOTECH_BUS_INTERVALO'] = sys.argv[3]
+
+    ruta = os.path.join(tempfile.mkdtemp(prefix='ecotech_bus_'), 'bus.db')
+    _configurar(ruta)
+    from model.inicializador_bd import InicializadorBDCompleto
+    InicializadorBDCompleto.inicializar(mostrar=lambda _: None)
+    from model.bus_invalidacion import BusInvalidacion
+    from model.empleado import Empleado
+    empleados = Empleado.compartido()
+    empleados.crear('0@', 'bus@ecotech.cl', salario=1)
+    BusInvalidacion.iniciar()
+
+    hijos = [subprocess.Popen([sys.executable, __file__, '--lector', ruta, str(cambios)],
+                              stdout=subprocess.PIPE, text=True, env=os.environ.copy())
+             for _ in range(n_lectores)]
+    for hijo in hijos:
+        json.loads(hijo.stdout.readline())  # {'listo': True}
+    time.sleep(BusInvalidacion.INTERVALO * 2)
+
+    print(f"Bus de invalidación: {n_lectores} lectores, {cambios} cambios, "
+          f"intervalo {BusInvalidacion.INTERVALO}s ({'activo' if BusInvalidacion.habilitado else 'APAGADO'})")
+    for version in range(1, cambios + 1):
+        empleados.actualizar(1, nombre=f"{version}@{time.time()}")
+        time.sleep(BusInvalidacion.INTERVALO * 1.5)
+
+    retrasos, perdidos = [], 0
+    for i, hijo in enumerate(hijos):
+        vistos, bus = [], {}
+        for linea in hijo.stdout:
+            dato = json.loads(linea)
+            if 'retraso' in dato:
+                vistos.append(dato['retraso'])
+            elif 'bus' in dato:
+                bus = dato['bus']
+        hijo.wait()
+        perdidos += cambios - len(vistos)
+        retrasos.extend(vistos)
+        print(f"  lector {i + 1}: {len(vistos)}/{cambios} cambios vistos, "
+              f"máx {max(vistos, default=0) * 1000:.0f} ms; bus: {bus.get('recibidos')} recibidos, "
+              f"p95 {bus.get('retraso_p95')} s")
+    BusInvalidacion.detener()
+
+    retrasos.sort()
+    if retrasos:
+        print(f"Retraso escritura → lector: p50 {retrasos[len(retrasos) // 2] * 1000:.0f} ms, "
+              f"p95 {retrasos[int(len(retrasos) * 0.95)] * 1000:.0f} ms, máx {retrasos[-1] * 1000:.0f} ms "
+              f"(cota ~{2 * BusInvalidacion.INTERVALO * 1000:.0f} ms)")
+    if perdidos:
+        print(f"⚠️  {perdidos} cambios no vistos por algún lector")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--lector':
+        lector(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,60 @@
+# benchmarks/importtime.py
+"""
+Costo de importación del camino de arranque (hasta el prompt de login).
+Corre `python -X importtime` en un proceso limpio, muestra los módulos
+más caros (tiempo acumulado) y falla si el total supera el presupuesto.
+
+    python benchmarks/importtime.py [presupuesto_ms]
+"""
+import os
+import re
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULO = 'controller.auth_controller'
+PRESUPUESTO_MS = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+# Ninguno de estos debe cargarse antes del login
+PROHIBIDOS = ('bcrypt', 'requests', 'pymysql', 'logging')
+
+_RE_LINEA = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def medir():
+    salida = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {MODULO}'],
+        cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stderr
+    modulos = {}
+    for linea in salida.splitlines():
+        m = _RE_LINEA.match(linea)
+        if not m:
+            continue
+        if m.group(4) == 'site':
+            modulos.clear()  # lo anterior es el arranque del intérprete (.pth incluidos)
+            continue
+        modulos[m.group(4)] = int(m.group(2))
+    return modulos
+
+
+def main():
+    modulos = medir()
+    total_ms = modulos[MODULO] / 1000.0
+
+    print(f"Importación de {MODULO}: {total_ms:.1f} ms (presupuesto {PRESUPUESTO_MS:.0f} ms)\n")
+    print(f"{'acumulado':>10}  módulo")
+    for nombre, acumulado in sorted(modulos.items(), key=lambda m: -m[1])[:15]:
+        print(f"{acumulado / 1000.0:8.2f}ms  {nombre}")
+
+    cargados = [p for p in PROHIBIDOS if p in modulos]
+    if cargados:
+        print(f"\n❌ Importados en el arranque: {', '.join(cargados)}")
+    if total_ms > PRESUPUESTO_MS:
+        print(f"\n❌ Presupuesto excedido en {total_ms - PRESUPUESTO_MS:.1f} ms")
+    if cargados or total_ms > PRESUPUESTO_MS:
+        sys.exit(1)
+    print("\n✅ Dentro del presupuesto")
+
+
+if __name__ == '__main__':
+    main()
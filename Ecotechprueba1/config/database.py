@@ -1,41 +1,121 @@
-# config/database.py - Mantener igual pero asegurar configuración correcta
-import pymysql
-from pymysql.cursors import DictCursor
+# config/database.py - Configuración de conexión y pool compartido
+import os
 import threading
+from functools import partial
+from typing import List, Optional
+from config.dialecto import Dialecto, crear_dialecto
+from config.enrutador import EnrutadorLecturas
+from config.pool import PoolConexiones, ConexionPrestada
 
 class DatabaseConnection:
+    # Motor: 'mysql' (servidor) o 'sqlite' (archivo local o :memory:, sin servicio)
+    _motor = os.environ.get('ECOTECH_DB', 'mysql')
+    _ruta_sqlite = os.environ.get('ECOTECH_SQLITE', 'ecotech_solutions.db')
+    
     _config = {
         'host': 'localhost',
         'user': 'poosuser',  # Cambiar según tu configuración
         'password': '12345678',
         'port': 8889,  # Cambiar a 3306 si es XAMPP/MAMP estándar
         'database': 'ecotech_solutions',
-        'cursorclass': DictCursor,
         'autocommit': True,
         'charset': 'utf8mb4',
         'connect_timeout': 5
     }
     
-    _local = threading.local()
+    # Parámetros del pool (ver config/pool.py)
+    _pool_config = {
+        'min_size': 1,
+        'max_size': 10,
+        'idle_timeout': 300,
+        'max_lifetime': 3600,
+        'checkout_timeout': 5,
+        'ping_tras': 2
+    }
+    
+    # Réplicas de lectura: 'host:puerto' (MySQL) o ruta de archivo (SQLite), separadas por coma
+    _replicas = [r.strip() for r in os.environ.get('ECOTECH_REPLICAS', '').split(',') if r.strip()]
+    _lectura_config = {
+        'estrategia': os.environ.get('ECOTECH_LECTURA', 'round_robin'),  # o 'menor_latencia'
+        'ventana_primario': 2.0  # segundos leyendo del primario tras escribir
+    }
+    
+    _pool = None
+    _enrutador = None
+    _dialecto = None
+    _ancla_memoria = None  # mantiene viva una base :memory: compartida entre conexiones
+    _lock = threading.Lock()
+    
+    @classmethod
+    def configurar(cls, motor: str = 'mysql', ruta_sqlite: str = None):
+        """Cambia de motor (cierra el pool actual). ruta_sqlite=':memory:' → base en memoria"""
+        crear_dialecto(motor)  # valida el nombre
+        cls.close_connection()
+        cls._motor = motor
+        if ruta_sqlite is not None:
+            cls._ruta_sqlite = ruta_sqlite
+    
+    @classmethod
+    def configurar_replicas(cls, replicas: List[str], estrategia: str = 'round_robin',
+                            ventana_primario: float = 2.0):
+        """Lecturas a estas réplicas ('host:puerto' o ruta SQLite); lista vacía → todo al primario"""
+        if estrategia not in EnrutadorLecturas.ESTRATEGIAS:
+            raise ValueError(f"Estrategia de lectura no soportada: {estrategia}")
+        cls.close_connection()
+        cls._replicas = list(replicas)
+        cls._lectura_config = {'estrategia': estrategia, 'ventana_primario': ventana_primario}
+    
+    @classmethod
+    def get_dialecto(cls) -> Dialecto:
+        if cls._dialecto is None or cls._dialecto.nombre != cls._motor:
+            cls._dialecto = crear_dialecto(cls._motor)
+        return cls._dialecto
+    
+    @classmethod
+    def _crear_conexion(cls, destino: str = None):
+        """Abre una conexión nueva (fábrica del pool); destino = réplica, None = primario"""
+        if cls._motor == 'sqlite':
+            return cls._crear_conexion_sqlite(destino)
+        return cls._crear_conexion_mysql(destino)
     
     @classmethod
-    def get_connection(cls):
-        """Obtiene conexión para el thread actual"""
+    def _crear_conexion_sqlite(cls, ruta: str = None):
+        from config.sqlite import ConexionSQLite
+        dialecto = cls.get_dialecto()
+        if ruta is not None:
+            return ConexionSQLite(ruta, dialecto)
+        if cls._ruta_sqlite != ':memory:':
+            return ConexionSQLite(cls._ruta_sqlite, dialecto)
+        # Cada conexión a ':memory:' sería una base distinta: se comparte por URI
+        uri = f"file:ecotech_{id(cls)}?mode=memory&cache=shared"
+        with cls._lock:
+            if cls._ancla_memoria is None:
+                cls._ancla_memoria = ConexionSQLite(uri, dialecto, uri=True)
+        return ConexionSQLite(uri, dialecto, uri=True)
+    
+    @classmethod
+    def _crear_conexion_mysql(cls, destino: str = None):
+        import pymysql
+        from pymysql.cursors import DictCursor
+        if destino is not None:
+            host, _, puerto = destino.partition(':')
+            config = dict(cls._config, host=host or cls._config['host'])
+            if puerto:
+                config['port'] = int(puerto)
+            return pymysql.connect(cursorclass=DictCursor, **config)
         try:
-            if not hasattr(cls._local, 'connection') or not cls._local.connection.open:
-                cls._local.connection = pymysql.connect(**cls._config)
-            return cls._local.connection
+            return pymysql.connect(cursorclass=DictCursor, **cls._config)
         except pymysql.err.OperationalError as e:
             print(f"❌ Error de conexión MySQL: {e}")
             
-            # Intentar puerto alternativo
-            if cls._config['port'] == 8889:
+            # Intentar puerto alternativo (no si el servidor respondió que la base no existe)
+            if cls._config['port'] == 8889 and e.args[0] != 1049:
                 print("🔄 Intentando con puerto 3306...")
                 cls._config['port'] = 3306
                 try:
-                    cls._local.connection = pymysql.connect(**cls._config)
+                    conn = pymysql.connect(cursorclass=DictCursor, **cls._config)
                     print("✅ Conexión exitosa con puerto 3306")
-                    return cls._local.connection
+                    return conn
                 except:
                     pass
             
@@ -47,21 +127,77 @@ class DatabaseConnection:
             
             raise ConnectionError(f"No se pudo conectar a MySQL. Verifica la configuración.")
     
+    @classmethod
+    def get_pool(cls) -> PoolConexiones:
+        """Pool compartido, creado de forma perezosa (no abre conexiones)"""
+        if cls._pool is None:
+            with cls._lock:
+                if cls._pool is None:
+                    config = cls._pool_config
+                    if cls.conexion_unica():
+                        config = dict(config, min_size=1, max_size=1)
+                    cls._pool = PoolConexiones(cls._crear_conexion, **config)
+        return cls._pool
+    
+    @classmethod
+    def conexion_unica(cls) -> bool:
+        """
+        ¿Base SQLite en memoria? Se sirve por una sola conexión del pool: con caché
+        compartida los bloqueos de tabla no esperan (no hay busy_timeout que valga) y
+        leer sin confirmar dejaría ver transacciones que después se revierten
+        """
+        return cls._motor == 'sqlite' and cls._ruta_sqlite == ':memory:'
+    
+    @classmethod
+    def get_enrutador(cls) -> Optional[EnrutadorLecturas]:
+        """Enrutador de lecturas, o None si no hay réplicas configuradas"""
+        if cls._enrutador is None and cls._replicas:
+            primario = cls.get_pool()
+            with cls._lock:
+                if cls._enrutador is None:
+                    pools = {
+                        replica: PoolConexiones(partial(cls._crear_conexion, replica), **cls._pool_config)
+                        for replica in cls._replicas
+                    }
+                    cls._enrutador = EnrutadorLecturas(primario, pools, **cls._lectura_config)
+        return cls._enrutador
+    
+    @classmethod
+    def marcar_escritura(cls) -> None:
+        """La sesión (hilo) escribió: sus lecturas van al primario durante la ventana"""
+        if cls._replicas:
+            cls.get_enrutador().marcar_escritura()
+    
+    @classmethod
+    def get_connection(cls) -> ConexionPrestada:
+        """Presta una conexión del pool; close() la devuelve"""
+        return cls.get_pool().obtener()
+    
     @classmethod
     def close_connection(cls):
-        """Cierra conexión del thread actual"""
-        if hasattr(cls._local, 'connection') and cls._local.connection.open:
-            cls._local.connection.close()
-            delattr(cls._local, 'connection')
+        """Cierra el pool y todas sus conexiones libres"""
+        with cls._lock:
+            pool, cls._pool = cls._pool, None
+            enrutador, cls._enrutador = cls._enrutador, None
+            ancla, cls._ancla_memoria = cls._ancla_memoria, None
+        if enrutador is not None:
+            enrutador.cerrar()
+        if pool is not None:
+            pool.cerrar()
+        if ancla is not None:
+            ancla.close()
     
     @classmethod
     def probar_conexion_simple(cls):
         """Prueba de conexión sin base de datos específica"""
+        if cls._motor == 'sqlite':
+            return True  # no hay servidor que probar
         try:
+            import pymysql
             config_temp = cls._config.copy()
             config_temp.pop('database', None)
             conn = pymysql.connect(**config_temp)
             conn.close()
             return True
         except:
-            return False
\ No newline at end of file
+            return False
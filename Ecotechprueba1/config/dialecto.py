@@ -0,0 +1,159 @@
+# config/dialecto.py - Diferencias de SQL entre motores (MySQL / SQLite)
+import re
+from typing import Dict, Tuple
+
+# Clave única que resuelve cada ON DUPLICATE KEY UPDATE (SQLite necesita el destino explícito)
+CLAVES_UNICAS: Dict[str, Tuple[str, ...]] = {
+    'usuario': ('username',),
+    'asignacion_proyecto': ('empleado_id', 'proyecto_id'),
+    'indicador_economico': ('codigo', 'fecha'),
+    'horas_diarias': ('empleado_id', 'proyecto_id', 'fecha'),
+    'carga_indicador': ('codigo',),
+}
+
+# Marcadores de pymysql (%s, %(nombre)s, %% literal) → qmark / named de sqlite3
+_RE_MARCADORES = re.compile(r'%\((\w+)\)s|%s|%%')
+_RE_INSERT_IGNORE = re.compile(r'\bINSERT\s+IGNORE\b', re.IGNORECASE)
+_RE_TABLA_INSERT = re.compile(r'\bINSERT\s+(?:OR\s+IGNORE\s+)?INTO\s+(\w+)', re.IGNORECASE)
+_RE_ON_DUPLICATE = re.compile(r'\bON\s+DUPLICATE\s+KEY\s+UPDATE\b', re.IGNORECASE)
+_RE_VALUES_COLUMNA = re.compile(r'\bVALUES\s*\(\s*(\w+)\s*\)', re.IGNORECASE)
+_RE_DATE_FORMAT = re.compile(r"\bDATE_FORMAT\s*\(\s*([^,()]+?)\s*,\s*'([^']*)'\s*\)", re.IGNORECASE)
+_RE_SEPARATOR = re.compile(r"\s+SEPARATOR\s+('[^']*')", re.IGNORECASE)
+_RE_PARTE_FECHA = re.compile(r'\b(YEAR|MONTH|DAY)\s*\(([^()]+)\)', re.IGNORECASE)
+_RE_CURDATE = re.compile(r'\bCURDATE\s*\(\s*\)', re.IGNORECASE)
+# MySQL usa la hora local de la sesión; CURRENT_TIMESTAMP de SQLite es UTC
+_RE_NOW = re.compile(r'\bNOW\s*\(\s*\)|\bCURRENT_TIMESTAMP\b', re.IGNORECASE)
+_RE_FOR_UPDATE = re.compile(r'\s+FOR\s+UPDATE\b', re.IGNORECASE)
+
+# DDL
+_RE_AUTO_PK = re.compile(r'\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b', re.IGNORECASE)
+_RE_ENGINE = re.compile(r'\)\s*ENGINE\s*=.*$', re.IGNORECASE | re.DOTALL)
+_RE_UNIQUE_KEY = re.compile(r'\bUNIQUE\s+KEY\s+\w+\s*\(', re.IGNORECASE)
+_RE_CREATE_INDEX = re.compile(r'^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(?!IF\b)', re.IGNORECASE)
+_RE_CREATE_TRIGGER = re.compile(r'^\s*CREATE\s+TRIGGER\s+(?!IF\b)', re.IGNORECASE)
+
+# Formatos de DATE_FORMAT que cambian en strftime
+_FORMATOS_STRFTIME = {'%i': '%M', '%s': '%S', '%e': '%d', '%k': '%H'}
+_PARTES_FECHA = {'YEAR': '%Y', 'MONTH': '%m', 'DAY': '%d'}
+
+
+class Dialecto:
+    """MySQL: el SQL de los modelos se envía tal cual"""
+
+    nombre = 'mysql'
+    SQL_TRIGGERS_DE_TABLA = """
+        SELECT TRIGGER_NAME AS nombre FROM information_schema.TRIGGERS
+        WHERE TRIGGER_SCHEMA = DATABASE() AND EVENT_OBJECT_TABLE = %s
+    """
+
+    def traducir(self, texto: str) -> str:
+        return texto
+
+    def ddl(self, sql: str) -> str:
+        return sql
+
+    def objeto_ya_existe(self, error: Exception) -> bool:
+        """Error de DDL por tabla (1050), índice (1061) o trigger (1359) ya existente"""
+        return bool(error.args) and error.args[0] in (1050, 1061, 1359)
+
+    def sin_permiso_trigger(self, error: Exception) -> bool:
+        """CREATE TRIGGER rechazado (1419): con log binario exige SUPER o log_bin_trust_function_creators=1"""
+        return bool(error.args) and error.args[0] == 1419
+
+    def cursor_streaming(self):
+        """Clase de cursor para iterar sin cargar todo el resultado"""
+        from pymysql.cursors import SSDictCursor
+        return SSDictCursor
+
+    def cursor_tuplas(self, streaming: bool = True):
+        """Clase de cursor que entrega tuplas (sin armar un dict por fila)"""
+        from pymysql.cursors import Cursor, SSCursor
+        return SSCursor if streaming else Cursor
+
+
+class DialectoSQLite(Dialecto):
+    """
+    Reescribe las construcciones propias de MySQL que usan los modelos
+    (INSERT IGNORE, ON DUPLICATE KEY UPDATE, DATE_FORMAT, GROUP_CONCAT ... SEPARATOR,
+    CURDATE, YEAR/MONTH, FOR UPDATE) y los marcadores de parámetros.
+    Cada texto se traduce una sola vez.
+    """
+
+    nombre = 'sqlite'
+    SQL_TRIGGERS_DE_TABLA = "SELECT name AS nombre FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s"
+
+    def __init__(self):
+        self._cache: Dict[str, str] = {}
+
+    def traducir(self, texto: str) -> str:
+        sql = self._cache.get(texto)
+        if sql is None:
+            if len(self._cache) >= 1024:
+                self._cache.clear()
+            sql = self._cache[texto] = self._reescribir(texto)
+        return sql
+
+    def _reescribir(self, texto: str) -> str:
+        # Primero los marcadores: así %% queda como % antes de generar formatos de strftime
+        sql = _RE_MARCADORES.sub(self._marcador, texto)
+        sql = _RE_INSERT_IGNORE.sub('INSERT OR IGNORE', sql)
+
+        duplicado = _RE_ON_DUPLICATE.search(sql)
+        if duplicado:
+            tabla = _RE_TABLA_INSERT.search(sql)
+            clave = CLAVES_UNICAS.get(tabla.group(1).lower()) if tabla else None
+            if not clave:
+                raise ValueError(f"Sin clave única conocida para ON DUPLICATE KEY UPDATE: {texto[:80]}")
+            sufijo = _RE_VALUES_COLUMNA.sub(r'excluded.\1', sql[duplicado.end():])
+            sql = f"{sql[:duplicado.start()]}ON CONFLICT ({', '.join(clave)}) DO UPDATE SET{sufijo}"
+
+        sql = _RE_DATE_FORMAT.sub(self._date_format, sql)
+        sql = _RE_SEPARATOR.sub(r', \1', sql)
+        sql = _RE_PARTE_FECHA.sub(
+            lambda m: f"CAST(strftime('{_PARTES_FECHA[m.group(1).upper()]}', {m.group(2)}) AS INTEGER)", sql
+        )
+        sql = _RE_CURDATE.sub("date('now', 'localtime')", sql)
+        sql = _RE_NOW.sub("datetime('now', 'localtime')", sql)
+        # SQLite bloquea la base entera al escribir (BEGIN IMMEDIATE): FOR UPDATE sobra
+        return _RE_FOR_UPDATE.sub('', sql)
+
+    @staticmethod
+    def _marcador(m) -> str:
+        if m.group(1):
+            return ':' + m.group(1)
+        return '?' if m.group(0) == '%s' else '%'
+
+    @staticmethod
+    def _date_format(m) -> str:
+        formato = re.sub(r'%\w', lambda f: _FORMATOS_STRFTIME.get(f.group(0), f.group(0)), m.group(2))
+        return f"strftime('{formato}', {m.group(1)})"
+
+    def ddl(self, sql: str) -> str:
+        sql = _RE_AUTO_PK.sub('INTEGER PRIMARY KEY AUTOINCREMENT', sql)
+        sql = _RE_UNIQUE_KEY.sub('UNIQUE (', sql)
+        sql = _RE_NOW.sub("(datetime('now', 'localtime'))", sql)
+        sql = _RE_CREATE_INDEX.sub(lambda m: f"CREATE {m.group(1) or ''}INDEX IF NOT EXISTS ", sql)
+        # El cuerpo del trigger (upsert incluido) lo traduce traducir() al ejecutarse
+        sql = _RE_CREATE_TRIGGER.sub("CREATE TRIGGER IF NOT EXISTS ", sql)
+        return _RE_ENGINE.sub(')', sql.rstrip())
+
+    def objeto_ya_existe(self, error: Exception) -> bool:
+        return False  # el DDL traducido ya lleva IF NOT EXISTS
+
+    def sin_permiso_trigger(self, error: Exception) -> bool:
+        return False
+
+    def cursor_streaming(self):
+        return None  # sqlite3 ya entrega las filas a medida que se piden
+
+    def cursor_tuplas(self, streaming: bool = True):
+        from config.sqlite import CursorTuplasSQLite
+        return CursorTuplasSQLite
+
+
+def crear_dialecto(motor: str) -> Dialecto:
+    if motor == 'sqlite':
+        return DialectoSQLite()
+    if motor == 'mysql':
+        return Dialecto()
+    raise ValueError(f"Motor de base de datos no soportado: {motor}")
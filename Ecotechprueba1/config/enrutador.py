@@ -0,0 +1,136 @@
+# config/enrutador.py - Reparto de lecturas entre réplicas
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+from config.pool import PoolConexiones
+
+
+class Replica:
+    """Pool de una réplica más su latencia observada (media móvil) y estado de salud"""
+
+    __slots__ = ('nombre', 'pool', 'latencia_ms', 'lecturas', 'fallos', 'caida_hasta')
+
+    def __init__(self, nombre: str, pool: PoolConexiones):
+        self.nombre = nombre
+        self.pool = pool
+        self.latencia_ms = None
+        self.lecturas = 0
+        self.fallos = 0
+        self.caida_hasta = 0.0
+
+
+class EnrutadorLecturas:
+    """
+    Elige réplica para cada SELECT: 'round_robin' o 'menor_latencia'.
+    Tras una escritura, el mismo hilo (la sesión de consola) lee del primario
+    durante ventana_primario segundos para ver sus propios cambios.
+    Si una réplica no entrega conexión se aparta un rato y se lee del primario.
+    """
+
+    ESTRATEGIAS = ('round_robin', 'menor_latencia')
+    ALFA = 0.2              # peso de la última medición en la media móvil
+    EXPLORAR_CADA = 50      # en menor_latencia, cada tanto se mide también a las demás
+    PAUSA_TRAS_FALLO = 30.0
+
+    def __init__(self, primario: PoolConexiones, replicas: Dict[str, PoolConexiones],
+                 estrategia: str = 'round_robin', ventana_primario: float = 2.0):
+        if estrategia not in self.ESTRATEGIAS:
+            raise ValueError(f"Estrategia de lectura no soportada: {estrategia}")
+        self.primario = primario
+        self.replicas: List[Replica] = [Replica(n, p) for n, p in replicas.items()]
+        self.estrategia = estrategia
+        self.ventana_primario = ventana_primario
+        self._turno = itertools.count()
+        self._sesion = threading.local()
+        self._lock = threading.Lock()
+        self._lecturas_primario = 0
+
+    # ====================== SESIÓN ======================
+    def marcar_escritura(self) -> None:
+        self._sesion.escribio_en = time.monotonic()
+
+    def leer_de_primario(self) -> bool:
+        escribio_en = getattr(self._sesion, 'escribio_en', None)
+        return escribio_en is not None and time.monotonic() - escribio_en < self.ventana_primario
+
+    # ====================== ELECCIÓN ======================
+    def elegir(self) -> Optional[Replica]:
+        ahora = time.monotonic()
+        sanas = [r for r in self.replicas if r.caida_hasta <= ahora]
+        if not sanas:
+            return None
+        turno = next(self._turno)
+        if self.estrategia == 'round_robin' or turno % self.EXPLORAR_CADA == 0:
+            return sanas[turno % len(sanas)]
+        # Sin medición todavía cuenta como 0: así cada réplica se prueba al menos una vez
+        return min(sanas, key=lambda r: r.latencia_ms or 0.0)
+
+    def pool_lectura(self) -> PoolConexiones:
+        """Pool para una lectura larga (iteradores): sin medición de latencia"""
+        replica = None if self.leer_de_primario() else self.elegir()
+        return replica.pool if replica is not None else self.primario
+
+    @contextmanager
+    def conexion(self):
+        """Conexión de lectura: réplica elegida o, si no hay disponible, el primario"""
+        replica = None if self.leer_de_primario() else self.elegir()
+        conn = None
+        if replica is not None:
+            try:
+                conn = replica.pool.obtener()
+            except Exception as e:
+                self._apartar(replica, e)
+                replica = None
+        if replica is None:
+            with self._lock:
+                self._lecturas_primario += 1
+            with self.primario.conexion() as conn:
+                yield conn
+            return
+
+        inicio = time.perf_counter()
+        try:
+            yield conn
+        except BaseException:
+            replica.pool.liberar(conn, descartar=not getattr(conn.cruda, 'open', True))
+            raise
+        replica.pool.liberar(conn)
+        self._medir(replica, (time.perf_counter() - inicio) * 1000.0)
+
+    def _medir(self, replica: Replica, ms: float) -> None:
+        with self._lock:
+            replica.lecturas += 1
+            if replica.latencia_ms is None:
+                replica.latencia_ms = ms
+            else:
+                replica.latencia_ms += self.ALFA * (ms - replica.latencia_ms)
+
+    def _apartar(self, replica: Replica, error: Exception) -> None:
+        with self._lock:
+            replica.fallos += 1
+            replica.caida_hasta = time.monotonic() + self.PAUSA_TRAS_FALLO
+        print(f"⚠️  Réplica {replica.nombre} no disponible ({error}); se lee del primario")
+
+    # ====================== MANTENIMIENTO ======================
+    def cerrar(self) -> None:
+        for replica in self.replicas:
+            replica.pool.cerrar()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        ahora = time.monotonic()
+        with self._lock:
+            return {
+                'estrategia': self.estrategia,
+                'ventana_primario': self.ventana_primario,
+                'lecturas_primario': self._lecturas_primario,
+                'replicas': [{
+                    'nombre': r.nombre,
+                    'lecturas': r.lecturas,
+                    'latencia_ms': round(r.latencia_ms, 3) if r.latencia_ms is not None else None,
+                    'fallos': r.fallos,
+                    'disponible': r.caida_hasta <= ahora
+                } for r in self.replicas]
+            }
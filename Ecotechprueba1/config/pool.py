@@ -0,0 +1,292 @@
+# config/pool.py - Pool de conexiones acotado y con chequeo de salud
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, Any
+
+
+class PoolAgotado(ConnectionError):
+    """No se obtuvo una conexión libre dentro del tiempo de espera"""
+
+
+class ConexionPrestada:
+    """
+    Envoltorio de un préstamo de una conexión del pool (uno nuevo por préstamo).
+    Delegación transparente; close() devuelve la conexión al pool en vez de cerrarla.
+    Devolver dos veces no hace nada; usarla después de devuelta falla.
+    """
+
+    __slots__ = ('_pool', '_conn', 'creada_en', 'usada_en', 'devuelta')
+
+    def __init__(self, pool: 'PoolConexiones', conn, creada_en: float = None):
+        self._pool = pool
+        self._conn = conn
+        self.creada_en = time.monotonic() if creada_en is None else creada_en
+        self.usada_en = time.monotonic()
+        self.devuelta = False
+
+    @property
+    def cruda(self):
+        """Conexión real del driver (None una vez devuelta)"""
+        return self._conn
+
+    def close(self):
+        self._pool.liberar(self)
+
+    def __getattr__(self, nombre):
+        if self._conn is None:
+            raise ConnectionError(f"Conexión ya devuelta al pool (acceso a {nombre})")
+        return getattr(self._conn, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones con tamaño mínimo/máximo, recolección de ociosas,
+    ping de salud antes de prestar, timeout de espera y estadísticas.
+    """
+
+    def __init__(self, fabrica: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+                 idle_timeout: float = 300.0, max_lifetime: float = 3600.0,
+                 checkout_timeout: float = 5.0, ping_tras: float = 2.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Tamaños de pool inválidos")
+
+        self._fabrica = fabrica
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.checkout_timeout = checkout_timeout
+        self.ping_tras = ping_tras  # solo se hace ping si la conexión estuvo ociosa más que esto
+
+        self._libres = deque()
+        self._total = 0
+        self._en_uso = 0
+        self._cerrado = False
+        self._cond = threading.Condition(threading.Lock())
+
+        self._stats = {
+            'creadas': 0,
+            'recicladas': 0,
+            'cerradas_ociosas': 0,
+            'prestamos': 0,
+            'esperas': 0,
+            'timeouts': 0,
+            'tiempo_espera_total': 0.0
+        }
+
+    # ====================== PRÉSTAMO / DEVOLUCIÓN ======================
+    def obtener(self, timeout: float = None) -> ConexionPrestada:
+        """Presta una conexión sana; espera si el pool está al máximo"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        limite = time.monotonic() + timeout
+        espero = False
+        ociosas = []
+
+        with self._cerrando(ociosas), self._cond:
+            while True:
+                if self._cerrado:
+                    raise ConnectionError("El pool de conexiones está cerrado")
+
+                ociosas.extend(self._recolectar_ociosas())
+
+                if self._libres:
+                    libre = self._libres.pop()  # LIFO: la más caliente primero
+                    prestada = ConexionPrestada(self, libre.cruda, libre.creada_en)
+                    prestada.usada_en = libre.usada_en  # para decidir el ping en _validar
+                    self._en_uso += 1
+                    break
+
+                if self._total < self.max_size:
+                    # Reservar el cupo y crear fuera del lock
+                    self._total += 1
+                    self._en_uso += 1
+                    prestada = None
+                    break
+
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolAgotado(
+                        f"Sin conexiones libres tras {timeout:.1f}s "
+                        f"({self._en_uso}/{self.max_size} en uso)"
+                    )
+                if not espero:
+                    espero = True
+                    self._stats['esperas'] += 1
+                inicio = time.monotonic()
+                self._cond.wait(restante)
+                self._stats['tiempo_espera_total'] += time.monotonic() - inicio
+
+            self._stats['prestamos'] += 1
+
+        try:
+            if prestada is None:
+                prestada = self._crear()
+            else:
+                prestada = self._validar(prestada)
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._en_uso -= 1
+                self._cond.notify()
+            raise
+
+        prestada.usada_en = time.monotonic()
+        return prestada
+
+    def liberar(self, prestada: ConexionPrestada, descartar: bool = False) -> None:
+        """
+        Devuelve una conexión; descartar=True la cierra (p.ej. tras un error de protocolo).
+        Idempotente: un segundo close()/liberar() del mismo préstamo no hace nada.
+        """
+        ahora = time.monotonic()
+        with self._cond:
+            if prestada.devuelta:
+                return
+            prestada.devuelta = True
+            conn, prestada._conn = prestada._conn, None  # el préstamo viejo ya no sirve
+            cerrar = descartar or self._cerrado or not self._abierta(conn) \
+                or ahora - prestada.creada_en > self.max_lifetime
+            self._en_uso -= 1
+            if cerrar:
+                self._total -= 1
+                if not descartar and not self._cerrado:
+                    self._stats['recicladas'] += 1
+            else:
+                libre = ConexionPrestada(self, conn, prestada.creada_en)
+                libre.usada_en = ahora
+                self._libres.append(libre)
+            self._cond.notify()
+
+        if cerrar:
+            self._cerrar_silencioso(conn)
+
+    @contextmanager
+    def conexion(self, timeout: float = None):
+        """with pool.conexion() as conn: ... (se devuelve siempre al salir)"""
+        prestada = self.obtener(timeout)
+        try:
+            yield prestada
+        except BaseException:
+            # Si la conexión quedó rota no debe volver al pool
+            self.liberar(prestada, descartar=not self._abierta(prestada.cruda))
+            raise
+        else:
+            self.liberar(prestada)
+
+    # ====================== MANTENIMIENTO ======================
+    def calentar(self) -> int:
+        """Abre conexiones hasta alcanzar min_size; devuelve cuántas creó"""
+        creadas = 0
+        while True:
+            with self._cond:
+                if self._cerrado or self._total >= self.min_size:
+                    return creadas
+                self._total += 1
+            try:
+                prestada = self._crear()
+            except Exception:
+                with self._cond:
+                    self._total -= 1
+                raise
+            with self._cond:
+                # Recién usada: a la derecha, como en liberar (el recolector toma las viejas por la izquierda)
+                self._libres.append(prestada)
+                self._cond.notify()
+            creadas += 1
+
+    def cerrar(self) -> None:
+        """Cierra las conexiones libres; las prestadas se cierran al devolverse"""
+        with self._cond:
+            self._cerrado = True
+            libres = list(self._libres)
+            self._libres.clear()
+            self._total -= len(libres)
+            self._cond.notify_all()
+        for prestada in libres:
+            self._cerrar_silencioso(prestada.cruda)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats.update({
+                'en_uso': self._en_uso,
+                'libres': len(self._libres),
+                'total': self._total,
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            })
+        return stats
+
+    # ====================== INTERNOS ======================
+    def _crear(self) -> ConexionPrestada:
+        conn = self._fabrica()
+        with self._cond:
+            self._stats['creadas'] += 1
+        return ConexionPrestada(self, conn)
+
+    def _validar(self, prestada: ConexionPrestada) -> ConexionPrestada:
+        """Ping antes de prestar si estuvo ociosa; si está muerta se recicla"""
+        ahora = time.monotonic()
+        vieja = ahora - prestada.creada_en > self.max_lifetime
+        if not vieja and ahora - prestada.usada_en < self.ping_tras:
+            return prestada
+        if not vieja:
+            try:
+                prestada.cruda.ping(reconnect=False)
+                return prestada
+            except Exception:
+                pass
+
+        self._cerrar_silencioso(prestada.cruda)
+        with self._cond:
+            self._stats['recicladas'] += 1
+        nueva = self._crear()
+        return nueva
+
+    def _recolectar_ociosas(self) -> list:
+        """
+        Saca del pool las ociosas por sobre min_size (se llama con el lock tomado) y
+        devuelve las conexiones crudas: se cierran fuera del lock (_cerrando), porque
+        cerrar un socket puede tardar y bloquearía a todos los que esperan el pool
+        """
+        if not self._libres or self.idle_timeout is None:
+            return []
+        ahora = time.monotonic()
+        vencidas = []
+        # Las más antiguas están a la izquierda
+        while self._libres and self._total > self.min_size \
+                and ahora - self._libres[0].usada_en > self.idle_timeout:
+            vencidas.append(self._libres.popleft().cruda)
+            self._total -= 1
+            self._stats['cerradas_ociosas'] += 1
+        return vencidas
+
+    @classmethod
+    @contextmanager
+    def _cerrando(cls, conexiones: list):
+        """Al salir del bloque (ya sin el lock) cierra las conexiones anotadas en la lista"""
+        try:
+            yield
+        finally:
+            for conn in conexiones:
+                cls._cerrar_silencioso(conn)
+
+    @staticmethod
+    def _abierta(conn) -> bool:
+        return bool(getattr(conn, 'open', True))
+
+    @staticmethod
+    def _cerrar_silencioso(conn) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,146 @@
+# config/sqlite.py - Conexión SQLite con la interfaz de pymysql que usan los modelos
+import sqlite3
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from config.dialecto import DialectoSQLite
+
+# Tipos de Python ↔ columnas declaradas en el DDL (DATE, TIMESTAMP, DECIMAL, BOOLEAN)
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' '))
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter('DATE', lambda b: date.fromisoformat(b.decode()[:10]))
+sqlite3.register_converter('TIMESTAMP', lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter('DECIMAL', lambda b: Decimal(b.decode()))
+sqlite3.register_converter('BOOLEAN', int)
+
+
+class CursorSQLite:
+    """Cursor de diccionarios: traduce el SQL y reproduce lastrowid/rowcount de pymysql"""
+
+    __slots__ = ('_cursor', '_dialecto', '_nombres', 'lastrowid', 'rowcount')
+
+    def __init__(self, cursor: sqlite3.Cursor, dialecto: DialectoSQLite):
+        self._cursor = cursor
+        self._dialecto = dialecto
+        self._nombres = None
+        self.lastrowid = 0
+        self.rowcount = -1
+
+    def execute(self, query: str, args=None) -> int:
+        cursor = self._cursor
+        cursor.execute(self._dialecto.traducir(query), self._parametros(args))
+        self._despues(cursor)
+        return self.rowcount
+
+    def executemany(self, query: str, filas) -> int:
+        cursor = self._cursor
+        cursor.executemany(self._dialecto.traducir(query), [self._parametros(f) for f in filas])
+        self._despues(cursor)
+        return self.rowcount
+
+    def _despues(self, cursor: sqlite3.Cursor) -> None:
+        self.rowcount = cursor.rowcount
+        self._nombres = [d[0] for d in cursor.description] if cursor.description else None
+        # pymysql informa el id de la PRIMERA fila de un INSERT multi-fila; sqlite3 el de la última
+        if self.rowcount > 0 and cursor.lastrowid:
+            self.lastrowid = cursor.lastrowid - self.rowcount + 1
+        else:
+            self.lastrowid = 0
+
+    @staticmethod
+    def _parametros(args):
+        if args is None:
+            return ()
+        if isinstance(args, (dict, tuple)):
+            return args
+        return tuple(args)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def fetchone(self) -> Optional[Dict[str, Any]]:
+        fila = self._cursor.fetchone()
+        return None if fila is None else dict(zip(self._nombres, fila))
+
+    def fetchall(self) -> List[Dict[str, Any]]:
+        nombres = self._nombres
+        return [dict(zip(nombres, fila)) for fila in self._cursor.fetchall()]
+
+    def fetchmany(self, tamano: int) -> List[Dict[str, Any]]:
+        nombres = self._nombres
+        return [dict(zip(nombres, fila)) for fila in self._cursor.fetchmany(tamano)]
+
+    def close(self) -> None:
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CursorTuplasSQLite(CursorSQLite):
+    """Como CursorSQLite pero entrega las tuplas de sqlite3 tal cual (pymysql.cursors.Cursor)"""
+
+    __slots__ = ()
+
+    def fetchone(self) -> Optional[tuple]:
+        return self._cursor.fetchone()
+
+    def fetchall(self) -> List[tuple]:
+        return self._cursor.fetchall()
+
+    def fetchmany(self, tamano: int) -> List[tuple]:
+        return self._cursor.fetchmany(tamano)
+
+
+class ConexionSQLite:
+    """
+    Envoltorio de sqlite3.Connection con los métodos que usan BaseModel y el pool
+    (cursor, begin, commit, rollback, get_autocommit, ping, open, close).
+    Trabaja en autocommit; begin() abre la transacción explícita.
+    """
+
+    def __init__(self, ruta: str, dialecto: DialectoSQLite, uri: bool = False, timeout: float = 5.0):
+        self._conn = sqlite3.connect(
+            ruta, uri=uri, timeout=timeout, isolation_level=None,
+            detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False
+        )
+        self._dialecto = dialecto
+        self.open = True
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if not uri and ruta != ':memory:':
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+
+    def cursor(self, cursorclass=None) -> CursorSQLite:
+        if cursorclass is CursorTuplasSQLite:
+            return CursorTuplasSQLite(self._conn.cursor(), self._dialecto)
+        return CursorSQLite(self._conn.cursor(), self._dialecto)
+
+    def begin(self) -> None:
+        # IMMEDIATE toma el bloqueo de escritura al empezar (equivale a los FOR UPDATE de MySQL)
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+
+    def rollback(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+
+    def get_autocommit(self) -> bool:
+        return True
+
+    def ping(self, reconnect: bool = False) -> None:
+        self._conn.execute("SELECT 1")
+
+    def close(self) -> None:
+        if self.open:
+            self.open = False
+            self._conn.close()
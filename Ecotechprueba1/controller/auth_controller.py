@@ -8,8 +8,10 @@ class AuthController:
     MAX_INTENTOS = 3
     RETRASO_BASE = 1
 
-    def __init__(self):
-        self.usuario_model = Usuario()
+    def __init__(self, arranque=None):
+        self.usuario_model = Usuario.compartido()
+        # Inicialización de la BD corriendo en segundo plano (ver InicializadorBDCompleto)
+        self.arranque = arranque
 
     def login(self) -> Optional[Dict]:
         """Proceso de login optimizado"""
@@ -33,6 +35,12 @@ class AuthController:
                     intentos += 1
                     continue
 
+                # Recién aquí hace falta la base de datos
+                if self.arranque is not None:
+                    if not self.arranque.esperar():
+                        return None
+                    self.arranque = None
+
                 usuario = self.usuario_model.autenticar(username, password)
                 if usuario:
                     rol_display = {
@@ -1,8 +1,9 @@
 # controller/indicador_controller.py
 # Consumo seguro de API + logging de consultas + manejo total de errores
-import requests
 from datetime import datetime
-from typing import Dict, Any
+from time import perf_counter
+from model.almacen_indicadores import AlmacenIndicadores
+from model.cliente_mindicador import CircuitoAbierto, ClienteMindicador
 from model.indicador_economico import IndicadorEconomico
 from model.consulta_indicador import ConsultaIndicador
 
@@ -10,13 +11,14 @@ class IndicadorController:
     """
     Controlador completo para consumo de mindicador.cl
     • Timeout, retries, headers
+    • Lectura a través de memoria → tabla → API (AlmacenIndicadores)
     • Validación estricta
     • Logging completo de consultas
     • Manejo avanzado de excepciones
     """
 
-    URL_BASE = "https://mindicador.cl/api"
-    TIMEOUT = 12  # segundos
+    URL_BASE = ClienteMindicador.URL_BASE
+    TIMEOUT = (ClienteMindicador.TIMEOUT_CONEXION, ClienteMindicador.TIMEOUT_LECTURA)  # segundos
 
     # Indicadores soportados oficialmente
     INDICADORES = {
@@ -39,6 +41,22 @@ class IndicadorController:
         """De 2025-12-01 → 01-12-2025"""
         return datetime.strptime(fecha_iso[:10], "%Y-%m-%d").strftime("%d-%m-%Y")
 
+    @staticmethod
+    def _describir_error(e: Exception) -> str:
+        """Mensaje para el usuario; requests solo se importa si hubo un error"""
+        if isinstance(e, CircuitoAbierto):
+            return f"mindicador.cl no responde; no se vuelve a intentar por {e.segundos:.0f}s."
+        import requests  # pesado (urllib3, certifi): las lecturas de memoria o tabla no lo cargan
+        if isinstance(e, requests.exceptions.Timeout):
+            return "Tiempo de espera agotado. Verifique su conexión."
+        if isinstance(e, requests.exceptions.ConnectionError):
+            return "Error de conexión. No hay internet o mindicador.cl está caído."
+        if isinstance(e, requests.exceptions.HTTPError):
+            if e.response.status_code == 404:
+                return "Indicador o fecha no encontrada en mindicador.cl"
+            return f"Error HTTP {e.response.status_code}"
+        return f"Error inesperado: {e}"
+
     @classmethod
     def mostrar_menu(cls):
         print("\n" + "═" * 55)
@@ -65,38 +83,26 @@ class IndicadorController:
         if fecha_input:
             try:
                 datetime.strptime(fecha_input, "%Y-%m-%d")
-                fecha_url = f"/{fecha_input[8:10]}-{fecha_input[5:7]}-{fecha_input[:4]}"
-                fecha_mostrar = cls._formatear_fecha(fecha_input)
             except ValueError:
                 print("Formato de fecha inválido.")
                 input("\nPresione ENTER...")
                 return
-        else:
-            fecha_url = ""
-            fecha_iso = datetime.today().strftime("%Y-%m-%d")
-            fecha_mostrar = "hoy"
+        fecha_pedida = fecha_input or None  # None = hoy
 
-        url = f"{cls.URL_BASE}/{codigo}{fecha_url}"
-        print(f"\nConsultando → {url}")
+        print(f"\nConsultando {codigo.upper()} ({cls._formatear_fecha(fecha_input) if fecha_input else 'hoy'})...")
 
         try:
-            headers = {
-                "User-Agent": "EcoTechSolutions-Poo2025/1.0",
-                "Accept": "application/json"
-            }
-
-            response = requests.get(url, timeout=cls.TIMEOUT, headers=headers)
-            response.raise_for_status()
-            data: Dict[str, Any] = response.json()
+            t0 = perf_counter()
+            resultado = AlmacenIndicadores.consultar(codigo, fecha_pedida)
+            demora_ms = (perf_counter() - t0) * 1000
 
-            if 'serie' not in data or not data['serie']:
+            if resultado is None:
                 print("No hay datos disponibles para esa fecha.")
                 input("\nPresione ENTER para continuar...")
                 return
 
-            valor_info = data['serie'][0]
-            valor = float(valor_info['valor'])
-            fecha_iso = valor_info['fecha'][:10]
+            valor = resultado.valor
+            fecha_iso = resultado.fecha
             nombre = cls.INDICADORES[codigo]
 
             # === MOSTRAR RESULTADO ===
@@ -104,50 +110,36 @@ class IndicadorController:
             print(f" INDICADOR: {nombre}")
             print(f" FECHA    : {cls._formatear_fecha(fecha_iso)}")
             print(f" VALOR    : {cls._formatear_valor(valor)}")
+            print(f" ORIGEN   : {resultado.origen} ({demora_ms:.2f} ms)")
             print("═" * 55)
 
             # === REGISTRAR CONSULTA (siempre) ===
+            guardar = input("\n¿Guardar este valor permanentemente en el sistema? (s/N) → ").strip().lower() == 's'
             guardado_final = False
-            if input("\n¿Guardar este valor permanentemente en el sistema? (s/N) → ").strip().lower() == 's':
-                ind_model = IndicadorEconomico()
-                if ind_model.guardar(codigo=codigo, fecha=fecha_iso, valor=valor):
-                    guardado_final = True
-                    print("Indicador guardado exitosamente en el historial permanente.")
+
+            # Guardado + auditoría en una sola unidad de trabajo: un único COMMIT
+            with IndicadorEconomico.transaccion():
+                if guardar:
+                    if IndicadorEconomico.compartido().guardar(codigo=codigo, fecha=fecha_iso, valor=valor):
+                        guardado_final = True
+                        print("Indicador guardado exitosamente en el historial permanente.")
+                    else:
+                        print("No se pudo guardar permanentemente.")
                 else:
-                    print("No se pudo guardar permanentemente.")
-            else:
-                print("Consulta registrada en bitácora, pero no guardada permanentemente.")
-
-            # === REGISTRO ÚNICO Y PERFECTO EN AUDITORÍA ===
-            ConsultaIndicador().registrar(
-                usuario_id=usuario_id,
-                codigo=codigo,
-                fecha_indicador=fecha_iso,
-                valor=valor,
-                guardado=guardado_final
-            )
-
-            # === REGISTRO EN BITÁCORA (SIEMPRE SE GUARDA – para el Top 10) ===
-            ConsultaIndicador.registrar_consulta(
-                usuario_id=usuario_id,
-                indicador_codigo=codigo,
-                fecha_indicador=fecha_iso,
-                valor=valor,
-                guardado=guardado_final
-            )
+                    print("Consulta registrada en bitácora, pero no guardada permanentemente.")
+
+                # === REGISTRO ÚNICO EN AUDITORÍA (alimenta también el Top 10) ===
+                ConsultaIndicador.compartido().registrar(
+                    usuario_id=usuario_id,
+                    codigo=codigo,
+                    fecha_indicador=fecha_iso,
+                    valor=valor,
+                    guardado=guardado_final
+                )
 
             print("Consulta registrada en el sistema de auditoría.")
 
-        except requests.exceptions.Timeout:
-            print("Tiempo de espera agotado. Verifique su conexión.")
-        except requests.exceptions.ConnectionError:
-            print("Error de conexión. No hay internet o mindicador.cl está caído.")
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                print("Indicador o fecha no encontrada en mindicador.cl")
-            else:
-                print(f"Error HTTP {e.response.status_code}")
         except Exception as e:
-            print(f"Error inesperado: {e}")
+            print(cls._describir_error(e))
 
         input("\nPresione ENTER para continuar...")
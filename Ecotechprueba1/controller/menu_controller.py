@@ -7,6 +7,7 @@ from model.empleado import Empleado
 from model.departamento import Departamento
 from model.proyecto import Proyecto
 from model.registro_tiempo import RegistroTiempo
+from model.reportes import Reportes
 from model.usuario import Usuario
 from controller.indicador_controller import IndicadorController
 
@@ -21,11 +22,12 @@ class MenuController:
         self.usuario_id = usuario['id']
 
         # Instancias de modelos
-        self.empleado_model = Empleado()
-        self.departamento_model = Departamento()
-        self.proyecto_model = Proyecto()
-        self.registro_model = RegistroTiempo()
-        self.usuario_model = Usuario()
+        self.empleado_model = Empleado.compartido()
+        self.departamento_model = Departamento.compartido()
+        self.proyecto_model = Proyecto.compartido()
+        self.registro_model = RegistroTiempo.compartido()
+        self.usuario_model = Usuario.compartido()
+        self.reportes = Reportes.compartido()
 
     def limpiar(self) -> None:
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -73,17 +75,34 @@ class MenuController:
                 print("❌ Opción inválida.")
                 self.pausar()
 
-    def listar_empleados(self):
-        """Lista todos los empleados con manejo seguro de valores None"""
-        empleados = self.empleado_model.listar()
-        if not empleados:
-            print("No hay empleados registrados.")
-            return
+    def _paginar(self, obtener_pagina, imprimir_encabezado, imprimir_fila) -> int:
+        """
+        Muestra resultados página a página, pidiendo la siguiente solo si el usuario
+        la quiere. obtener_pagina(after) → {'filas', 'siguiente'}. Devuelve filas mostradas.
+        """
+        mostradas = 0
+        after = None
+        while True:
+            pagina = obtener_pagina(after)
+            if pagina['filas'] and not mostradas:
+                imprimir_encabezado()
+            for fila in pagina['filas']:
+                imprimir_fila(fila)
+            mostradas += len(pagina['filas'])
+            
+            after = pagina['siguiente']
+            if not after:
+                return mostradas
+            if input("\nENTER = página siguiente, 0 = terminar → ").strip() == "0":
+                return mostradas
 
-        print(f"\n{'ID':<4} {'Nombre':<25} {'Email':<30} {'Departamento':<20}")
-        print("─" * 90)
+    def listar_empleados(self):
+        """Lista los empleados página a página con manejo seguro de valores None"""
+        def encabezado():
+            print(f"\n{'ID':<4} {'Nombre':<25} {'Email':<30} {'Departamento':<20}")
+            print("─" * 90)
         
-        for emp in empleados:
+        def fila(emp):
             # Manejo seguro de valores None usando get() y proporcionando valores por defecto
             emp_id = str(emp.get('id', 'N/A'))
             
@@ -106,6 +125,9 @@ class MenuController:
             
             # Imprimir con formato seguro
             print(f"{emp_id:<4} {nombre:<25} {email:<30} {dept_nombre:<20}")
+        
+        if not self._paginar(lambda after: self.empleado_model.pagina(after, limit=20), encabezado, fila):
+            print("No hay empleados registrados.")
 
     def crear_empleado(self):
         """Crea un nuevo empleado"""
@@ -613,10 +635,10 @@ class MenuController:
         print(f"\n{'ID':<4} {'Nombre':<25} {'Estado':<12} {'Empleados':<15}")
         print("─" * 60)
         for p in proyectos:
-            empleados = p.get('empleados_asignados') or 'Ninguno'
-            if empleados is None:
+            if p['empleados']:
+                empleados = f"({len(p['empleados'])}) {p['empleados_asignados']}"[:15]
+            else:
                 empleados = 'Ninguno'
-            empleados = str(empleados)[:15]
             print(f"{p['id']:<4} {p['nombre']:<25} {p['estado']:<12} {empleados:<15}")
 
     def crear_proyecto(self):
@@ -765,16 +787,23 @@ class MenuController:
         print("═" * 60)
         
         try:
-            registros = self.registro_model.listar_por_empleado(self.usuario_id)
-            if not registros:
-                print("No tienes horas registradas.")
-            else:
+            def encabezado():
                 print(f"{'Fecha':<12} {'Proyecto':<20} {'Horas':<6} Descripción")
                 print("─" * 60)
-                for r in registros[:20]:  # Mostrar solo los últimos 20
-                    desc = (r.get('descripcion') or "")[:40]
-                    print(f"{r['fecha']:<12} {r.get('proyecto_nombre', 'Sin nombre'):<20} {r['horas']:<6} {desc}")
-                
+            
+            def fila(r):
+                desc = (r.get('descripcion') or "")[:40]
+                print(f"{str(r['fecha']):<12} {r.get('proyecto_nombre', 'Sin nombre'):<20} {r['horas']:<6} {desc}")
+            
+            # Páginas de 20 bajo demanda, de la más reciente hacia atrás
+            mostrados = self._paginar(
+                lambda after: self.registro_model.pagina_por_empleado(self.usuario_id, after, limit=20),
+                encabezado, fila
+            )
+            
+            if not mostrados:
+                print("No tienes horas registradas.")
+            else:
                 total = self.registro_model.total_horas_empleado(self.usuario_id)
                 print(f"\n📊 TOTAL HORAS: {total:.2f}")
         except Exception as e:
@@ -798,6 +827,13 @@ class MenuController:
             if not self.es_empleado:
                 print("4. Reporte de horas por empleado")
                 print("5. Reporte de horas por proyecto")
+                print("7. Reporte de horas por departamento")
+                print("8. Reporte de horas por mes")
+            
+            # Diagnóstico de base de datos solo para admin
+            if self.es_admin:
+                print("6. Rendimiento de consultas SQL")
+                print("9. Cargar historial de indicadores (series anuales)")
             
             print("0. Volver al menú principal")
             print("─" * 70)
@@ -813,6 +849,14 @@ class MenuController:
                 self._reporte_horas_empleados()
             elif op == "5" and not self.es_empleado:
                 self._reporte_horas_proyectos()
+            elif op == "6" and self.es_admin:
+                self._reporte_rendimiento_sql()
+            elif op == "7" and not self.es_empleado:
+                self._reporte_horas_departamentos()
+            elif op == "8" and not self.es_empleado:
+                self._reporte_horas_meses()
+            elif op == "9" and self.es_admin:
+                self._cargar_historial_indicadores()
             elif op == "0":
                 break
             else:
@@ -827,7 +871,7 @@ class MenuController:
         try:
             # Importar solo cuando sea necesario
             from model.consulta_indicador import ConsultaIndicador
-            top = ConsultaIndicador().top_indicadores_global(10)
+            top = ConsultaIndicador.compartido().top_indicadores_global(10)
             if not top:
                 print("Aún no se han realizado consultas de indicadores.")
             else:
@@ -846,7 +890,10 @@ class MenuController:
         print("═" * 80)
 
         try:
-            stats = self.registro_model.estadisticas_globales()
+            # Las consultas del tablero son independientes: se lanzan en paralelo
+            from model.asincrono import obtener_tablero
+            tablero = obtener_tablero(top=3)
+            stats = tablero['estadisticas']
             print("\n REGISTRO DE HORAS Y PRODUCTIVIDAD")
             print("─" * 80)
             print(f"{'Total de horas registradas':<45}: {stats.get('total_horas_registradas', 0):>10,.2f} h")
@@ -856,6 +903,13 @@ class MenuController:
                 print(f"{'Promedio de horas por empleado':<45}: {stats.get('promedio_horas_por_empleado', 0):>10,.2f} h")
             print(f"{'Primer registro de horas':<45}: {stats.get('fecha_primer_registro', 'Nunca'):>15}")
             print(f"{'Último registro de horas':<45}: {stats.get('fecha_ultimo_registro', 'Nunca'):>15}")
+            
+            print("\n INDICADORES ECONÓMICOS")
+            print("─" * 80)
+            print(f"{'Indicadores con valores guardados':<45}: {len(tablero['ultimos_indicadores']):>10}")
+            print(f"{'Consultas de indicadores hoy':<45}: {tablero['consultas_hoy']:>10}")
+            for t in tablero['top_indicadores']:
+                print(f"   • {t.get('indicador', '?').upper():<41}: {t.get('consultas', 0):>10} consultas")
         except Exception as e:
             print(f"❌ Error al cargar estadísticas: {e}")
         self.pausar()
@@ -867,7 +921,7 @@ class MenuController:
         print("═" * 80)
         try:
             from model.indicador_economico import IndicadorEconomico
-            ultimos = IndicadorEconomico().listar_todos_ultimos()
+            ultimos = IndicadorEconomico.compartido().listar_todos_ultimos()
             if not ultimos:
                 print("No hay datos de indicadores económicos aún.")
             else:
@@ -882,58 +936,222 @@ class MenuController:
             print(f"❌ Error: {e}")
         self.pausar()
 
+    def _cargar_historial_indicadores(self):
+        """Carga masiva de años completos de todos los indicadores (reanudable)"""
+        self.limpiar()
+        print(" CARGA HISTÓRICA DE INDICADORES ECONÓMICOS")
+        print("═" * 80)
+        try:
+            from datetime import date
+            from model.carga_historica import CargaHistorica
+            carga = CargaHistorica.compartido()
+            for codigo, m in carga.marcas().items():
+                print(f"   {codigo:<8} cargado {m['desde']} → {m['hasta']} ({m['valores']} valores)")
+            anio = input(f"Desde el año (ENTER = {date.today().year - 1}): ").strip()
+            if anio and not anio.isdigit():
+                print("❌ Año inválido")
+            else:
+                carga.rellenar(int(anio) if anio else date.today().year - 1)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        self.pausar()
+
+    def _pedir_rango(self):
+        """Rango opcional de fechas para los reportes de horas: (desde, hasta) o None si es inválido"""
+        print("Rango de fechas (YYYY-MM-DD, ENTER = sin límite)")
+        desde = input("  Desde: ").strip() or None
+        hasta = input("  Hasta: ").strip() or None
+        for fecha in (desde, hasta):
+            if fecha and not Reportes._es_fecha_iso(fecha):
+                print(f"❌ Fecha inválida: {fecha}")
+                return None
+        return desde, hasta
+
+    @staticmethod
+    def _titulo_rango(desde, hasta) -> str:
+        if not desde and not hasta:
+            return "histórico"
+        return f"{desde or '…'} a {hasta or '…'}"
+
     def _reporte_horas_empleados(self):
-        """Reporte de horas por empleado con manejo seguro de valores"""
+        """Reporte de horas por empleado (una sola consulta agregada)"""
         self.limpiar()
         print(" REPORTE DE HORAS POR EMPLEADO")
         print("═" * 80)
         
         try:
-            empleados = self.empleado_model.listar()
-            if not empleados:
-                print("No hay empleados registrados.")
-            else:
-                print(f"{'ID':<5} {'Nombre':<25} {'Total Horas':<12} {'Promedio/Día':<12}")
-                print("─" * 80)
-                for emp in empleados:
-                    total = self.registro_model.total_horas_empleado(emp['id'])
-                    # Calcular promedio (asumiendo 20 días laborales al mes)
-                    promedio = total / 20 if total > 0 else 0
-                    nombre = emp.get('nombre', 'Sin nombre') or 'Sin nombre'
-                    print(f"{emp['id']:<5} {nombre[:24]:<25} {total:<12.2f} {promedio:<12.2f}")
+            rango = self._pedir_rango()
+            if rango:
+                filas = self.reportes.horas_por_empleado(*rango)
+                print(f"\nPeríodo: {self._titulo_rango(*rango)}")
+                if not filas:
+                    print("No hay empleados registrados.")
+                else:
+                    print(f"{'ID':<5} {'Nombre':<25} {'Departamento':<18} {'Total Horas':<12} {'Días':<6} {'Promedio/Día':<12}")
+                    print("─" * 80)
+                    for fila in filas:
+                        nombre = fila.nombre or 'Sin nombre'
+                        departamento = fila.departamento or 'Sin asignar'
+                        print(f"{fila.id:<5} {nombre[:24]:<25} {departamento[:17]:<18} "
+                              f"{fila.total_horas:<12.2f} {fila.dias_trabajados:<6} {fila.promedio_dia:<12.2f}")
         except Exception as e:
             print(f"❌ Error: {e}")
         self.pausar()
 
     def _reporte_horas_proyectos(self):
-        """Reporte de horas por proyecto con manejo seguro de valores"""
+        """Reporte de horas por proyecto (una sola consulta agregada)"""
         self.limpiar()
         print(" REPORTE DE HORAS POR PROYECTO")
         print("═" * 80)
         
         try:
-            proyectos = self.proyecto_model.listar(incluir_empleados=False)
-            if not proyectos:
-                print("No hay proyectos registrados.")
-            else:
-                print(f"{'ID':<5} {'Proyecto':<30} {'Estado':<12} {'Total Horas':<12}")
-                print("─" * 80)
-                for proy in proyectos:
-                    # Obtener total de horas para este proyecto
-                    query = "SELECT COALESCE(SUM(horas), 0) AS total FROM registro_tiempo WHERE proyecto_id = %s"
-                    from model.base_model import BaseModel
-                    base = BaseModel()
-                    resultado = base.ejecutar(query, (proy['id'],), fetch_one=True)
-                    total_horas = resultado.get('total', 0) if resultado else 0
-                    
-                    nombre = proy.get('nombre', 'Sin nombre') or 'Sin nombre'
-                    estado = proy.get('estado', 'Desconocido') or 'Desconocido'
-                    
-                    print(f"{proy['id']:<5} {nombre[:29]:<30} {estado:<12} {total_horas:<12.2f}")
+            rango = self._pedir_rango()
+            if rango:
+                filas = self.reportes.horas_por_proyecto(*rango)
+                print(f"\nPeríodo: {self._titulo_rango(*rango)}")
+                if not filas:
+                    print("No hay proyectos registrados.")
+                else:
+                    print(f"{'ID':<5} {'Proyecto':<30} {'Estado':<12} {'Total Horas':<12} {'Empleados':<10}")
+                    print("─" * 80)
+                    for fila in filas:
+                        nombre = fila.nombre or 'Sin nombre'
+                        estado = fila.estado or 'Desconocido'
+                        print(f"{fila.id:<5} {nombre[:29]:<30} {estado:<12} {fila.total_horas:<12.2f} {fila.empleados:<10}")
         except Exception as e:
             print(f"❌ Error: {e}")
         self.pausar()
 
+    def _reporte_horas_departamentos(self):
+        """Reporte de horas por departamento (una sola consulta agregada)"""
+        self.limpiar()
+        print(" REPORTE DE HORAS POR DEPARTAMENTO")
+        print("═" * 80)
+        
+        try:
+            rango = self._pedir_rango()
+            if rango:
+                filas = self.reportes.horas_por_departamento(*rango)
+                print(f"\nPeríodo: {self._titulo_rango(*rango)}")
+                if not filas:
+                    print("No hay empleados registrados.")
+                else:
+                    print(f"{'Departamento':<30} {'Empleados':<10} {'Total Horas':<12} {'Horas/Empleado':<14}")
+                    print("─" * 80)
+                    for fila in filas:
+                        por_empleado = fila.total_horas / fila.empleados if fila.empleados else 0
+                        print(f"{fila.nombre[:29]:<30} {fila.empleados:<10} {fila.total_horas:<12.2f} {por_empleado:<14.2f}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        self.pausar()
+
+    def _reporte_horas_meses(self):
+        """Reporte de horas por mes (una sola consulta agregada)"""
+        self.limpiar()
+        print(" REPORTE DE HORAS POR MES")
+        print("═" * 80)
+        
+        try:
+            rango = self._pedir_rango()
+            if rango:
+                filas = self.reportes.horas_por_mes(*rango)
+                print(f"\nPeríodo: {self._titulo_rango(*rango)}")
+                if not filas:
+                    print("No hay horas registradas en el período.")
+                else:
+                    print(f"{'Mes':<10} {'Total Horas':<12} {'Empleados':<10} {'Proyectos':<10}")
+                    print("─" * 80)
+                    for fila in filas:
+                        print(f"{fila.mes:<10} {fila.total_horas:<12.2f} {fila.empleados:<10} {fila.proyectos:<10}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        self.pausar()
+
+    def _reporte_rendimiento_sql(self):
+        """Métricas por sentencia SQL (solo admin): latencias, filas y errores"""
+        from model.instrumentacion import Instrumentacion
+        while True:
+            self.limpiar()
+            estado = "ACTIVA" if Instrumentacion.activa else "DESACTIVADA"
+            print(f" RENDIMIENTO DE CONSULTAS SQL – instrumentación {estado}")
+            print(f" Umbral de consulta lenta: {Instrumentacion.umbral_lento_ms:.0f} ms")
+            print("═" * 110)
+            
+            stats = Instrumentacion.volcar()[:15]
+            if not stats:
+                print("Sin datos. Active la instrumentación y use el sistema para recolectar métricas.")
+            else:
+                print(f"{'Llamadas':>8} {'Err':>4} {'Filas':>8} {'Total ms':>10} {'p50':>8} {'p95':>8} {'p99':>8}  Sentencia")
+                print("─" * 110)
+                for st in stats:
+                    print(f"{st['llamadas']:>8} {st['errores']:>4} {st['filas']:>8} {st['total_ms']:>10.1f} "
+                          f"{st['p50_ms']:>8.2f} {st['p95_ms']:>8.2f} {st['p99_ms']:>8.2f}  {st['sentencia'][:45]}")
+            
+            from config.database import DatabaseConnection
+            enrutador = DatabaseConnection.get_enrutador()
+            if enrutador is not None:
+                lectura = enrutador.estadisticas()
+                print("─" * 110)
+                print(f" Réplicas ({lectura['estrategia']}, primario {lectura['ventana_primario']:.0f}s tras escribir) "
+                      f"– lecturas en primario: {lectura['lecturas_primario']}")
+                for r in lectura['replicas']:
+                    latencia = f"{r['latencia_ms']:.2f} ms" if r['latencia_ms'] is not None else "sin datos"
+                    estado_r = "OK" if r['disponible'] else "APARTADA"
+                    print(f"   {r['nombre']:<30} {r['lecturas']:>8} lecturas  {latencia:>12}  "
+                          f"{r['fallos']:>3} fallos  {estado_r}")
+            
+            from model.cache_resultados import CacheEntidades, CacheResultados
+            cache = CacheResultados.estadisticas()
+            entidades = CacheEntidades.estadisticas()
+            print("─" * 110)
+            print(f" Caché de resultados ({'ACTIVA' if CacheResultados.activa else 'DESACTIVADA'}, "
+                  f"TTL {CacheResultados.TTL:.0f}s): {cache['entradas']}/{CacheResultados.MAX_ENTRADAS} entradas, "
+                  f"{cache['aciertos']} aciertos, {cache['fallos']} fallos ({cache['tasa_aciertos']:.0%}), "
+                  f"{cache['desalojos']} desalojos, {cache['vencidas']} vencidas, {cache['invalidadas']} invalidadas")
+            print(f" Caché de entidades por id (TTL {CacheEntidades.TTL:.0f}s): {entidades['entradas']} filas, "
+                  f"{entidades['aciertos']} aciertos, {entidades['negativos']} 'no existe', {entidades['fallos']} fallos "
+                  f"({entidades['tasa_aciertos']:.0%}), {entidades['desalojos']} desalojos, "
+                  f"{entidades['invalidadas']} invalidadas")
+            from model.bus_invalidacion import BusInvalidacion
+            bus = BusInvalidacion.estadisticas()
+            if bus['activo']:
+                print(f" Bus entre procesos (cada {BusInvalidacion.INTERVALO:g}s): {bus['publicados']} publicados, "
+                      f"{bus['recibidos']} recibidos, retraso p50 {bus['retraso_p50']}s / p95 {bus['retraso_p95']}s "
+                      f"/ máx {bus['retraso_max']}s, {bus['errores']} errores, {bus['vaciados']} vaciados")
+            else:
+                print(" Bus entre procesos: INACTIVO (las cachés no ven escrituras de otras instancias hasta su TTL)")
+            from model.almacen_indicadores import AlmacenIndicadores
+            indicadores = AlmacenIndicadores.estadisticas()
+            print(f" Indicadores (hoy TTL {AlmacenIndicadores.TTL_HOY:.0f}s): {indicadores['entradas']} en memoria, "
+                  f"{indicadores['memoria']} de memoria, {indicadores['tabla']} de tabla, {indicadores['api']} de API "
+                  f"({indicadores['tasa_sin_api']:.0%} sin API), {indicadores['sin_conexion']} sin conexión, "
+                  f"{indicadores['escritos']} escritos, {indicadores['por_escribir']} por escribir")
+            from model.cliente_mindicador import ClienteMindicador
+            http = ClienteMindicador.compartido().estadisticas()
+            print(f" API mindicador.cl: circuito {http['estado'].upper()}"
+                  + (f" (reabre en {http['reabre_en']:.0f}s)" if http['estado'] == 'abierto' else "")
+                  + f", {http['aperturas']} aperturas")
+            for nombre, e in http['endpoints'].items():
+                print(f"   {nombre:<16} {e['llamadas']:>6} llamadas {e['errores']:>4} errores {e['reintentos']:>4} reintentos"
+                      f"   p50 {e['p50_ms']} ms / p95 {e['p95_ms']} ms / máx {e['max_ms']} ms")
+            
+            print("─" * 110)
+            print("1. Activar/desactivar   2. Reiniciar métricas   3. Vaciar caché   0. Volver")
+            op = input(" → ").strip()
+            if op == "1":
+                if Instrumentacion.activa:
+                    Instrumentacion.desactivar()
+                else:
+                    Instrumentacion.activar()
+            elif op == "2":
+                Instrumentacion.reiniciar()
+            elif op == "3":
+                CacheResultados.limpiar()
+                CacheEntidades.limpiar()
+                AlmacenIndicadores.limpiar()
+            elif op == "0":
+                break
+
     # ==================== MÉTODOS DE GESTIÓN DE USUARIOS ====================
     def gestion_usuarios(self):
         """Gestión de usuarios (solo para admin)"""
@@ -39,76 +39,67 @@ def verificar_estructura():
     
     return problemas
 
+def reportar_estructura():
+    """Diagnóstico de carpetas/archivos: solo se ejecuta si falla una importación"""
+    problemas = verificar_estructura()
+    if problemas:
+        print("\n❌ Problemas de estructura encontrados:")
+        for problema in problemas:
+            print(f"   • {problema}")
+        print("\n🔧 Por favor, asegúrate de que todos los archivos y carpetas existan.")
+        print("\n📁 Estructura esperada:")
+        print("   main.py")
+        print("   config/")
+        print("   ├── database.py")
+        print("   model/")
+        print("   ├── inicializador_bd.py")
+        print("   ├── base_model.py")
+        print("   ├── usuario.py")
+        print("   controller/")
+        print("   ├── auth_controller.py")
+        print("   ├── menu_controller.py")
+        print("   view/")
+        print("   └── menu_consola.py")
+
 def inicializar_sistema():
-    """Función principal optimizada para tu estructura"""
+    """
+    Arranque rápido: la base de datos se inicializa y se calienta en segundo plano
+    mientras el usuario escribe sus credenciales; el login espera solo si hace falta.
+    """
     try:
         # Mostrar banner
         print("\n" + "═" * 60)
         print("       SISTEMA DE GESTIÓN - ECOTECH SOLUTIONS")
         print("═" * 60)
         
-        # Verificar estructura primero
-        problemas = verificar_estructura()
-        if problemas:
-            print("\n❌ Problemas de estructura encontrados:")
-            for problema in problemas:
-                print(f"   • {problema}")
-            print("\n🔧 Por favor, asegúrate de que todos los archivos y carpetas existan.")
-            print("\n📁 Estructura esperada:")
-            print("   main.py")
-            print("   config/")
-            print("   ├── database.py")
-            print("   model/")
-            print("   ├── inicializador_bd.py")
-            print("   ├── base_model.py")
-            print("   ├── usuario.py")
-            print("   controller/")
-            print("   ├── auth_controller.py")
-            print("   ├── menu_controller.py")
-            print("   view/")
-            print("   └── menu_consola.py")
-            sys.exit(1)
-        
-        # 1. Inicializar base de datos completa
-        print("\n🔄 Inicializando base de datos...")
-        
-        # Importar y ejecutar inicializador desde model/
+        # 1. Base de datos (migraciones + pool) en segundo plano
         try:
-            # El inicializador está en model/
             from model.inicializador_bd import InicializadorBDCompleto
-            if not InicializadorBDCompleto.inicializar():
-                print("\n❌ No se pudo inicializar la base de datos")
-                print("🔧 Verifica que MySQL esté ejecutándose y las credenciales sean correctas")
-                input("\nPresiona ENTER para salir...")
-                sys.exit(1)
+            from controller.auth_controller import AuthController
         except ImportError as e:
-            print(f"❌ Error al importar inicializador: {e}")
-            print("🔧 Asegúrate de que el archivo model/inicializador_bd.py existe")
-            sys.exit(1)
-        except Exception as e:
-            print(f"❌ Error al ejecutar inicializador: {e}")
-            traceback.print_exc()
+            print(f"❌ Error al importar el sistema: {e}")
+            reportar_estructura()
             sys.exit(1)
         
+        arranque = InicializadorBDCompleto.en_segundo_plano()
+        
         # 2. Proceso de autenticación
         print("\n" + "═" * 60)
         print("       INICIANDO AUTENTICACIÓN")
         print("═" * 60)
         
-        # Importar controlador de autenticación desde controller/
         try:
-            from controller.auth_controller import AuthController
-            auth = AuthController()
+            auth = AuthController(arranque)
             usuario = auth.login()
             
             if not usuario:
-                print("\n❌ Autenticación fallida")
+                if arranque.listo() and not arranque.ok:
+                    print("\n❌ No se pudo inicializar la base de datos")
+                    print("🔧 Verifica que MySQL esté ejecutándose y las credenciales sean correctas")
+                else:
+                    print("\n❌ Autenticación fallida")
                 input("Presiona ENTER para salir...")
                 sys.exit(1)
-        except ImportError as e:
-            print(f"❌ Error al importar auth_controller: {e}")
-            print("🔧 Asegúrate de que controller/auth_controller.py existe")
-            sys.exit(1)
         except Exception as e:
             print(f"❌ Error en autenticación: {e}")
             traceback.print_exc()
@@ -120,7 +111,7 @@ def inicializar_sistema():
             iniciar_interfaz(usuario)
         except ImportError as e:
             print(f"❌ Error al importar menú consola: {e}")
-            print("🔧 Asegúrate de que view/menu_consola.py existe")
+            reportar_estructura()
             sys.exit(1)
         
     except KeyboardInterrupt:
@@ -130,9 +121,13 @@ def inicializar_sistema():
         print(f"   Detalle: {e}")
         traceback.print_exc()
     finally:
-        # Cerrar conexión si existe
+        # Escribir indicadores traídos, publicar las últimas invalidaciones y cerrar conexión
         try:
+            from model.almacen_indicadores import AlmacenIndicadores
+            from model.bus_invalidacion import BusInvalidacion
             from config.database import DatabaseConnection
+            AlmacenIndicadores.detener()
+            BusInvalidacion.detener()
             DatabaseConnection.close_connection()
         except ImportError:
             pass
@@ -0,0 +1,199 @@
+# model/almacen_indicadores.py - Lectura de indicadores: memoria → indicador_economico → mindicador.cl
+"""
+Un valor histórico de un indicador no cambia nunca: una vez traído no hace falta
+volver a pedirlo a la API (segundos por consulta si está lenta). Cada consulta
+pasa por tres niveles y la respuesta dice cuál la sirvió (ValorIndicador.origen):
+
+  1. memoria: LRU del proceso (microsegundos). Los valores de hoy vencen a los
+     TTL_HOY segundos (bitcoin y dólar cambian durante el día); los históricos no.
+  2. tabla:   indicador_economico (solo fechas pasadas; hoy se pregunta a la API).
+  3. api:     mindicador.cl (ClienteMindicador). Lo traído se escribe en indicador_economico desde un
+              hilo aparte, sin hacer esperar al usuario.
+
+Sin conexión, hoy se sirve de lo último conocido (memoria vencida o la tabla),
+marcado "sin conexión"; los históricos ya vistos siguen saliendo de memoria o tabla.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from model.cliente_mindicador import ClienteMindicador
+from model.indicador_economico import IndicadorEconomico
+
+
+class ValorIndicador(NamedTuple):
+    codigo: str
+    fecha: str       # YYYY-MM-DD del valor (hoy puede traer el último día hábil)
+    valor: float
+    origen: str      # 'memoria', 'tabla', 'api' (+ ' (sin conexión)' si la API no respondió)
+
+
+Clave = Tuple[str, Optional[str]]  # (código, fecha pedida o None = hoy)
+
+
+class AlmacenIndicadores:
+    """Lectura a través de los tres niveles; todo a nivel de clase (uno por proceso)"""
+
+    MAX_ENTRADAS = 1024
+    TTL_HOY = 300.0         # valores de hoy (o "último") en memoria
+    TTL_SIN_DATOS = 300.0   # fechas sin valor publicado (fines de semana, feriados)
+    REINTENTO_ESCRITURA = 5.0
+
+    # clave → (vence o None si no vence, valor o None si la API no tiene dato)
+    _memoria: 'OrderedDict[Clave, Tuple[Optional[float], Optional[ValorIndicador]]]' = OrderedDict()
+    _lock = threading.Lock()
+    _por_escribir: Dict[Tuple[str, str], float] = {}  # (código, fecha) → valor
+    _hay_escrituras = threading.Event()
+    _escritor: Optional[threading.Thread] = None
+    _stats = {'memoria': 0, 'tabla': 0, 'api': 0, 'sin_conexion': 0, 'sin_datos': 0,
+              'escritos': 0, 'errores_escritura': 0}
+
+    # ====================== CONSULTA ======================
+    @classmethod
+    def consultar(cls, codigo: str, fecha: Optional[str] = None) -> Optional[ValorIndicador]:
+        """
+        Valor del indicador en la fecha (YYYY-MM-DD; None = hoy). None si no hay dato
+        publicado. Los errores de red se propagan solo si ningún nivel tiene el valor.
+        """
+        codigo = codigo.lower().strip()
+        if codigo not in IndicadorEconomico.CODIGOS_VALIDOS:
+            raise ValueError(f"Indicador no soportado: {codigo}")
+        clave = (codigo, fecha)
+        # Hoy (o futuro) puede cambiar todavía: ni vale para siempre ni se confía en la tabla
+        es_historico = fecha is not None and fecha < date.today().isoformat()
+
+        entrada = cls._leer_memoria(clave)
+        if entrada is not None and entrada[0]:
+            cls._stats['memoria'] += 1
+            valor = entrada[1]
+            return valor._replace(origen='memoria') if valor else None
+
+        if es_historico:
+            valor = cls._leer_tabla(codigo, fecha)
+            if valor is not None:
+                cls._guardar_memoria(clave, valor, None)
+                cls._stats['tabla'] += 1
+                return valor
+
+        try:
+            valor = cls._pedir_api(codigo, fecha)
+        except Exception:
+            respaldo = entrada[1] if entrada is not None else None
+            if respaldo is None and not es_historico:  # el histórico ya se buscó en la tabla
+                respaldo = cls._leer_tabla(codigo, fecha, ultimo=fecha is None)
+            if respaldo is None:
+                raise
+            cls._stats['sin_conexion'] += 1
+            return respaldo._replace(origen=f"{respaldo.origen} (sin conexión)")
+
+        if valor is None:
+            cls._stats['sin_datos'] += 1
+            cls._guardar_memoria(clave, None, cls.TTL_SIN_DATOS)
+            return None
+        cls._stats['api'] += 1
+        cls._guardar_memoria(clave, valor, None if es_historico else cls.TTL_HOY)
+        cls._encolar_escritura(valor)
+        return valor
+
+    # ====================== NIVELES ======================
+    @classmethod
+    def _leer_memoria(cls, clave: Clave) -> Optional[Tuple[bool, Optional[ValorIndicador]]]:
+        """(vigente, valor) o None si nunca se guardó; lo vencido se conserva como respaldo"""
+        with cls._lock:
+            entrada = cls._memoria.get(clave)
+            if entrada is None:
+                return None
+            cls._memoria.move_to_end(clave)
+        vence, valor = entrada
+        return (vence is None or vence > time.monotonic()), valor
+
+    @classmethod
+    def _guardar_memoria(cls, clave: Clave, valor: Optional[ValorIndicador], ttl: Optional[float]) -> None:
+        with cls._lock:
+            cls._memoria[clave] = (None if ttl is None else time.monotonic() + ttl, valor)
+            cls._memoria.move_to_end(clave)
+            while len(cls._memoria) > cls.MAX_ENTRADAS:
+                cls._memoria.popitem(last=False)
+
+    @staticmethod
+    def _leer_tabla(codigo: str, fecha: Optional[str], ultimo: bool = False) -> Optional[ValorIndicador]:
+        modelo = IndicadorEconomico.compartido()
+        fila = modelo.ultimo_valor(codigo) if ultimo else modelo.obtener(codigo, fecha)
+        if not fila:
+            return None
+        return ValorIndicador(codigo, str(fila['fecha'])[:10], float(fila['valor']), 'tabla')
+
+    @classmethod
+    def _pedir_api(cls, codigo: str, fecha: Optional[str]) -> Optional[ValorIndicador]:
+        """Consulta a mindicador.cl; None si la serie viene vacía (sin dato para esa fecha)"""
+        serie = ClienteMindicador.compartido().serie(codigo, fecha)
+        if not serie:
+            return None
+        return ValorIndicador(codigo, serie[0]['fecha'][:10], float(serie[0]['valor']), 'api')
+
+    # ====================== ESCRITURA EN SEGUNDO PLANO ======================
+    @classmethod
+    def _encolar_escritura(cls, valor: ValorIndicador) -> None:
+        with cls._lock:
+            cls._por_escribir[(valor.codigo, valor.fecha)] = valor.valor
+            if cls._escritor is None or not cls._escritor.is_alive():
+                cls._escritor = threading.Thread(target=cls._ciclo_escritura,
+                                                 name='ecotech-indicadores', daemon=True)
+                cls._escritor.start()
+        cls._hay_escrituras.set()
+
+    @classmethod
+    def _ciclo_escritura(cls) -> None:
+        while True:
+            cls._hay_escrituras.wait()
+            cls._hay_escrituras.clear()
+            if not cls.escribir_pendientes():
+                time.sleep(cls.REINTENTO_ESCRITURA)
+
+    @classmethod
+    def escribir_pendientes(cls) -> bool:
+        """Upsert de lo traído de la API; lo que falla queda para el próximo intento"""
+        with cls._lock:
+            pendientes, cls._por_escribir = cls._por_escribir, {}
+        if not pendientes:
+            return True
+        valores = [(codigo, fecha, valor) for (codigo, fecha), valor in pendientes.items()]
+        try:
+            resultados = IndicadorEconomico.compartido().guardar_consultados(valores)
+        except Exception:
+            resultados = [{'ok': False}] * len(valores)
+        fallidos = {(c, f): v for (c, f, v), r in zip(valores, resultados) if not r['ok']}
+        cls._stats['escritos'] += len(valores) - len(fallidos)
+        if fallidos:
+            cls._stats['errores_escritura'] += len(fallidos)
+            with cls._lock:
+                for clave, valor in fallidos.items():
+                    cls._por_escribir.setdefault(clave, valor)
+            cls._hay_escrituras.set()
+        return not fallidos
+
+    @classmethod
+    def detener(cls) -> None:
+        """Escribe lo pendiente antes de cerrar (el hilo es daemon: no lo esperaría nadie)"""
+        try:
+            cls.escribir_pendientes()
+        except Exception:
+            pass
+
+    # ====================== ADMINISTRACIÓN ======================
+    @classmethod
+    def limpiar(cls) -> None:
+        with cls._lock:
+            cls._memoria.clear()
+
+    @classmethod
+    def estadisticas(cls) -> Dict[str, Any]:
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entradas'] = len(cls._memoria)
+            stats['por_escribir'] = len(cls._por_escribir)
+        consultas = stats['memoria'] + stats['tabla'] + stats['api'] + stats['sin_conexion'] + stats['sin_datos']
+        stats['tasa_sin_api'] = round((stats['memoria'] + stats['tabla']) / consultas, 3) if consultas else 0.0
+        return stats
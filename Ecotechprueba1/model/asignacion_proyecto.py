@@ -1,10 +1,36 @@
 # model/asignacion_proyecto.py
 # Modelo especializado N:M Empleado ↔ Proyecto
 # Arquitectura limpia, rendimiento óptimo, reutilización
-from model.base_model import BaseModel
-from model.empleado import Empleado
-from model.proyecto import Proyecto
-from typing import List, Dict, Optional
+from model.base_model import BaseModel, transaccional
+from typing import Iterable, List, Dict, Optional
+
+
+# Relaciones en bloque (model/cargador.py): {ids} = marcadores del IN, la primera columna agrupa
+SQL_EMPLEADOS_DE_PROYECTOS = """
+    SELECT ap.proyecto_id AS _clave, e.*, d.nombre AS departamento_nombre
+    FROM asignacion_proyecto ap
+    JOIN empleado e ON e.id = ap.empleado_id
+    LEFT JOIN departamento d ON e.departamento_id = d.id
+    WHERE ap.proyecto_id IN ({ids})
+    ORDER BY e.nombre, e.id
+"""
+SQL_PROYECTOS_DE_EMPLEADOS = """
+    SELECT ap.empleado_id AS _clave, p.*,
+           DATE_FORMAT(p.fecha_inicio, '%%d/%%m/%%Y') AS fecha_inicio_fmt
+    FROM asignacion_proyecto ap
+    JOIN proyecto p ON p.id = ap.proyecto_id
+    WHERE ap.empleado_id IN ({ids})
+    ORDER BY p.fecha_inicio DESC, p.nombre
+"""
+
+
+def agrupar(filas: Iterable[Dict]) -> Dict[int, List[Dict]]:
+    """Filas de una consulta en bloque → {_clave: [filas sin _clave]} (en el orden recibido)"""
+    grupos: Dict[int, List[Dict]] = {}
+    for fila in filas:
+        grupos.setdefault(fila.pop('_clave'), []).append(fila)
+    return grupos
+
 
 class AsignacionProyecto(BaseModel):
     """
@@ -15,16 +41,13 @@ class AsignacionProyecto(BaseModel):
     • Buenas prácticas de diseño
     """
 
-    # Instancias únicas reutilizables → rendimiento máximo
-    _empleado_model = Empleado()
-    _proyecto_model = Proyecto()
-
+    @transaccional()
     def asignar(self, empleado_id: int, proyecto_id: int) -> bool:
         """Asigna un empleado a un proyecto (INSERT IGNORE → idempotente)"""
-        if not self._empleado_model.buscar_por_id(empleado_id):
+        if not self.existe('empleado', empleado_id):
             print(f"Empleado ID {empleado_id} no existe.")
             return False
-        if not self._proyecto_model.buscar_por_id(proyecto_id):
+        if not self.existe('proyecto', proyecto_id):
             print(f"Proyecto ID {proyecto_id} no existe.")
             return False
 
@@ -66,28 +89,28 @@ class AsignacionProyecto(BaseModel):
 
     def proyectos_del_empleado(self, empleado_id: int) -> List[Dict]:
         """Todos los proyectos en los que trabaja un empleado"""
-        query = """
-            SELECT p.*, 
-                   DATE_FORMAT(p.fecha_inicio, '%d/%m/%Y') AS fecha_inicio_fmt
-            FROM proyecto p
-            JOIN asignacion_proyecto ap ON p.id = ap.proyecto_id
-            WHERE ap.empleado_id = %s
-            ORDER BY p.fecha_inicio DESC, p.nombre
-        """
-        return self.ejecutar(query, (empleado_id,)) or []
+        return self.proyectos_de_empleados((empleado_id,)).get(empleado_id, [])
 
     def empleados_del_proyecto(self, proyecto_id: int) -> List[Dict]:
         """Todos los empleados asignados a un proyecto"""
-        query = """
-            SELECT e.*, 
-                   d.nombre AS departamento_nombre
-            FROM empleado e
-            JOIN asignacion_proyecto ap ON e.id = ap.empleado_id
-            LEFT JOIN departamento d ON e.departamento_id = d.id
-            WHERE ap.proyecto_id = %s
-            ORDER BY e.nombre
-        """
-        return self.ejecutar(query, (proyecto_id,)) or []
+        return self.empleados_de_proyectos((proyecto_id,)).get(proyecto_id, [])
+
+    def proyectos_de_empleados(self, empleado_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        """{empleado_id: [proyectos]} para muchos empleados, una consulta IN por bloque"""
+        return self._relacion_en_bloque(SQL_PROYECTOS_DE_EMPLEADOS, empleado_ids)
+
+    def empleados_de_proyectos(self, proyecto_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        """{proyecto_id: [empleados]} para muchos proyectos (listas completas, sin GROUP_CONCAT)"""
+        return self._relacion_en_bloque(SQL_EMPLEADOS_DE_PROYECTOS, proyecto_ids)
+
+    def _relacion_en_bloque(self, plantilla: str, ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        grupos: Dict[int, List[Dict]] = {}
+        for inicio in range(0, len(ids), self.TAMANO_IN):
+            bloque = ids[inicio:inicio + self.TAMANO_IN]
+            query = plantilla.format(ids=', '.join(['%s'] * len(bloque)))
+            grupos.update(agrupar(self.ejecutar(query, tuple(bloque)) or []))
+        return grupos
 
     def total_asignados_proyecto(self, proyecto_id: int) -> int:
         """Cantidad de empleados en un proyecto"""
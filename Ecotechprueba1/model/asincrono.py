@@ -0,0 +1,117 @@
+# model/asincrono.py - Acceso a datos para asyncio sobre los mismos modelos
+import asyncio
+import inspect
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+from config.database import DatabaseConnection
+from config.pool import PoolConexiones
+from model.base_model import BaseModel
+
+
+class PoolAsincrono:
+    """
+    Frente asyncio del pool de conexiones. El driver es bloqueante, así que cada
+    consulta corre en un hilo propio; el semáforo deja en vuelo a lo sumo
+    max_size consultas, de modo que ninguna espera conexión dentro de un hilo.
+    """
+
+    _compartido = None
+    _lock = threading.Lock()
+
+    def __init__(self, pool: PoolConexiones):
+        self.pool = pool
+        self._hilos = ThreadPoolExecutor(max_workers=pool.max_size, thread_name_prefix='ecotech-sql')
+        # asyncio.Semaphore pertenece a un event loop: uno por loop vivo
+        self._semaforos = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def compartido(cls) -> 'PoolAsincrono':
+        """Instancia única ligada al pool actual de DatabaseConnection"""
+        pool = DatabaseConnection.get_pool()
+        with cls._lock:
+            if cls._compartido is None or cls._compartido.pool is not pool:
+                if cls._compartido is not None:
+                    cls._compartido.cerrar()
+                cls._compartido = cls(pool)
+            return cls._compartido
+
+    def _semaforo(self, loop) -> asyncio.Semaphore:
+        semaforo = self._semaforos.get(loop)
+        if semaforo is None:
+            semaforo = self._semaforos[loop] = asyncio.Semaphore(self.pool.max_size)
+        return semaforo
+
+    async def correr(self, funcion: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        async with self._semaforo(loop):
+            return await loop.run_in_executor(self._hilos, partial(funcion, *args, **kwargs))
+
+    def cerrar(self) -> None:
+        self._hilos.shutdown(wait=False)
+
+
+class ModeloAsincrono:
+    """
+    Gemelo async de un modelo: ModeloAsincrono(RegistroTiempo.compartido()).estadisticas_globales()
+    devuelve una corrutina. Las consultas son las del modelo síncrono, no se duplican.
+    Cada llamada es autónoma: no participa de una BaseModel.transaccion() abierta en otro hilo.
+    """
+
+    def __init__(self, modelo: BaseModel, pool: PoolAsincrono = None):
+        self._modelo = modelo
+        self._pool = pool or PoolAsincrono.compartido()
+
+    async def ejecutar(self, query, params=None, fetch_one: bool = False) -> Any:
+        return await self._pool.correr(self._modelo.ejecutar, query, params, fetch_one)
+
+    def __getattr__(self, nombre: str):
+        atributo = getattr(self._modelo, nombre)
+        if not callable(atributo):
+            return atributo
+        if inspect.isgeneratorfunction(atributo) or nombre.startswith('iter'):
+            # Un generador tendría la conexión tomada entre awaits: usar la versión paginada
+            raise AttributeError(f"{nombre} es un iterador síncrono; use la variante pagina_* en modo async")
+
+        async def metodo(*args, **kwargs):
+            return await self._pool.correr(atributo, *args, **kwargs)
+
+        metodo.__name__ = nombre
+        self.__dict__[nombre] = metodo  # siguiente acceso sin pasar por __getattr__
+        return metodo
+
+    def __repr__(self):
+        return f"ModeloAsincrono({type(self._modelo).__name__})"
+
+
+# ====================== TABLERO ======================
+async def cargar_tablero(top: int = 10) -> Dict[str, Any]:
+    """Consultas independientes del tablero en paralelo (una conexión cada una)"""
+    from model.registro_tiempo import RegistroTiempo
+    from model.indicador_economico import IndicadorEconomico
+    from model.consulta_indicador import ConsultaIndicador
+
+    registros = ModeloAsincrono(RegistroTiempo.compartido())
+    indicadores = ModeloAsincrono(IndicadorEconomico.compartido())
+    consultas = ModeloAsincrono(ConsultaIndicador.compartido())
+
+    estadisticas, ultimos, top_indicadores, consultas_hoy = await asyncio.gather(
+        registros.estadisticas_globales(),
+        indicadores.listar_todos_ultimos(),
+        consultas.top_indicadores_global(top),
+        consultas.total_consultas_hoy()
+    )
+    return {
+        'estadisticas': estadisticas or {},
+        'ultimos_indicadores': ultimos or [],
+        'top_indicadores': top_indicadores or [],
+        'consultas_hoy': consultas_hoy or 0
+    }
+
+
+def obtener_tablero(top: int = 10) -> Dict[str, Any]:
+    """Punto de entrada síncrono (consola) para cargar_tablero()"""
+    return asyncio.run(cargar_tablero(top))
@@ -1,55 +1,718 @@
 # model/base_model.py - Corregido
+import base64
+import json
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from datetime import date
+from time import perf_counter
 from config.database import DatabaseConnection
-from typing import Optional, List, Dict, Any
+from model.query import Query, query_actualizar, query_generica, query_proyeccion
+from model.instrumentacion import Instrumentacion
+from model.cache_resultados import CacheEntidades, CacheResultados, FALTA, copia_superficial
+from model.bus_invalidacion import BusInvalidacion
+from model.filas import FORMATOS, Columnas, FilasCompactas
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence, Callable, Tuple
+
+
+class _EstadoTransaccion(threading.local):
+    """
+    Por hilo: conexión de la transacción abierta, profundidad, si falló alguna
+    sentencia, escrituras hechas (tabla, id de fila, inserción: para invalidar
+    cachés al confirmar) y cuántos bloques desde_primario() están activos
+    """
+    conn = None
+    nivel = 0
+    fallida = False
+    escrituras = None
+    forzar_primario = 0
+
+
+_ESTADO_TX = _EstadoTransaccion()
+
+
+class TransaccionFallida(Exception):
+    """Una sentencia dentro de transaccion() falló y la unidad de trabajo se revirtió"""
+
+
+def transaccional(si_falla: Any = False):
+    """
+    Ejecuta el método entero dentro de BaseModel.transaccion().
+    Si la unidad de trabajo es la más externa y falla, se informa y se devuelve
+    si_falla (mismo contrato que ejecutar()); si está anidada, el error sube
+    para que la transacción de afuera también se revierta.
+    """
+    def decorador(metodo):
+        @wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            externa = not BaseModel.en_transaccion()
+            try:
+                with BaseModel.transaccion():
+                    return metodo(self, *args, **kwargs)
+            except Exception as e:
+                if not externa:
+                    raise
+                print(f"❌ {type(self).__name__}.{metodo.__name__} revertido: {e}")
+                return si_falla
+        return envoltura
+    return decorador
+
+
+def cacheado(*tablas: str, ttl: float = None):
+    """
+    Guarda el resultado del método en CacheResultados por (método, argumentos).
+    tablas = las que lee la consulta: una escritura en cualquiera lo invalida.
+    Dentro de transaccion() no se usa (podría ver cambios sin confirmar), ni
+    con argumentos no hashables (listas de ids, etc.).
+    """
+    def decorador(metodo):
+        nombre = metodo.__qualname__
+        
+        @wraps(metodo)
+        def envoltura(primero, *args, **kwargs):
+            if not CacheResultados.activa or _ESTADO_TX.conn is not None:
+                return metodo(primero, *args, **kwargs)
+            clave = (nombre, args, tuple(sorted(kwargs.items()))) if kwargs else (nombre, args)
+            try:
+                valor = CacheResultados.obtener(clave)
+            except TypeError:
+                return metodo(primero, *args, **kwargs)
+            if valor is FALTA:
+                escrituras = CacheResultados.escrituras
+                valor = metodo(primero, *args, **kwargs)
+                CacheResultados.guardar(clave, valor, tablas, escrituras, ttl)
+            return copia_superficial(valor)
+        return envoltura
+    return decorador
+
+
+def _invalidar_caches(tabla: str, id_fila=None, insercion: bool = False) -> None:
+    """Cachés de este proceso; tabla '*' = sentencias libres, no se sabe qué tocaron"""
+    if tabla == '*':
+        _limpiar_caches()
+        return
+    CacheResultados.invalidar(tabla)
+    CacheEntidades.invalidar(tabla, id_fila, insercion)
+
+
+def _limpiar_caches() -> None:
+    CacheResultados.limpiar()
+    CacheEntidades.limpiar()
+
+
+# Las escrituras de otros procesos llegan por el bus a las mismas cachés
+BusInvalidacion.suscribir(_invalidar_caches, _limpiar_caches)
+
+
+def _tras_escribir(q: Query, params=None) -> None:
+    """
+    Invalida las cachés de la tabla escrita (de entidades, solo la fila si la
+    sentencia es WHERE id = %s) y la publica a los demás procesos; en una
+    transacción, otra vez al confirmar (y recién ahí se publica)
+    """
+    tabla = q.tabla_escrita
+    if tabla is not None:
+        id_fila = params[q.param_id] if q.param_id is not None and params else None
+        _invalidar_caches(tabla, id_fila, q.es_insercion)
+        if _ESTADO_TX.conn is not None:
+            _ESTADO_TX.escrituras.add((tabla, id_fila, q.es_insercion))
+        else:
+            BusInvalidacion.publicar(tabla, id_fila, q.es_insercion)
+
 
 class BaseModel:
-    """Clase base optimizada con conexión por instancia"""
+    """Clase base optimizada: toma prestada una conexión del pool por consulta"""
+    
+    # Filas pedidas al servidor por viaje en los iteradores (iterar / iter_*)
+    TAMANO_LOTE = 500
+    
+    # Una instancia por modelo para todo el proceso (ver compartido())
+    _compartidos: Dict[type, 'BaseModel'] = {}
+    _lock_compartidos = threading.Lock()
+    
+    @property
+    def pool(self):
+        """Pool vigente de DatabaseConnection: instanciar un modelo no toca la base"""
+        return DatabaseConnection._pool or DatabaseConnection.get_pool()
+    
+    @classmethod
+    def compartido(cls):
+        """
+        Instancia única de este modelo, creada al primer uso. Los modelos no guardan
+        estado propio (la transacción en curso vive por hilo en _ESTADO_TX), así que
+        la misma instancia sirve a todos los hilos: Empleado.compartido().buscar_por_id(1)
+        """
+        instancia = BaseModel._compartidos.get(cls)
+        if instancia is None:
+            with BaseModel._lock_compartidos:
+                instancia = BaseModel._compartidos.get(cls)
+                if instancia is None:
+                    instancia = BaseModel._compartidos[cls] = cls()
+        return instancia
+    
+    # ====================== CONEXIÓN Y TRANSACCIONES ======================
+    _tx = _ESTADO_TX
+    
+    @classmethod
+    def en_transaccion(cls) -> bool:
+        return _ESTADO_TX.conn is not None
+    
+    @contextmanager
+    def _conexion(self):
+        """Conexión de la transacción en curso o una prestada del pool solo para esta sentencia"""
+        conn = _ESTADO_TX.conn
+        if conn is not None:
+            yield conn
+        else:
+            with self.pool.conexion() as conn:
+                yield conn
     
-    def __init__(self):
-        self.conn = DatabaseConnection.get_connection()
-        self.cursor = self.conn.cursor()
+    @contextmanager
+    def cursor(self, escritura: bool = False, primario: bool = False):
+        """
+        Un solo cursor (y una sola conexión) para una serie de sentencias, p.ej. dentro
+        de un bucle, en vez de un préstamo y un cursor por llamada. Dentro de transaccion()
+        usa su conexión. Con escritura=True confirma al salir; si no, las lecturas pueden
+        ir a una réplica como en ejecutar().
+        """
+        if _ESTADO_TX.conn is not None:
+            contexto = nullcontext(_ESTADO_TX.conn)
+        elif not escritura and DatabaseConnection._replicas and not primario and not _ESTADO_TX.forzar_primario:
+            contexto = DatabaseConnection.get_enrutador().conexion()
+        else:
+            contexto = self.pool.conexion()
+        with contexto as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+            if escritura:
+                self._confirmar(conn)
+                _invalidar_caches('*')  # sentencias libres: no se sabe qué tablas tocaron
+                BusInvalidacion.publicar('*')
     
-    def ejecutar(self, query: str, params=None, fetch_one: bool = False) -> Any:
-        """Método ejecutar optimizado"""
+    @classmethod
+    @contextmanager
+    def transaccion(cls):
+        """
+        Unidad de trabajo: with BaseModel.transaccion(): ...
+        Todas las sentencias del bloque usan la misma conexión y se confirman con un
+        único COMMIT al salir; ante una excepción (o una sentencia fallida) se revierte
+        todo. Anidada, usa SAVEPOINT: un error interno solo deshace el bloque interno.
+        """
+        estado = cls._tx
+        if estado.conn is not None:
+            estado.nivel += 1
+            punto = f"sp_{estado.nivel}"
+            conn = estado.conn
+            fallida_antes, estado.fallida = estado.fallida, False
+            cls._sentencia_tx(conn, f"SAVEPOINT {punto}")
+            try:
+                yield conn
+                if estado.fallida:
+                    raise TransaccionFallida("Una sentencia del bloque falló")
+                cls._sentencia_tx(conn, f"RELEASE SAVEPOINT {punto}")
+                estado.fallida = fallida_antes
+            except BaseException:
+                cls._sentencia_tx(conn, f"ROLLBACK TO SAVEPOINT {punto}")
+                estado.fallida = fallida_antes
+                raise
+            finally:
+                estado.nivel -= 1
+            return
+        
+        pool = DatabaseConnection.get_pool()
+        conn = pool.obtener()
+        estado.conn, estado.nivel, estado.fallida = conn, 0, False
+        estado.escrituras = set()
         try:
-            self.cursor.execute(query, params or ())
-            
-            if query.strip().upper().startswith("SELECT"):
-                result = self.cursor.fetchone() if fetch_one else self.cursor.fetchall()
-                return result if result else ({} if fetch_one else [])
-            
-            elif query.strip().upper().startswith("INSERT"):
-                self.conn.commit()
-                return self.cursor.lastrowid
-            
-            else:  # UPDATE, DELETE
-                self.conn.commit()
-                return self.cursor.rowcount
+            conn.begin()
+            yield conn
+            if estado.fallida:
+                raise TransaccionFallida("Una sentencia de la transacción falló")
+            conn.commit()
+            DatabaseConnection.marcar_escritura()
+            # Otro hilo pudo volver a cachear la versión previa antes del COMMIT
+            for tabla in {tabla for tabla, _, _ in estado.escrituras}:
+                CacheResultados.invalidar(tabla)
+            for tabla, id_fila, insercion in estado.escrituras:
+                CacheEntidades.invalidar(tabla, id_fila, insercion)
+                BusInvalidacion.publicar(tabla, id_fila, insercion)
+        except BaseException:
+            try:
+                conn.rollback()
+                print("↩️  Transacción revertida")
+            except Exception:
+                pass
+            raise
+        finally:
+            estado.conn = None
+            estado.escrituras = None
+            pool.liberar(conn)
+    
+    @classmethod
+    @contextmanager
+    def desde_primario(cls):
+        """with BaseModel.desde_primario(): ... → las lecturas del bloque no usan réplicas"""
+        _ESTADO_TX.forzar_primario += 1
+        try:
+            yield
+        finally:
+            _ESTADO_TX.forzar_primario -= 1
+    
+    @staticmethod
+    def _sentencia_tx(conn, sql: str) -> None:
+        with conn.cursor() as cursor:
+            cursor.execute(sql)
+    
+    def ejecutar(self, query, params=None, fetch_one: bool = False, primario: bool = False) -> Any:
+        """
+        Ejecuta un texto SQL o una Query ya compilada (el texto se analiza una sola vez).
+        Con autocommit no envía COMMIT extra; dentro de transaccion() el COMMIT es uno solo
+        al final y un error se propaga para que la unidad de trabajo se revierta.
+        Los SELECT van a una réplica si hay configuradas, salvo primario=True.
+        """
+        q = Query.compilar(query)
+        medir = Instrumentacion.activa
+        inicio = perf_counter() if medir else 0.0
+        tx = _ESTADO_TX.conn
+        if tx is not None:
+            contexto = nullcontext(tx)
+        elif q.es_lectura and DatabaseConnection._replicas and not primario and not _ESTADO_TX.forzar_primario:
+            contexto = DatabaseConnection.get_enrutador().conexion()
+        else:
+            contexto = self.pool.conexion()
+        try:
+            with contexto as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(q.texto, params or ())
+                    
+                    if q.es_lectura:
+                        result = cursor.fetchone() if fetch_one else cursor.fetchall()
+                        filas = (1 if result else 0) if fetch_one else len(result)
+                        resultado = result if result else ({} if fetch_one else [])
+                    else:
+                        # COMMIT solo si hace falta: ni con autocommit ni dentro de una transacción
+                        if tx is None:
+                            if not conn.get_autocommit():
+                                conn.commit()
+                            DatabaseConnection.marcar_escritura()
+                        _tras_escribir(q, params)
+                        filas = cursor.rowcount
+                        # INSERT → id generado; UPDATE, DELETE → filas afectadas
+                        resultado = cursor.lastrowid if q.es_insercion else filas
                 
         except Exception as e:
-            self.conn.rollback()
+            if medir:
+                Instrumentacion.registrar(q, perf_counter() - inicio, 0, params, error=True)
             print(f"❌ Error en consulta: {e}")
-            print(f"   Query: {query[:100]}...")
+            print(f"   Query: {q.texto[:100]}...")
+            if tx is not None:
+                _ESTADO_TX.fallida = True
+                raise
             return None if fetch_one else []
+        
+        if medir:
+            Instrumentacion.registrar(q, perf_counter() - inicio, filas, params)
+        return resultado
     
-    def __del__(self):
-        """Cierra cursor al eliminar instancia"""
-        if hasattr(self, 'cursor'):
-            self.cursor.close()
+    def _confirmar(self, conn) -> None:
+        """COMMIT solo si hace falta: ni con autocommit ni dentro de una transacción"""
+        if _ESTADO_TX.conn is None:
+            if not conn.get_autocommit():
+                conn.commit()
+            DatabaseConnection.marcar_escritura()
+    
+    def iterar(self, query, params=None, tamano_lote: int = None, primario: bool = False) -> Iterator[Dict]:
+        """
+        Recorre un SELECT fila a fila con cursor del lado del servidor (SSDictCursor en MySQL):
+        la memoria no crece con el tamaño del resultado. La conexión queda tomada
+        mientras se itera y se libera al terminar, al cortar la iteración o ante errores.
+        """
+        q = Query.compilar(query)
+        if self.en_transaccion() or DatabaseConnection.conexion_unica():
+            # La conexión de la transacción (o la única de una base en memoria) no puede
+            # quedar bloqueada por un cursor sin drenar
+            yield from self.ejecutar(q, params, primario=primario) or []
+            return
+        for lote in self._lotes(q, params, tamano_lote or self.TAMANO_LOTE, primario):
+            yield from lote
+    
+    def iterar_compacto(self, query, params=None, formato: str = 'registro', tamano_lote: int = None,
+                        primario: bool = False) -> FilasCompactas:
+        """
+        Como iterar(), pero cada fila es una tupla ('tupla') o un registro de solo
+        lectura que también se indexa por nombre ('registro'), ver model/filas.py.
+        Pensado para recorridos de muchas filas: sin un dict por fila.
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato de fila no soportado: {formato} (use {', '.join(FORMATOS)})")
+        filas = FilasCompactas()
+        filas._filas = self._iterar_compacto(Query.compilar(query), params, formato,
+                                             tamano_lote or self.TAMANO_LOTE, primario, filas)
+        return filas
+    
+    def _iterar_compacto(self, q: Query, params, formato: str, tamano: int, primario: bool,
+                         destino: FilasCompactas) -> Iterator:
+        dialecto = DatabaseConnection.get_dialecto()
+        tx = _ESTADO_TX.conn
+        if tx is not None or DatabaseConnection.conexion_unica():
+            # Igual que en iterar(): el resultado se lee entero y la conexión queda libre
+            with (nullcontext(tx) if tx is not None else self.pool.conexion()) as conn:
+                with conn.cursor(dialecto.cursor_tuplas(streaming=False)) as cursor:
+                    try:
+                        cursor.execute(q.texto, params or ())
+                    except Exception as e:
+                        print(f"❌ Error en consulta: {e}")
+                        if tx is None:
+                            return
+                        _ESTADO_TX.fallida = True
+                        raise
+                    lotes = [cursor.fetchall()]
+                    destino.columnas = Columnas.de_cursor(cursor)
+        else:
+            lotes = self._lotes(q, params, tamano, primario, dialecto.cursor_tuplas(), destino)
+        convertir = None
+        for lote in lotes:
+            if convertir is None and formato != 'tupla':
+                convertir = destino.columnas.convertidor(formato)
+            yield from (convertir(lote) if convertir else lote)
+    
+    def _lotes(self, q: Query, params, tamano: int, primario: bool, clase_cursor=FALTA,
+               destino: FilasCompactas = None) -> Iterator[list]:
+        """Lotes de fetchmany con cursor de streaming; destino recibe las columnas al ejecutar"""
+        pool = self.pool
+        if DatabaseConnection._replicas and not primario and not _ESTADO_TX.forzar_primario:
+            pool = DatabaseConnection.get_enrutador().pool_lectura()
+        try:
+            conn = pool.obtener()
+        except Exception as e:
+            print(f"❌ Error en consulta: {e}")
+            return
+        if clase_cursor is FALTA:
+            clase_cursor = DatabaseConnection.get_dialecto().cursor_streaming()
+        agotado = False
+        medir = Instrumentacion.activa
+        segundos, filas_leidas, error = 0.0, 0, False
+        try:
+            cursor = conn.cursor(clase_cursor)
+            inicio = perf_counter() if medir else 0.0
+            try:
+                cursor.execute(q.texto, params or ())
+            except Exception as e:
+                error = True
+                print(f"❌ Error en consulta: {e}")
+                print(f"   Query: {q.texto[:100]}...")
+                return
+            finally:
+                if medir:
+                    segundos += perf_counter() - inicio
+            if destino is not None:
+                destino.columnas = Columnas.de_cursor(cursor)
+            
+            while True:
+                # Solo se mide el tiempo dentro del driver, no el del consumidor
+                inicio = perf_counter() if medir else 0.0
+                filas = cursor.fetchmany(tamano)
+                if medir:
+                    segundos += perf_counter() - inicio
+                    filas_leidas += len(filas)
+                if not filas:
+                    agotado = True
+                    cursor.close()
+                    break
+                yield filas
+        finally:
+            if medir:
+                Instrumentacion.registrar(q, segundos, filas_leidas, params, error=error)
+            # Cortada a mitad de camino, la conexión aún tiene filas pendientes en el
+            # socket: drenarlas costaría leer todo el resultado, así que se descarta.
+            pool.liberar(conn, descartar=not agotado)
+    
+    # ====================== PAGINACIÓN POR CLAVE (KEYSET) ======================
+    @staticmethod
+    def _codificar_cursor(valores: Sequence) -> str:
+        texto = json.dumps([v if isinstance(v, (int, float)) or v is None else str(v) for v in valores])
+        return base64.urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def _decodificar_cursor(cursor: str) -> list:
+        try:
+            relleno = "=" * (-len(cursor) % 4)
+            return json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Cursor de paginación inválido: {cursor!r}") from e
+    
+    def _pagina(self, select: str, condiciones: Sequence[str], params: Sequence,
+                claves: Sequence[Tuple[str, str]], descendente: bool,
+                after: Optional[str], limit: int) -> Dict[str, Any]:
+        """
+        Página por clave: WHERE (k1, k2) > último visto, sin OFFSET, así la página N
+        cuesta lo mismo que la primera. claves = ((expresión SQL, columna en la fila), ...)
+        con un id único al final. Devuelve {'filas': [...], 'siguiente': cursor o None}.
+        """
+        limit = max(1, int(limit))
+        condiciones = list(condiciones)
+        params = list(params)
+        
+        if after:
+            ultimos = self._decodificar_cursor(after)
+            if len(ultimos) != len(claves):
+                raise ValueError("El cursor no corresponde a esta consulta")
+            # (k1 < v1) OR (k1 = v1 AND k2 < v2) OR ... — forma expandida, usa índices
+            op = "<" if descendente else ">"
+            alternativas = []
+            for i, (expresion, _) in enumerate(claves):
+                partes = [f"{e} = %s" for e, _ in claves[:i]] + [f"{expresion} {op} %s"]
+                alternativas.append("(" + " AND ".join(partes) + ")")
+                params.extend(ultimos[:i + 1])
+            condiciones.append("(" + " OR ".join(alternativas) + ")")
+        
+        sentido = " DESC" if descendente else ""
+        query = select
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        query += " ORDER BY " + ", ".join(e + sentido for e, _ in claves) + " LIMIT %s"
+        params.append(limit + 1)  # una fila extra indica si hay página siguiente
+        
+        filas = self.ejecutar(query, tuple(params)) or []
+        siguiente = None
+        if len(filas) > limit:
+            filas = filas[:limit]
+            siguiente = self._codificar_cursor([filas[-1][columna] for _, columna in claves])
+        return {'filas': filas, 'siguiente': siguiente}
+    
+    def ejecutar_lote(self, query, filas: Sequence, chunk_size: int = 500) -> List[Dict]:
+        """
+        Escritura masiva por bloques: un INSERT ... VALUES (...), (...), ... por bloque
+        (executemany para otras sentencias). Devuelve un resultado por fila:
+        {'ok': bool, 'id': int|None, 'error': str|None}. Si un bloque falla se
+        reintenta fila a fila para aislar las filas culpables.
+        En un INSERT multi-fila solo la primera fila del bloque trae id: con
+        innodb_autoinc_lock_mode=2 (por defecto en MySQL 8) los AUTO_INCREMENT de
+        inserciones concurrentes pueden intercalarse y primer_id + i apuntaría a filas
+        ajenas. Quien necesite todos los ids debe releerlos por una clave natural.
+        """
+        q = Query.compilar(query)
+        medir = Instrumentacion.activa
+        resultados = []
+        for inicio in range(0, len(filas), chunk_size):
+            bloque = filas[inicio:inicio + chunk_size]
+            sentencia = q.multifila(len(bloque)) if q.admite_multifila else q
+            t0 = perf_counter() if medir else 0.0
+            try:
+                with self._conexion() as conn:
+                    with conn.cursor() as cursor:
+                        if q.admite_multifila:
+                            cursor.execute(sentencia.texto, q.aplanar(bloque))
+                        else:
+                            cursor.executemany(q.texto, bloque)
+                        self._confirmar(conn)
+                        _tras_escribir(q)
+                        ids_conocidos = q.admite_multifila and not q.es_upsert
+                        primer_id = cursor.lastrowid if ids_conocidos else None
+            except Exception:
+                if medir:
+                    Instrumentacion.registrar(sentencia, perf_counter() - t0, 0, bloque[0], error=True)
+                if self.en_transaccion():
+                    # Dentro de una unidad de trabajo el lote es todo o nada
+                    _ESTADO_TX.fallida = True
+                    raise
+                resultados.extend(self._lote_fila_a_fila(q, bloque))
+                continue
+            
+            if medir:
+                Instrumentacion.registrar(sentencia, perf_counter() - t0, len(bloque), bloque[0])
+            # LAST_INSERT_ID() es el id de la primera fila; el resto no se deduce (ver docstring)
+            for i in range(len(bloque)):
+                resultados.append({'ok': True, 'id': primer_id if i == 0 and primer_id else None, 'error': None})
+        return resultados
+    
+    def _lote_fila_a_fila(self, q: Query, bloque: Sequence) -> List[Dict]:
+        resultados = []
+        with self.pool.conexion() as conn:
+            with conn.cursor() as cursor:
+                for params in bloque:
+                    try:
+                        cursor.execute(q.texto, params)
+                        self._confirmar(conn)
+                        _tras_escribir(q, params)
+                        nuevo_id = cursor.lastrowid if q.es_insercion and not q.es_upsert else None
+                        resultados.append({'ok': True, 'id': nuevo_id or None, 'error': None})
+                    except Exception as e:
+                        resultados.append({'ok': False, 'id': None, 'error': str(e)})
+        return resultados
+    
+    def _escribir_lote(self, query, filas: Sequence, validar: Callable, etiqueta: str,
+                       chunk_size: int = 500, escribir: Callable = None) -> List[Dict]:
+        """
+        Valida todas las filas en una pasada, inserta las válidas por bloques y
+        devuelve un resultado por fila de entrada (en el mismo orden).
+        validar(fila) → (params, None) o (None, 'mensaje de error').
+        escribir(query, filas, chunk_size) reemplaza a ejecutar_lote; si devuelve
+        None (unidad de trabajo revertida) ninguna fila válida quedó guardada.
+        """
+        resultados: List[Optional[Dict]] = [None] * len(filas)
+        validas, posiciones = [], []
+        for i, fila in enumerate(filas):
+            params, error = validar(fila)
+            if error:
+                resultados[i] = {'ok': False, 'id': None, 'error': error}
+            else:
+                validas.append(params)
+                posiciones.append(i)
+        
+        if validas:
+            escritos = (escribir or self.ejecutar_lote)(query, validas, chunk_size)
+            if escritos is None:
+                escritos = [{'ok': False, 'id': None, 'error': "Lote revertido"} for _ in validas]
+            for i, resultado in zip(posiciones, escritos):
+                resultados[i] = resultado
+        
+        ok = sum(1 for r in resultados if r['ok'])
+        simbolo = "✅" if ok == len(filas) else "⚠️ "
+        print(f"{simbolo} {etiqueta}: {ok}/{len(filas)} filas guardadas, {len(filas) - ok} con error")
+        return resultados
+    
+    # ====================== EXISTENCIA Y PROYECCIÓN ======================
+    # Ids por consulta IN en existen(): lejos del límite de parámetros de cualquier motor
+    TAMANO_IN = 500
+    
+    def existe(self, tabla: str, id_value: int) -> bool:
+        """¿Existe la fila? Solo toca la clave primaria (sin JOIN ni agregados)"""
+        if id_value is None:
+            return False
+        if tabla in CacheEntidades.LEE and CacheEntidades.activa and _ESTADO_TX.conn is None:
+            cacheadas, _ = CacheEntidades.obtener_varios(tabla, (id_value,))
+            if cacheadas:
+                return cacheadas[id_value] is not None
+        query = query_generica("SELECT 1 FROM {tabla} WHERE id = %s LIMIT 1", tabla)
+        return bool(self.ejecutar(query, (id_value,), fetch_one=True))
+    
+    def existen(self, tabla: str, ids: Iterable[int]) -> set:
+        """Cuáles de los ids existen en la tabla (una consulta IN por cada TAMANO_IN ids)"""
+        ids = list({i for i in ids if i is not None})
+        encontrados = set()
+        for inicio in range(0, len(ids), self.TAMANO_IN):
+            bloque = ids[inicio:inicio + self.TAMANO_IN]
+            marcadores = ', '.join(['%s'] * len(bloque))
+            query = query_generica("SELECT id FROM {tabla} WHERE id IN (" + marcadores + ")", tabla)
+            encontrados.update(fila['id'] for fila in self.ejecutar(query, tuple(bloque)) or [])
+        return encontrados
+    
+    def _proyectar_por_id(self, tabla: str, id_value: int, columnas: Iterable[str]) -> Optional[Dict]:
+        """Solo las columnas pedidas de una fila (tabla sola, sin JOIN)"""
+        query = query_proyeccion(tabla, tuple(columnas), por_id=True)
+        return self.ejecutar(query, (id_value,), fetch_one=True)
+    
+    def _proyectar(self, tabla: str, columnas: Iterable[str], orden: str = '') -> List[Dict]:
+        """Solo las columnas pedidas de todas las filas (tabla sola, sin JOIN)"""
+        return self.ejecutar(query_proyeccion(tabla, tuple(columnas), orden=orden)) or []
+    
+    # ====================== ENTIDADES POR ID (CacheEntidades) ======================
+    # Modelos con caché de entidades: su tabla y el SELECT de la fila completa con "IN ({ids})"
+    TABLA: Optional[str] = None
+    _SQL_POR_IDS: Optional[str] = None
+    
+    def _completar(self, cursor, filas: List[Dict]) -> None:
+        """Agrega a las filas recién leídas lo que no sale del SELECT (con el mismo cursor)"""
+    
+    def buscar_por_id(self, id_value: int, columnas: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """
+        Fila completa (con los JOIN del modelo) o None. Pasa por CacheEntidades: se
+        recuerdan también los ids que no existen. Con columnas=(...) responde desde la
+        fila cacheada si está; si no, proyecta solo esas columnas sin guardar nada.
+        """
+        return self.buscar_por_ids((id_value,), columnas).get(id_value)
+    
+    def buscar_por_ids(self, ids: Iterable[int], columnas: Optional[Sequence[str]] = None) -> Dict[int, Dict]:
+        """{id: fila} de los que existen; consulta (IN por bloques) solo los que no están cacheados"""
+        ids = list(dict.fromkeys(i for i in ids if i is not None))
+        usar_cache = CacheEntidades.activa and _ESTADO_TX.conn is None
+        if usar_cache:
+            cacheadas, faltan = CacheEntidades.obtener_varios(self.TABLA, ids)
+        else:
+            cacheadas, faltan = {}, ids
+        
+        resultado = {}
+        for id_fila, fila in cacheadas.items():
+            if fila is not None:
+                resultado[id_fila] = {c: fila[c] for c in columnas} if columnas else dict(fila)
+        if not faltan:
+            return resultado
+        
+        if columnas:
+            # Proyección parcial: barata, pero no sirve como fila completa para la caché
+            for id_fila in faltan:
+                fila = self._proyectar_por_id(self.TABLA, id_fila, columnas)
+                if fila:
+                    resultado[id_fila] = fila
+            return resultado
+        
+        escrituras = CacheEntidades.escrituras
+        leidas = dict.fromkeys(faltan)  # los que no vuelvan quedan en None: no existen
+        try:
+            # cursor() y no ejecutar(): un error no debe confundirse con "no existe" y quedar cacheado
+            with self.cursor() as cursor:
+                for inicio in range(0, len(faltan), self.TAMANO_IN):
+                    bloque = faltan[inicio:inicio + self.TAMANO_IN]
+                    cursor.execute(self._SQL_POR_IDS.format(ids=', '.join(['%s'] * len(bloque))),
+                                   tuple(bloque))
+                    for fila in cursor.fetchall():
+                        leidas[fila['id']] = fila
+                self._completar(cursor, [fila for fila in leidas.values() if fila is not None])
+        except Exception as e:
+            print(f"❌ Error al buscar {self.TABLA} por id: {e}")
+            if _ESTADO_TX.conn is not None:
+                _ESTADO_TX.fallida = True
+                raise
+            return resultado
+        if usar_cache:
+            CacheEntidades.guardar(self.TABLA, leidas, escrituras)
+        for id_fila, fila in leidas.items():
+            if fila is not None:
+                resultado[id_fila] = dict(fila) if usar_cache else fila
+        return resultado
+    
+    @staticmethod
+    def _es_fecha_iso(fecha) -> bool:
+        """YYYY-MM-DD válida (más barata que datetime.strptime en lotes grandes)"""
+        try:
+            return len(fecha) == 10 and bool(date.fromisoformat(fecha))
+        except (TypeError, ValueError):
+            return False
+    
+    def _actualizar_campos(self, tabla: str, id_value: int, campos: Dict[str, Any],
+                           permitidos: Iterable[str]) -> bool:
+        """UPDATE genérico: solo columnas permitidas, SQL cacheado por conjunto de columnas"""
+        columnas = tuple([c for c in campos if c in permitidos])
+        if not columnas:
+            return False
+        valores = tuple(campos[c] for c in columnas) + (id_value,)
+        return bool(self.ejecutar(query_actualizar(tabla, columnas), valores))
     
     # Métodos genéricos optimizados
+    @staticmethod
+    def _query_todos(tabla: str, orden: str) -> Query:
+        columna, _, sentido = orden.partition(" ")
+        sentido = sentido.strip().upper()
+        if sentido not in ("", "ASC", "DESC"):
+            raise ValueError(f"Orden no permitido: {orden}")
+        return query_generica("SELECT * FROM {tabla} ORDER BY {columna} " + sentido, tabla, columna)
+    
     def obtener_todos(self, tabla: str, orden: str = "id") -> List[Dict]:
-        query = f"SELECT * FROM {tabla} ORDER BY {orden}"
-        return self.ejecutar(query) or []
+        return self.ejecutar(self._query_todos(tabla, orden)) or []
+    
+    def iter_todos(self, tabla: str, orden: str = "id", tamano_lote: int = None) -> Iterator[Dict]:
+        """Versión en streaming de obtener_todos"""
+        return self.iterar(self._query_todos(tabla, orden), tamano_lote=tamano_lote)
     
     def obtener_por_id(self, tabla: str, id_value: int) -> Optional[Dict]:
-        query = f"SELECT * FROM {tabla} WHERE id = %s"
+        query = query_generica("SELECT * FROM {tabla} WHERE id = %s", tabla)
         return self.ejecutar(query, (id_value,), fetch_one=True)
     
     def eliminar_por_id(self, tabla: str, id_value: int) -> bool:
-        query = f"DELETE FROM {tabla} WHERE id = %s"
+        query = query_generica("DELETE FROM {tabla} WHERE id = %s", tabla)
         return bool(self.ejecutar(query, (id_value,)))
     
     def buscar_por_campo(self, tabla: str, campo: str, valor: str) -> List[Dict]:
-        query = f"SELECT * FROM {tabla} WHERE {campo} LIKE %s"
-        return self.ejecutar(query, (f"%{valor}%",)) or []
\ No newline at end of file
+        query = query_generica("SELECT * FROM {tabla} WHERE {columna} LIKE %s", tabla, campo)
+        return self.ejecutar(query, (f"%{valor}%",)) or []
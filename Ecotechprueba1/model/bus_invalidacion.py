@@ -0,0 +1,278 @@
+# model/bus_invalidacion.py - Invalidación de cachés entre procesos vía tabla cambio_cache
+"""
+Varias instancias (consola, app) contra la misma base: cada una tiene sus cachés
+en memoria (CacheResultados, CacheEntidades) y las escrituras de las otras no las
+tocan. El bus lo resuelve con la propia base, sin servicios extra:
+
+  - Cada escritura local se anota en memoria como (tabla, id de fila, inserción).
+  - Un hilo por proceso, cada INTERVALO segundos: escribe lo anotado en
+    cambio_cache (un INSERT multi-fila) y lee lo que publicaron los demás desde
+    su marca (id > último leído), aplicándolo a las cachés suscritas.
+  - Desfase acotado: un cambio llega a los demás en ~2 × INTERVALO. Si el hilo
+    no logra leer durante MAX_DESFASE segundos, las cachés se vacían enteras.
+
+    python -m model.bus_invalidacion   → estado del bus de este proceso
+"""
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config.database import DatabaseConnection
+
+SQL_TABLA = """
+    CREATE TABLE IF NOT EXISTS cambio_cache (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        tabla VARCHAR(64) NOT NULL,
+        fila_id INT NULL,
+        insercion BOOLEAN NOT NULL DEFAULT FALSE,
+        origen CHAR(32) NOT NULL,
+        publicado DOUBLE NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+SQL_INDICE = "CREATE INDEX idx_cambio_publicado ON cambio_cache (publicado)"
+
+_SQL_PUBLICAR = "INSERT INTO cambio_cache (tabla, fila_id, insercion, origen, publicado) VALUES "
+_SQL_MARCA = "SELECT COALESCE(MAX(id), 0) AS marca FROM cambio_cache"
+_SQL_LEER = """
+    SELECT id, tabla, fila_id, insercion, origen, publicado
+    FROM cambio_cache
+    WHERE id > %s{huecos}
+    ORDER BY id
+    LIMIT {limite}
+"""
+_SQL_PURGAR = "DELETE FROM cambio_cache WHERE publicado < %s"
+
+Cambio = Tuple[str, Optional[int], bool]  # (tabla, id de fila o None = varias, inserción)
+
+
+class BusInvalidacion:
+    """Publicación y lectura de invalidaciones; todo a nivel de clase (uno por proceso)"""
+
+    habilitado = os.environ.get('ECOTECH_BUS', '1') != '0'
+    INTERVALO = float(os.environ.get('ECOTECH_BUS_INTERVALO', '0.5'))
+    MAX_DESFASE = 10.0      # sin leer el bus por más tiempo → cachés vaciadas
+    RETENCION = 600.0       # segundos que se guardan los cambios en la tabla
+    GRACIA_HUECOS = 5.0     # espera por ids saltados (INSERT concurrentes que confirman tarde)
+    MAX_PENDIENTES = 1000   # más cambios distintos entre vueltas → uno por tabla
+    LIMITE_LECTURA = 1000
+
+    ORIGEN = os.urandom(16).hex()
+    activo = False
+
+    _pendientes: Dict[Cambio, float] = {}   # cambio → cuándo ocurrió (el primero)
+    _suscriptores: List[Tuple[Callable, Callable]] = []
+    _lock = threading.Lock()
+    _hilo: Optional[threading.Thread] = None
+    _parar = threading.Event()
+    _marca = 0
+    _huecos: Dict[int, float] = {}           # id saltado → cuándo se vio el hueco
+    _ultimo_ok = 0.0
+    _ultima_purga = 0.0
+    _retrasos = deque(maxlen=500)
+    _stats = {'publicados': 0, 'recibidos': 0, 'propios': 0, 'vueltas': 0, 'errores': 0,
+              'vaciados': 0, 'huecos_vencidos': 0}
+
+    # ====================== SUSCRIPCIÓN Y PUBLICACIÓN ======================
+    @classmethod
+    def suscribir(cls, invalidar: Callable[[str, Optional[int], bool], None],
+                  limpiar: Callable[[], None]) -> None:
+        """invalidar(tabla, id_fila, insercion) por cada cambio ajeno; limpiar() si se perdió el hilo"""
+        cls._suscriptores.append((invalidar, limpiar))
+
+    @classmethod
+    def publicar(cls, tabla: str, id_fila: Optional[int] = None, insercion: bool = False) -> None:
+        """Anota una escritura local (ya confirmada); sale en la próxima vuelta del hilo"""
+        if not cls.activo:
+            return
+        cambio = (tabla, id_fila, insercion)
+        with cls._lock:
+            if cambio not in cls._pendientes:
+                cls._pendientes[cambio] = time.time()
+                if len(cls._pendientes) > cls.MAX_PENDIENTES:
+                    cls._compactar()
+
+    @classmethod
+    def _compactar(cls) -> None:
+        """Con el lock tomado: muchos ids de una tabla → un cambio de tabla entera"""
+        por_tabla: Dict[Cambio, float] = {}
+        for (tabla, _, _), cuando in cls._pendientes.items():
+            clave = (tabla, None, False)
+            por_tabla[clave] = min(cuando, por_tabla.get(clave, cuando))
+        cls._pendientes = por_tabla
+
+    # ====================== HILO ======================
+    @classmethod
+    def iniciar(cls) -> bool:
+        """Arranca el hilo del bus (idempotente); False si está deshabilitado o sin base"""
+        if not cls.habilitado:
+            return False
+        if cls._hilo is not None and cls._hilo.is_alive():
+            return True
+        try:
+            with cls._cursor() as cursor:
+                cursor.execute(_SQL_MARCA)
+                cls._marca = cursor.fetchone()['marca']
+        except Exception as e:
+            print(f"⚠️  Bus de invalidación no disponible: {e}")
+            return False
+        cls._huecos = {}
+        cls._ultimo_ok = time.monotonic()
+        cls._parar.clear()
+        cls.activo = True
+        cls._hilo = threading.Thread(target=cls._ciclo, name='ecotech-bus', daemon=True)
+        cls._hilo.start()
+        return True
+
+    @classmethod
+    def detener(cls) -> None:
+        """Publica lo pendiente y para el hilo (al cerrar el programa)"""
+        if cls._hilo is None:
+            return
+        cls._parar.set()
+        cls._hilo.join(timeout=cls.INTERVALO + 5)
+        cls._hilo = None
+        cls.activo = False
+        try:
+            cls.vuelta()
+        except Exception:
+            pass
+
+    @classmethod
+    def _ciclo(cls) -> None:
+        while not cls._parar.wait(cls.INTERVALO):
+            try:
+                cls.vuelta()
+            except Exception:
+                cls._stats['errores'] += 1
+                if time.monotonic() - cls._ultimo_ok > cls.MAX_DESFASE:
+                    cls._vaciar()
+
+    @classmethod
+    def vuelta(cls) -> int:
+        """Una pasada: publicar lo pendiente y aplicar lo ajeno. Devuelve cambios aplicados"""
+        if time.monotonic() - cls._ultimo_ok > cls.MAX_DESFASE:
+            cls._vaciar()  # el hilo estuvo detenido: lo perdido ya no se puede reconstruir
+        with cls._lock:
+            pendientes, cls._pendientes = cls._pendientes, {}
+        if pendientes:
+            try:
+                with cls._cursor() as cursor:  # confirmado al salir, antes de leer
+                    cls._enviar(cursor, pendientes)
+            except Exception:
+                with cls._lock:  # se reintentan en la próxima vuelta
+                    for cambio, cuando in pendientes.items():
+                        cls._pendientes.setdefault(cambio, cuando)
+                raise
+        aplicados = 0
+        with cls._cursor() as cursor:
+            while True:
+                leidos, n = cls._recibir(cursor)
+                aplicados += n
+                if leidos < cls.LIMITE_LECTURA:
+                    break
+            cls._purgar(cursor)
+        cls._ultimo_ok = time.monotonic()
+        cls._stats['vueltas'] += 1
+        return aplicados
+
+    # ====================== AUXILIARES ======================
+    @staticmethod
+    @contextmanager
+    def _cursor():
+        """
+        Conexión propia del primario (una réplica atrasada demoraría los cambios), fuera
+        de BaseModel: escribir cambio_cache no debe invalidar ni volver a publicarse
+        """
+        with DatabaseConnection.get_pool().conexion() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
+            if not conn.get_autocommit():
+                conn.commit()
+
+    @classmethod
+    def _enviar(cls, cursor, pendientes: Dict[Cambio, float]) -> None:
+        filas = [(tabla, id_fila, insercion, cls.ORIGEN, cuando)
+                 for (tabla, id_fila, insercion), cuando in pendientes.items()]
+        for inicio in range(0, len(filas), 500):
+            bloque = filas[inicio:inicio + 500]
+            cursor.execute(_SQL_PUBLICAR + ', '.join(['(%s, %s, %s, %s, %s)'] * len(bloque)),
+                           tuple(v for fila in bloque for v in fila))
+        cls._stats['publicados'] += len(filas)
+
+    @classmethod
+    def _recibir(cls, cursor) -> Tuple[int, int]:
+        """Lee desde la marca (más los huecos aún en gracia); devuelve (filas leídas, aplicadas)"""
+        ahora = time.monotonic()
+        for id_hueco in [i for i, visto in cls._huecos.items() if ahora - visto > cls.GRACIA_HUECOS]:
+            del cls._huecos[id_hueco]  # rollback o id descartado: no va a aparecer
+            cls._stats['huecos_vencidos'] += 1
+        huecos = tuple(cls._huecos)
+        filtro = f" OR id IN ({', '.join(['%s'] * len(huecos))})" if huecos else ''
+        cursor.execute(_SQL_LEER.format(huecos=filtro, limite=cls.LIMITE_LECTURA),
+                       (cls._marca,) + huecos)
+        filas = cursor.fetchall()
+
+        aplicadas = 0
+        reloj = time.time()
+        for fila in filas:
+            id_cambio = fila['id']
+            if id_cambio > cls._marca:
+                for saltado in range(cls._marca + 1, id_cambio):
+                    cls._huecos[saltado] = ahora
+                cls._marca = id_cambio
+            else:
+                cls._huecos.pop(id_cambio, None)
+            if fila['origen'] == cls.ORIGEN:
+                cls._stats['propios'] += 1
+                continue
+            for invalidar, _ in cls._suscriptores:
+                invalidar(fila['tabla'], fila['fila_id'], bool(fila['insercion']))
+            cls._retrasos.append(max(0.0, reloj - fila['publicado']))
+            aplicadas += 1
+        cls._stats['recibidos'] += aplicadas
+        if len(cls._huecos) > cls.LIMITE_LECTURA:
+            cls._huecos = {}  # demasiados ids sueltos para seguirlos de a uno
+            cls._vaciar()
+        return len(filas), aplicadas
+
+    @classmethod
+    def _purgar(cls, cursor) -> None:
+        if time.monotonic() - cls._ultima_purga < 60:
+            return
+        cls._ultima_purga = time.monotonic()
+        cursor.execute(_SQL_PURGAR, (time.time() - cls.RETENCION,))
+
+    @classmethod
+    def _vaciar(cls) -> None:
+        for _, limpiar in cls._suscriptores:
+            limpiar()
+        cls._stats['vaciados'] += 1
+        cls._ultimo_ok = time.monotonic()
+
+    # ====================== MÉTRICAS ======================
+    @classmethod
+    def estadisticas(cls) -> Dict:
+        """Contadores y retraso de propagación (publicación ajena → aplicación aquí), en segundos"""
+        stats = dict(cls._stats)
+        retrasos = sorted(cls._retrasos)
+        stats['activo'] = cls.activo
+        stats['pendientes'] = len(cls._pendientes)
+        stats['marca'] = cls._marca
+        stats['huecos'] = len(cls._huecos)
+        stats['desde_ultima_lectura'] = round(time.monotonic() - cls._ultimo_ok, 3) if cls.activo else None
+        stats['retraso_ultimo'] = round(cls._retrasos[-1], 3) if retrasos else None
+        stats['retraso_p50'] = round(retrasos[len(retrasos) // 2], 3) if retrasos else None
+        stats['retraso_p95'] = round(retrasos[int(len(retrasos) * 0.95)], 3) if retrasos else None
+        stats['retraso_max'] = round(retrasos[-1], 3) if retrasos else None
+        return stats
+
+
+if __name__ == '__main__':
+    if BusInvalidacion.iniciar():
+        BusInvalidacion.vuelta()
+        for clave, valor in BusInvalidacion.estadisticas().items():
+            print(f"   {clave:<22} {valor}")
+        BusInvalidacion.detener()
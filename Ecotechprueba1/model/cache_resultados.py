@@ -0,0 +1,259 @@
+# model/cache_resultados.py - Caché en memoria de lecturas costosas, invalidada por tabla
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Tuple
+
+# Escribir en una tabla cambia también estas otras (FK en cascada y triggers)
+_EFECTOS_DIRECTOS = {
+    'usuario': ('empleado', 'consulta_indicador'),
+    'departamento': ('empleado',),
+    'empleado': ('registro_tiempo', 'asignacion_proyecto'),
+    'proyecto': ('registro_tiempo', 'asignacion_proyecto'),
+    'registro_tiempo': ('horas_diarias',),
+    'horas_diarias': (),
+}
+
+
+def _cierre(tabla: str, visto=None) -> Tuple[str, ...]:
+    visto = visto if visto is not None else []
+    if tabla not in visto:
+        visto.append(tabla)
+        for otra in _EFECTOS_DIRECTOS.get(tabla, ()):
+            _cierre(otra, visto)
+    return tuple(visto)
+
+
+AFECTADAS: Dict[str, Tuple[str, ...]] = {t: _cierre(t) for t in _EFECTOS_DIRECTOS}
+
+FALTA = object()
+
+
+class CacheResultados:
+    """
+    Resultados de métodos de lectura por (método, argumentos), con vencimiento (TTL)
+    y tope de entradas (LRU). Cada entrada lleva las tablas de las que depende:
+    una escritura en cualquiera de ellas la descarta. Una lectura durante la cual
+    hubo cualquier escritura no guarda su resultado (contador global de escrituras:
+    un solo entero que subir por escritura, más barato que uno por tabla).
+    """
+
+    activa = os.environ.get('ECOTECH_CACHE', '1') != '0'
+    TTL = 30.0
+    MAX_ENTRADAS = 256
+
+    _entradas: 'OrderedDict[Hashable, Tuple[float, Any, Tuple[str, ...]]]' = OrderedDict()
+    _por_tabla: Dict[str, set] = {}
+    escrituras = 0  # se lee sin lock al empezar una lectura; se compara con lock al guardar
+    _lock = threading.Lock()
+    _stats = {'aciertos': 0, 'fallos': 0, 'desalojos': 0, 'vencidas': 0, 'invalidadas': 0}
+
+    @classmethod
+    def obtener(cls, clave: Hashable) -> Any:
+        """Valor guardado o FALTA (el valor puede ser None o vacío legítimamente)"""
+        with cls._lock:
+            entrada = cls._entradas.get(clave)
+            if entrada is None:
+                cls._stats['fallos'] += 1
+                return FALTA
+            vence, valor, tablas = entrada
+            if vence <= time.monotonic():
+                cls._quitar(clave, tablas)
+                cls._stats['vencidas'] += 1
+                cls._stats['fallos'] += 1
+                return FALTA
+            cls._entradas.move_to_end(clave)
+            cls._stats['aciertos'] += 1
+            return valor
+
+    @classmethod
+    def guardar(cls, clave: Hashable, valor: Any, tablas: Tuple[str, ...],
+                escrituras: int, ttl: float = None) -> None:
+        """escrituras = CacheResultados.escrituras leído antes de ejecutar la consulta"""
+        with cls._lock:
+            if cls.escrituras != escrituras:
+                return  # alguien escribió mientras se leía: el resultado ya puede estar viejo
+            vieja = cls._entradas.pop(clave, None)
+            if vieja is not None:
+                cls._quitar_indices(clave, vieja[2])
+            cls._entradas[clave] = (time.monotonic() + (cls.TTL if ttl is None else ttl), valor, tablas)
+            for tabla in tablas:
+                cls._por_tabla.setdefault(tabla, set()).add(clave)
+            while len(cls._entradas) > cls.MAX_ENTRADAS:
+                antigua, (_, _, sus_tablas) = cls._entradas.popitem(last=False)
+                cls._quitar_indices(antigua, sus_tablas)
+                cls._stats['desalojos'] += 1
+
+    @classmethod
+    def invalidar(cls, tabla: str) -> None:
+        """Descarta lo que depende de la tabla (y de las que cambian con ella)"""
+        with cls._lock:
+            cls.escrituras += 1
+            if not cls._por_tabla:
+                return  # nada cacheado
+            for afectada in AFECTADAS.get(tabla) or (tabla,):
+                claves = cls._por_tabla.pop(afectada, None)
+                if not claves:
+                    continue
+                for clave in claves:
+                    entrada = cls._entradas.pop(clave, None)
+                    if entrada is not None:
+                        cls._quitar_indices(clave, entrada[2])
+                        cls._stats['invalidadas'] += 1
+
+    @classmethod
+    def limpiar(cls) -> None:
+        with cls._lock:
+            cls._entradas.clear()
+            cls._por_tabla.clear()
+            cls.escrituras += 1
+
+    @classmethod
+    def estadisticas(cls) -> Dict[str, Any]:
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entradas'] = len(cls._entradas)
+        consultas = stats['aciertos'] + stats['fallos']
+        stats['tasa_aciertos'] = round(stats['aciertos'] / consultas, 3) if consultas else 0.0
+        return stats
+
+    # ====================== AUXILIARES (con el lock tomado) ======================
+    @classmethod
+    def _quitar(cls, clave: Hashable, tablas: Tuple[str, ...]) -> None:
+        cls._entradas.pop(clave, None)
+        cls._quitar_indices(clave, tablas)
+
+    @classmethod
+    def _quitar_indices(cls, clave: Hashable, tablas: Tuple[str, ...]) -> None:
+        for tabla in tablas:
+            claves = cls._por_tabla.get(tabla)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del cls._por_tabla[tabla]
+
+
+# Entidades cacheadas → tablas que lee su fila completa (buscar_por_id une otras tablas)
+LEE_ENTIDAD = {
+    'empleado': ('empleado', 'departamento'),
+    'departamento': ('departamento', 'empleado'),
+    'proyecto': ('proyecto', 'asignacion_proyecto', 'empleado'),
+    'usuario': ('usuario',),
+}
+
+# Escribir en una tabla vacía por completo las entidades cuya fila la lee (otra tabla o cascada)
+VACIAR_ENTIDADES: Dict[str, Tuple[str, ...]] = {
+    tabla: tuple(entidad for entidad, lee in LEE_ENTIDAD.items()
+                 if entidad != tabla and set(lee) & set(AFECTADAS.get(tabla) or (tabla,)))
+    for tabla in set(_EFECTOS_DIRECTOS) | set(LEE_ENTIDAD) | {'asignacion_proyecto'}
+}
+
+
+class CacheEntidades:
+    """
+    Mapa de identidad por tabla: id → fila completa de buscar_por_id, o None si la
+    fila no existe (las búsquedas fallidas también se recuerdan). LRU por tabla con TTL.
+    Invalidación:
+      - UPDATE/DELETE ... WHERE id = %s en la tabla → solo esa fila
+      - INSERT en la tabla → solo los "no existe" (un id nuevo pudo estar recordado así)
+      - cualquier otra escritura en la tabla, o en una tabla que su fila lee → la tabla entera
+    """
+
+    activa = CacheResultados.activa
+    LEE = LEE_ENTIDAD
+    TTL = 60.0
+    MAX_POR_TABLA = 2048
+
+    _mapas: 'Dict[str, OrderedDict[Hashable, Tuple[float, Any]]]' = {}
+    escrituras = 0  # mismo papel que CacheResultados.escrituras
+    _lock = threading.Lock()
+    _stats = {'aciertos': 0, 'negativos': 0, 'fallos': 0, 'desalojos': 0, 'invalidadas': 0}
+
+    @classmethod
+    def obtener_varios(cls, tabla: str, ids) -> Tuple[Dict[Hashable, Any], list]:
+        """({id: fila o None} de lo que estaba cacheado, [ids que faltan])"""
+        encontrados, faltan = {}, []
+        ahora = time.monotonic()
+        with cls._lock:
+            mapa = cls._mapas.get(tabla)
+            for id_fila in ids:
+                entrada = mapa.get(id_fila) if mapa else None
+                if entrada is None or entrada[0] <= ahora:
+                    if entrada is not None:
+                        del mapa[id_fila]
+                    faltan.append(id_fila)
+                    continue
+                mapa.move_to_end(id_fila)
+                encontrados[id_fila] = entrada[1]
+            cls._stats['fallos'] += len(faltan)
+            negativos = sum(1 for fila in encontrados.values() if fila is None)
+            cls._stats['negativos'] += negativos
+            cls._stats['aciertos'] += len(encontrados) - negativos
+        return encontrados, faltan
+
+    @classmethod
+    def guardar(cls, tabla: str, filas: Dict[Hashable, Any], escrituras: int) -> None:
+        """filas = {id: fila o None}; escrituras = CacheEntidades.escrituras antes de leer"""
+        vence = time.monotonic() + cls.TTL
+        with cls._lock:
+            if cls.escrituras != escrituras:
+                return
+            mapa = cls._mapas.get(tabla)
+            if mapa is None:
+                mapa = cls._mapas[tabla] = OrderedDict()
+            for id_fila, fila in filas.items():
+                mapa[id_fila] = (vence, fila)
+                mapa.move_to_end(id_fila)
+            while len(mapa) > cls.MAX_POR_TABLA:
+                mapa.popitem(last=False)
+                cls._stats['desalojos'] += 1
+
+    @classmethod
+    def invalidar(cls, tabla: str, id_fila: Hashable = None, insercion: bool = False) -> None:
+        with cls._lock:
+            cls.escrituras += 1
+            if not cls._mapas:
+                return
+            mapa = cls._mapas.get(tabla)
+            if mapa:
+                if insercion:
+                    negativos = [i for i, (_, fila) in mapa.items() if fila is None]
+                    for i in negativos:
+                        del mapa[i]
+                    cls._stats['invalidadas'] += len(negativos)
+                elif id_fila is not None:
+                    if mapa.pop(id_fila, None) is not None:
+                        cls._stats['invalidadas'] += 1
+                else:
+                    cls._stats['invalidadas'] += len(mapa)
+                    mapa.clear()
+            for entidad in VACIAR_ENTIDADES.get(tabla, ()):
+                otro = cls._mapas.get(entidad)
+                if otro:
+                    cls._stats['invalidadas'] += len(otro)
+                    otro.clear()
+
+    @classmethod
+    def limpiar(cls) -> None:
+        with cls._lock:
+            cls._mapas.clear()
+            cls.escrituras += 1
+
+    @classmethod
+    def estadisticas(cls) -> Dict[str, Any]:
+        with cls._lock:
+            stats = dict(cls._stats)
+            stats['entradas'] = sum(len(m) for m in cls._mapas.values())
+        consultas = stats['aciertos'] + stats['negativos'] + stats['fallos']
+        stats['tasa_aciertos'] = round((consultas - stats['fallos']) / consultas, 3) if consultas else 0.0
+        return stats
+
+
+def copia_superficial(valor: Any) -> Any:
+    """Lo guardado no se entrega tal cual: el que llama puede modificar listas y dicts"""
+    if type(valor) is list:
+        return [dict(f) if type(f) is dict else f for f in valor]
+    if type(valor) is dict:
+        return dict(valor)
+    return valor
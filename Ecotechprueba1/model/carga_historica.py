@@ -0,0 +1,202 @@
+# model/carga_historica.py - Carga masiva del historial de indicadores desde las series anuales
+"""
+Rellena indicador_economico con años completos de cada indicador usando
+/api/{codigo}/{año} (una consulta por indicador y año, en vez de una por día):
+
+  - consultas en paralelo (ThreadPoolExecutor) con límite de tasa (CuboTokens)
+    y el cliente con reintentos y cortacircuitos (ClienteMindicador)
+  - escritura por bloques: un INSERT multi-fila ... ON DUPLICATE KEY UPDATE por serie
+  - reanudable: carga_indicador guarda por indicador el tramo [desde, hasta] ya
+    cargado sin huecos; una nueva corrida salta los años cubiertos. El año en curso
+    nunca queda cubierto entero, así que siempre se vuelve a pedir (valores nuevos).
+
+    python -m model.carga_historica [año_desde [año_hasta]] [--forzar]
+    python -m model.carga_historica estado
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from model.base_model import BaseModel
+from model.cliente_mindicador import ClienteMindicador, CuboTokens
+from model.indicador_economico import IndicadorEconomico
+
+SQL_TABLA = """
+    CREATE TABLE IF NOT EXISTS carga_indicador (
+        codigo VARCHAR(20) PRIMARY KEY,
+        desde DATE NOT NULL,
+        hasta DATE NOT NULL,
+        valores INT NOT NULL DEFAULT 0,
+        actualizado TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+_SQL_MARCAS = "SELECT codigo, desde, hasta, valores, actualizado FROM carga_indicador ORDER BY codigo"
+# valores de la marca: filas de indicador_economico dentro del tramo
+_SQL_CONTAR = "SELECT COUNT(*) AS n FROM indicador_economico WHERE codigo = %s AND fecha BETWEEN %s AND %s"
+_SQL_GUARDAR_MARCA = """
+    INSERT INTO carga_indicador (codigo, desde, hasta, valores)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        desde = VALUES(desde),
+        hasta = VALUES(hasta),
+        valores = VALUES(valores),
+        actualizado = CURRENT_TIMESTAMP
+"""
+
+Tramo = Tuple[date, date]  # [desde, hasta] cargado sin huecos
+
+
+def _fecha(valor) -> date:
+    """DATE de MySQL (date) o de SQLite (texto) → date"""
+    return valor if isinstance(valor, date) else date.fromisoformat(str(valor)[:10])
+
+
+class CargaHistorica(BaseModel):
+    """Carga de series anuales con marca de avance por indicador"""
+
+    TRABAJADORES = 4
+    TASA = 5.0          # consultas por segundo a mindicador.cl (sostenidas)
+
+    def marcas(self) -> Dict[str, Dict]:
+        """codigo → {'desde', 'hasta', 'valores', 'actualizado'} (siempre del primario)"""
+        filas = self.ejecutar(_SQL_MARCAS, primario=True) or []
+        return {f['codigo']: dict(f, desde=_fecha(f['desde']), hasta=_fecha(f['hasta'])) for f in filas}
+
+    def rellenar(self, desde: int, hasta: int = None, codigos: Iterable[str] = None,
+                 trabajadores: int = None, tasa: float = None, forzar: bool = False,
+                 mostrar: Callable[[str], None] = print) -> Dict[str, Dict]:
+        """
+        Carga los años [desde, hasta] (hasta = año en curso) de cada indicador.
+        forzar=True vuelve a pedir también los años ya cubiertos por la marca.
+        Devuelve por indicador: años pedidos, fallidos, valores guardados y el tramo final.
+        """
+        hoy = date.today()
+        hasta = min(hasta or hoy.year, hoy.year)
+        codigos = sorted(codigos or IndicadorEconomico.CODIGOS_VALIDOS)
+        marcas = self.marcas()
+
+        pendientes = [(codigo, anio) for codigo in codigos for anio in range(desde, hasta + 1)
+                      if forzar or not self._cubierto(marcas.get(codigo), anio)]
+        resumen = {codigo: {'pedidos': 0, 'fallidos': [], 'valores': 0, 'tramo': None} for codigo in codigos}
+        if not pendientes:
+            mostrar(f"✅ Nada que cargar: {desde}-{hasta} ya cubierto para {len(codigos)} indicadores")
+            return resumen
+
+        cliente = ClienteMindicador(limite=CuboTokens(tasa or self.TASA),
+                                    conexiones=trabajadores or self.TRABAJADORES)
+        ultimas: Dict[Tuple[str, int], Optional[date]] = {}  # (codigo, año) cargado → última fecha con valor
+        inicio = perf_counter()
+        mostrar(f"Cargando {len(pendientes)} series anuales ({len(codigos)} indicadores, {desde}-{hasta}) "
+                f"con {cliente.conexiones} hilos, máx {cliente.limite.tasa:g} consultas/s")
+        try:
+            with ThreadPoolExecutor(max_workers=cliente.conexiones, thread_name_prefix='ecotech-carga') as hilos:
+                futuros = {hilos.submit(cliente.serie_anual, codigo, anio): (codigo, anio)
+                           for codigo, anio in pendientes}
+                for futuro in as_completed(futuros):
+                    codigo, anio = futuros[futuro]
+                    resumen[codigo]['pedidos'] += 1
+                    try:
+                        valores = [(codigo, v['fecha'][:10], v['valor']) for v in futuro.result()]
+                    except Exception as e:
+                        resumen[codigo]['fallidos'].append(anio)
+                        mostrar(f"⚠️  {codigo} {anio}: {e}")
+                        continue
+                    # Un INSERT multi-fila por serie, en este hilo: los de red solo esperan a la API
+                    guardados = sum(1 for r in self._guardar_serie(valores) if r['ok'])
+                    resumen[codigo]['valores'] += guardados
+                    if guardados < len(valores):
+                        resumen[codigo]['fallidos'].append(anio)
+                        mostrar(f"⚠️  {codigo} {anio}: {len(valores) - guardados} valores sin guardar")
+                        continue
+                    ultimas[(codigo, anio)] = max((_fecha(f) for _, f, _ in valores), default=None)
+        finally:
+            cliente.cerrar()
+
+        for codigo in codigos:
+            tramo = self._avanzar(marcas.get(codigo), codigo, desde, hasta, ultimas, hoy)
+            resumen[codigo]['tramo'] = tramo
+            if tramo is not None and resumen[codigo]['pedidos']:
+                desde_iso, hasta_iso = tramo[0].isoformat(), tramo[1].isoformat()
+                total = self.ejecutar(_SQL_CONTAR, (codigo, desde_iso, hasta_iso), fetch_one=True, primario=True)
+                self.ejecutar(_SQL_GUARDAR_MARCA, (codigo, desde_iso, hasta_iso, total['n'] if total else 0))
+
+        valores = sum(r['valores'] for r in resumen.values())
+        fallidos = sum(len(r['fallidos']) for r in resumen.values())
+        mostrar(f"{'✅' if not fallidos else '⚠️ '} {valores} valores en {perf_counter() - inicio:.1f}s "
+                f"({len(pendientes) - fallidos}/{len(pendientes)} series, "
+                f"{cliente.limite.esperado:.1f}s de espera acumulada por el límite de tasa)"
+                + (f"; {fallidos} pendientes para la próxima corrida" if fallidos else ""))
+        return resumen
+
+    # ====================== AUXILIARES ======================
+    def _guardar_serie(self, valores: List[tuple]) -> List[Dict]:
+        if not valores:
+            return []
+        return IndicadorEconomico.compartido().guardar_consultados(valores)
+
+    @staticmethod
+    def _tramo(marca: Optional[Dict]) -> Optional[Tramo]:
+        return (marca['desde'], marca['hasta']) if marca else None
+
+    @staticmethod
+    def _cubierto(marca: Optional[Dict], anio: int) -> bool:
+        return bool(marca) and marca['desde'] <= date(anio, 1, 1) and date(anio, 12, 31) <= marca['hasta']
+
+    @classmethod
+    def _avanzar(cls, marca: Optional[Dict], codigo: str, desde: int, hasta: int,
+                 ultimas: Dict[Tuple[str, int], Optional[date]], hoy: date) -> Optional[Tramo]:
+        """
+        Nuevo tramo sin huecos: desde el año `desde`, mientras cada año esté cubierto por
+        la marca o recién cargado. Un año a medias (el actual) cierra el tramo en su
+        último valor. Si toca o se solapa con la marca anterior, se unen.
+        """
+        tramo_marca = cls._tramo(marca)
+        fin = None
+        for anio in range(desde, hasta + 1):
+            if cls._cubierto(marca, anio):
+                fin = date(anio, 12, 31)
+            elif (codigo, anio) in ultimas:
+                if anio < hoy.year:
+                    fin = date(anio, 12, 31)
+                else:  # año en curso: hasta el último valor publicado
+                    fin = ultimas[(codigo, anio)] or date(anio - 1, 12, 31)
+                    break
+            else:
+                break
+        if fin is None or fin < date(desde, 1, 1):
+            return tramo_marca
+        nuevo = (date(desde, 1, 1), fin)
+        if tramo_marca is None:
+            return nuevo
+        un_dia = timedelta(days=1)
+        if nuevo[0] <= tramo_marca[1] + un_dia and tramo_marca[0] <= nuevo[1] + un_dia:
+            return min(nuevo[0], tramo_marca[0]), max(nuevo[1], tramo_marca[1])
+        return nuevo if nuevo[1] > tramo_marca[1] else tramo_marca  # separados: queda el más reciente
+
+
+def main(argumentos: List[str]) -> int:
+    modelo = CargaHistorica.compartido()
+    if argumentos and argumentos[0] == 'estado':
+        marcas = modelo.marcas()
+        if not marcas:
+            print("Sin cargas históricas todavía (python -m model.carga_historica AÑO_DESDE)")
+        for codigo, m in marcas.items():
+            print(f"   {codigo:<8} {m['desde']} → {m['hasta']}  {m['valores']:>6} valores  ({m['actualizado']})")
+        return 0
+    forzar = '--forzar' in argumentos
+    anios = [a for a in argumentos if a != '--forzar']
+    try:
+        desde = int(anios[0]) if anios else date.today().year - 1
+        hasta = int(anios[1]) if len(anios) > 1 else None
+    except ValueError:
+        print("Uso: python -m model.carga_historica [año_desde [año_hasta]] [--forzar] | estado")
+        return 2
+    resumen = modelo.rellenar(desde, hasta, forzar=forzar)
+    return 1 if any(r['fallidos'] for r in resumen.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,135 @@
+# model/cargador.py - Carga agrupada de entidades relacionadas (una consulta IN por tipo)
+"""
+En vez de una consulta por fila relacionada (N+1), los pedidos se juntan y se
+resuelven de una vez:
+
+    with Cargadores.alcance() as c:
+        diferidos = [(p, c.empleados_de_proyecto.cargar(p['id'])) for p in proyectos]
+        for p, empleados in diferidos:
+            p['empleados'] = empleados.valor   # el primer .valor despacha todas las claves
+
+Las claves pedidas se guardan durante el alcance (una pantalla, un reporte): pedir
+de nuevo la misma no vuelve a la base.
+"""
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+_SIN_CARGAR = object()
+
+
+class Diferido(Generic[K, V]):
+    """Valor de una clave pedida a un Cargador; se resuelve al leer .valor"""
+
+    __slots__ = ('_cargador', 'clave')
+
+    def __init__(self, cargador: 'Cargador[K, V]', clave: K):
+        self._cargador = cargador
+        self.clave = clave
+
+    @property
+    def valor(self) -> V:
+        return self._cargador._resolver(self.clave)
+
+    def __repr__(self):
+        return f"Diferido({self.clave!r})"
+
+
+class Cargador(Generic[K, V]):
+    """
+    buscar_varios(claves) → {clave: valor} con una consulta (o una por bloque).
+    Las claves que no vuelven valen defecto() (None si no se indica; list para relaciones).
+    """
+
+    def __init__(self, buscar_varios: Callable[[List[K]], Dict[K, V]],
+                 defecto: Optional[Callable[[], V]] = None, tamano_lote: int = 500):
+        self._buscar_varios = buscar_varios
+        self._defecto = defecto
+        self.tamano_lote = tamano_lote
+        self._valores: Dict[K, Any] = {}
+        self._pendientes: Dict[K, None] = {}  # dict como conjunto ordenado
+        self.despachos = 0
+
+    def cargar(self, clave: K) -> Diferido[K, V]:
+        """Anota la clave para el próximo despacho (no consulta todavía)"""
+        if clave not in self._valores:
+            self._pendientes[clave] = None
+        return Diferido(self, clave)
+
+    def cargar_varios(self, claves: Iterable[K]) -> List[V]:
+        """Valores de todas las claves, en el mismo orden, con las consultas justas"""
+        claves = list(claves)
+        for clave in claves:
+            if clave not in self._valores:
+                self._pendientes[clave] = None
+        self.despachar()
+        return [self._valores[clave] for clave in claves]
+
+    def despachar(self) -> int:
+        """Resuelve todas las claves pendientes; devuelve cuántas consultó"""
+        pendientes = list(self._pendientes)
+        self._pendientes.clear()
+        for inicio in range(0, len(pendientes), self.tamano_lote):
+            bloque = pendientes[inicio:inicio + self.tamano_lote]
+            encontrados = self._buscar_varios(bloque)
+            self.despachos += 1
+            for clave in bloque:
+                valor = encontrados.get(clave, _SIN_CARGAR)
+                if valor is _SIN_CARGAR:
+                    valor = self._defecto() if self._defecto else None
+                self._valores[clave] = valor
+        return len(pendientes)
+
+    def _resolver(self, clave: K) -> V:
+        valor = self._valores.get(clave, _SIN_CARGAR)
+        if valor is _SIN_CARGAR:
+            self._pendientes[clave] = None  # por si se pidió antes de un limpiar()
+            self.despachar()
+            valor = self._valores[clave]
+        return valor
+
+    def limpiar(self) -> None:
+        self._valores.clear()
+        self._pendientes.clear()
+
+
+class Cargadores:
+    """Un juego de cargadores por alcance; Cargadores.actual() dentro de un with alcance()"""
+
+    _local = threading.local()
+
+    def __init__(self):
+        from model.asignacion_proyecto import AsignacionProyecto
+        from model.departamento import Departamento
+        from model.empleado import Empleado
+        from model.proyecto import Proyecto
+        asignaciones = AsignacionProyecto.compartido()
+        # Entidades: pasan por CacheEntidades (buscar_por_ids solo consulta lo que falta)
+        self.empleados = Cargador(Empleado.compartido().buscar_por_ids)
+        self.departamentos = Cargador(Departamento.compartido().buscar_por_ids)
+        self.proyectos = Cargador(Proyecto.compartido().buscar_por_ids)
+        # Relaciones muchos-a-muchos: lista completa por clave, sin GROUP_CONCAT
+        self.empleados_de_proyecto = Cargador(asignaciones.empleados_de_proyectos, defecto=list)
+        self.proyectos_de_empleado = Cargador(asignaciones.proyectos_de_empleados, defecto=list)
+
+    @classmethod
+    @contextmanager
+    def alcance(cls) -> Iterator['Cargadores']:
+        """with Cargadores.alcance() as c: ... → anidado, reutiliza el de afuera"""
+        actual = getattr(cls._local, 'actual', None)
+        if actual is not None:
+            yield actual
+            return
+        cls._local.actual = cargadores = cls()
+        try:
+            yield cargadores
+        finally:
+            cls._local.actual = None
+
+    @classmethod
+    def actual(cls) -> 'Cargadores':
+        """Los del alcance abierto en este hilo, o unos nuevos de un solo uso"""
+        return getattr(cls._local, 'actual', None) or cls()
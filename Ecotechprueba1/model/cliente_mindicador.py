@@ -0,0 +1,255 @@
+# model/cliente_mindicador.py - Cliente HTTP de mindicador.cl: sesión persistente, reintentos y cortacircuitos
+"""
+Una Session de requests por proceso (keep-alive: sin TCP + TLS por consulta), con:
+
+  - timeouts separados de conexión y de lectura
+  - reintentos acotados con espera exponencial y jitter para timeouts, errores
+    de conexión, 429 y 5xx (un 404 es una respuesta válida: no se reintenta)
+  - cortacircuitos: tras FALLOS_PARA_ABRIR consultas fallidas seguidas se deja de
+    llamar durante ENFRIAMIENTO segundos (CircuitoAbierto al instante, sin esperar
+    el timeout); después pasa una sola consulta de prueba que lo cierra o reabre
+  - latencias por endpoint ('uf', 'uf/fecha', 'uf/año', ...) para el menú de rendimiento
+  - límite de tasa opcional (CuboTokens) para cargas masivas: cada intento toma una ficha
+
+La URL base se puede apuntar a un servidor local (ECOTECH_MINDICADOR_URL o
+ClienteMindicador(url_base=...)); ver benchmarks/bench_cliente_http.py.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class CircuitoAbierto(Exception):
+    """mindicador.cl falló seguido: no se consulta hasta que vuelva a probarse"""
+
+    def __init__(self, segundos: float):
+        super().__init__(f"API de indicadores no disponible; se reintentará en {segundos:.0f}s")
+        self.segundos = segundos
+
+
+class CuboTokens:
+    """Límite de tasa: ráfagas de hasta `capacidad` consultas y `tasa` por segundo sostenidas"""
+
+    def __init__(self, tasa: float, capacidad: float = None):
+        self.tasa = tasa
+        self.capacidad = capacidad if capacidad is not None else max(tasa, 1.0)
+        self._fichas = self.capacidad
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+        self.esperado = 0.0  # segundos acumulados de espera (para reportar)
+
+    def tomar(self) -> float:
+        """Toma una ficha, esperando si no hay; devuelve los segundos esperados"""
+        with self._lock:
+            ahora = time.monotonic()
+            self._fichas = min(self.capacidad, self._fichas + (ahora - self._ultimo) * self.tasa)
+            self._ultimo = ahora
+            self._fichas -= 1  # reservada aunque quede en negativo: los siguientes esperan más
+            espera = -self._fichas / self.tasa if self._fichas < 0 else 0.0
+            self.esperado += espera
+        if espera:
+            time.sleep(espera)  # fuera del lock: los demás hilos calculan su turno mientras tanto
+        return espera
+
+
+class _Endpoint:
+    __slots__ = ('llamadas', 'errores', 'reintentos', 'latencias')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.errores = 0
+        self.reintentos = 0
+        self.latencias = deque(maxlen=500)  # segundos por intento con respuesta
+
+
+class ClienteMindicador:
+    """Cliente de la API; ClienteMindicador.compartido() para el del proceso"""
+
+    URL_BASE = os.environ.get('ECOTECH_MINDICADOR_URL', "https://mindicador.cl/api")
+    CABECERAS = {
+        "User-Agent": "EcoTechSolutions-Poo2025/1.0",
+        "Accept": "application/json"
+    }
+    TIMEOUT_CONEXION = 3.05  # segundos; algo más que un múltiplo de 3 (retransmisión TCP)
+    TIMEOUT_LECTURA = 9.0
+    REINTENTOS = 2           # además del primer intento
+    ESPERA_BASE = 0.25       # segundos; se duplica por reintento, con jitter completo
+    ESPERA_MAX = 2.0
+    FALLOS_PARA_ABRIR = 3
+    ENFRIAMIENTO = 30.0
+    CONEXIONES = 4           # conexiones keep-alive en el pool de la sesión
+
+    _compartido: Optional['ClienteMindicador'] = None
+    _lock_compartido = threading.Lock()
+
+    def __init__(self, url_base: str = None, limite: CuboTokens = None, conexiones: int = None):
+        self.url_base = (url_base or self.URL_BASE).rstrip('/')
+        self.limite = limite
+        self.conexiones = conexiones or self.CONEXIONES
+        self._sesion = None
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, _Endpoint] = {}
+        # Cortacircuitos: 'cerrado' (normal), 'abierto' (falla al instante), 'semiabierto' (una prueba en curso)
+        self.estado = 'cerrado'
+        self._fallos_seguidos = 0
+        self._abierto_hasta = 0.0
+        self._aperturas = 0
+
+    @classmethod
+    def compartido(cls) -> 'ClienteMindicador':
+        with cls._lock_compartido:
+            if cls._compartido is None:
+                cls._compartido = cls()
+            return cls._compartido
+
+    def _session(self):
+        if self._sesion is None:
+            import requests  # pesado (urllib3, certifi): solo cuando realmente se consulta la API
+            from requests.adapters import HTTPAdapter
+            sesion = requests.Session()
+            sesion.headers.update(self.CABECERAS)
+            # Los reintentos los hace este cliente (con backoff y cortacircuitos), no urllib3
+            adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.conexiones, max_retries=0)
+            sesion.mount('http://', adaptador)
+            sesion.mount('https://', adaptador)
+            self._sesion = sesion
+        return self._sesion
+
+    # ====================== CONSULTAS ======================
+    def serie(self, codigo: str, fecha: Optional[str] = None) -> list:
+        """Serie de un indicador (hoy, o la fecha YYYY-MM-DD); [] si no hay dato"""
+        ruta = codigo
+        if fecha is not None:
+            ruta += f"/{fecha[8:10]}-{fecha[5:7]}-{fecha[:4]}"
+        return self.obtener(ruta, endpoint=codigo if fecha is None else f"{codigo}/fecha").get('serie') or []
+
+    def serie_anual(self, codigo: str, anio: int) -> list:
+        """Todos los valores publicados del indicador en el año (una sola consulta)"""
+        return self.obtener(f"{codigo}/{anio}", endpoint=f"{codigo}/año").get('serie') or []
+
+    def obtener(self, ruta: str, endpoint: str = None) -> Dict[str, Any]:
+        """
+        GET {url_base}/{ruta} → JSON. Propaga la excepción de requests del último
+        intento (Timeout, ConnectionError, HTTPError) o CircuitoAbierto.
+        """
+        prueba = self._pasar_circuito()
+        try:
+            return self._obtener(ruta, endpoint)
+        finally:
+            if prueba:
+                self._terminar_prueba()
+
+    def _obtener(self, ruta: str, endpoint: Optional[str]) -> Dict[str, Any]:
+        import requests
+        stats = self._stats_de(endpoint or ruta.split('/')[0])
+        url = f"{self.url_base}/{ruta}"
+        intento = 0
+        while True:
+            if self.limite is not None:
+                self.limite.tomar()
+            inicio = time.perf_counter()
+            try:
+                respuesta = self._session().get(url, timeout=(self.TIMEOUT_CONEXION, self.TIMEOUT_LECTURA))
+                stats.latencias.append(time.perf_counter() - inicio)
+                respuesta.raise_for_status()
+                datos = respuesta.json()
+            except requests.exceptions.HTTPError as e:
+                if e.response.status_code != 429 and e.response.status_code < 500:
+                    stats.llamadas += 1
+                    self._registrar_exito()  # la API respondió: está sana aunque el dato no exista
+                    raise
+                error = e
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                error = e
+            except Exception:
+                # Respuesta ilegible (JSON inválido, ...): no se reintenta, pero cuenta como fallo
+                stats.llamadas += 1
+                stats.errores += 1
+                self._registrar_fallo()
+                raise
+            else:
+                stats.llamadas += 1
+                self._registrar_exito()
+                return datos
+
+            if intento >= self.REINTENTOS or self.estado == 'semiabierto':
+                stats.llamadas += 1
+                stats.errores += 1
+                self._registrar_fallo()
+                raise error
+            intento += 1
+            stats.reintentos += 1
+            time.sleep(random.uniform(0, min(self.ESPERA_MAX, self.ESPERA_BASE * 2 ** intento)))
+
+    # ====================== CORTACIRCUITOS ======================
+    def _pasar_circuito(self) -> bool:
+        """¿Puede consultar? True si esta consulta es la de prueba (circuito semiabierto)"""
+        with self._lock:
+            if self.estado == 'cerrado':
+                return False
+            restante = self._abierto_hasta - time.monotonic()
+            if self.estado == 'abierto' and restante <= 0:
+                self.estado = 'semiabierto'  # este hilo hace la consulta de prueba
+                return True
+            raise CircuitoAbierto(max(restante, 0.0))  # semiabierto: otro hilo está probando
+
+    def _terminar_prueba(self) -> None:
+        """
+        La prueba terminó sin veredicto (KeyboardInterrupt, SystemExit, error del límite
+        de tasa...): se reabre, o el circuito quedaría semiabierto para siempre
+        """
+        with self._lock:
+            if self.estado == 'semiabierto':
+                self.estado = 'abierto'
+                self._abierto_hasta = time.monotonic() + self.ENFRIAMIENTO
+
+    def _registrar_exito(self) -> None:
+        with self._lock:
+            self._fallos_seguidos = 0
+            self.estado = 'cerrado'
+
+    def _registrar_fallo(self) -> None:
+        with self._lock:
+            self._fallos_seguidos += 1
+            if self.estado == 'abierto':
+                return  # ya abierto por otro hilo
+            if self.estado == 'semiabierto' or self._fallos_seguidos >= self.FALLOS_PARA_ABRIR:
+                self.estado = 'abierto'
+                self._abierto_hasta = time.monotonic() + self.ENFRIAMIENTO
+                self._aperturas += 1
+
+    # ====================== ESTADÍSTICAS ======================
+    def _stats_de(self, endpoint: str) -> _Endpoint:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            with self._lock:
+                stats = self._endpoints.setdefault(endpoint, _Endpoint())
+        return stats
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Estado del cortacircuitos y, por endpoint, llamadas y latencias (ms) de los intentos"""
+        with self._lock:
+            endpoints = list(self._endpoints.items())
+            resumen = {'estado': self.estado, 'aperturas': self._aperturas,
+                       'fallos_seguidos': self._fallos_seguidos,
+                       'reabre_en': round(max(self._abierto_hasta - time.monotonic(), 0.0), 1)
+                       if self.estado == 'abierto' else 0.0}
+        resumen['endpoints'] = {}
+        for nombre, stats in sorted(endpoints):
+            latencias = sorted(stats.latencias)
+            n = len(latencias)
+            resumen['endpoints'][nombre] = {
+                'llamadas': stats.llamadas, 'errores': stats.errores, 'reintentos': stats.reintentos,
+                'p50_ms': round(latencias[n // 2] * 1000, 1) if n else None,
+                'p95_ms': round(latencias[min(n - 1, int(n * 0.95))] * 1000, 1) if n else None,
+                'max_ms': round(latencias[-1] * 1000, 1) if n else None,
+            }
+        return resumen
+
+    def cerrar(self) -> None:
+        if self._sesion is not None:
+            self._sesion.close()
+            self._sesion = None
@@ -1,7 +1,6 @@
 # model/conexion.py
-# Versión definitiva y funcional (sin errores de indentación)
-import pymysql
-from pymysql.cursors import DictCursor
+# Acceso directo a una conexión, ahora prestada desde el pool compartido
+from config.database import DatabaseConnection
 
 class Conexion:
     _instancia = None
@@ -13,21 +12,11 @@ class Conexion:
 
     def conectar(self):
         """
-        Cada llamada devuelve una conexión NUEVA y limpia.
-        Soluciona el bug del cursor agotado después del primer intento fallido.
+        Cada llamada presta una conexión sana del pool (ping previo).
+        Al llamar close() sobre ella vuelve al pool en lugar de cerrarse.
         """
         try:
-            return pymysql.connect(
-                host='localhost',
-                user='poosuser',
-                password='12345678',
-                database='ecotech_solutions',
-                port=8889,
-                cursorclass=DictCursor,
-                autocommit=True,
-                charset='utf8mb4',
-                connect_timeout=10
-            )
+            return DatabaseConnection.get_connection()
         except Exception as e:
             print(f"\nError al conectar con la base de datos: {e}")
             return None
@@ -1,6 +1,6 @@
 # model/consulta_indicador.py
 # Logging completo de uso del sistema + estadísticas + privacidad
-from model.base_model import BaseModel
+from model.base_model import BaseModel, cacheado
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
@@ -11,6 +11,12 @@ class ConsultaIndicador(BaseModel):
     Incluye estadísticas, limpieza automática y privacidad de datos.
     """
 
+    _SQL_REGISTRAR = """
+        INSERT INTO consulta_indicador 
+        (usuario_id, indicador_codigo, fecha_indicador, valor, guardado)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+
     def registrar(self, usuario_id: int, codigo: str, fecha_indicador: str,
                   valor: float, guardado: bool = False) -> Optional[int]:
         """
@@ -25,12 +31,7 @@ class ConsultaIndicador(BaseModel):
             print("Error interno: fecha del indicador inválida.")
             return None
 
-        query = """
-            INSERT INTO consulta_indicador 
-            (usuario_id, indicador_codigo, fecha_indicador, valor, guardado)
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        consulta_id = self.ejecutar(query, (
+        consulta_id = self.ejecutar(self._SQL_REGISTRAR, (
             usuario_id,
             codigo,
             fecha_indicador,
@@ -43,20 +44,42 @@ class ConsultaIndicador(BaseModel):
             print(f"Consulta de {codigo.upper()} {estado}.")
         return consulta_id
 
+    def registrar_lote(self, consultas: List[Dict], chunk_size: int = 500) -> List[Dict]:
+        """
+        Registro masivo de consultas: cada dict con usuario_id, codigo,
+        fecha_indicador, valor y guardado opcional.
+        Devuelve un resultado por consulta: {'ok', 'id', 'error'}.
+        """
+        def validar(c: Dict):
+            if not self._es_fecha_iso(c.get('fecha_indicador')):
+                return None, "Fecha del indicador inválida"
+            try:
+                valor = round(float(c['valor']), 4)
+            except (KeyError, TypeError, ValueError):
+                return None, "Valor inválido"
+            return (c.get('usuario_id'), str(c.get('codigo', '')).lower().strip(),
+                    c['fecha_indicador'], valor, 1 if c.get('guardado') else 0), None
+
+        return self._escribir_lote(self._SQL_REGISTRAR, consultas, validar, "Consultas", chunk_size)
+
     def listar_por_usuario(self, usuario_id: int, limite: int = 50) -> List[Dict]:
-        """Historial completo de consultas del usuario"""
-        query = """
+        """Consultas más recientes del usuario (primera página de pagina_por_usuario)"""
+        return self.pagina_por_usuario(usuario_id, limit=limite)['filas']
+
+    def pagina_por_usuario(self, usuario_id: int, after: Optional[str] = None,
+                           limit: int = 50) -> Dict:
+        """Historial paginado por (fecha_consulta, id) descendente: {'filas', 'siguiente'}"""
+        select = """
             SELECT 
                 ci.*,
-                DATE_FORMAT(ci.fecha_consulta, '%d/%m/%Y %H:%i') AS fecha_consulta_cl,
-                DATE_FORMAT(ci.fecha_indicador, '%d/%m/%Y') AS fecha_indicador_cl,
+                DATE_FORMAT(ci.fecha_consulta, '%%d/%%m/%%Y %%H:%%i') AS fecha_consulta_cl,
+                DATE_FORMAT(ci.fecha_indicador, '%%d/%%m/%%Y') AS fecha_indicador_cl,
                 CASE WHEN ci.guardado = 1 THEN 'Sí' ELSE 'No' END AS guardado_txt
             FROM consulta_indicador ci
-            WHERE ci.usuario_id = %s
-            ORDER BY ci.fecha_consulta DESC
-            LIMIT %s
         """
-        return self.ejecutar(query, (usuario_id, limite)) or []
+        return self._pagina(select, ["ci.usuario_id = %s"], [usuario_id],
+                            (("ci.fecha_consulta", "fecha_consulta"), ("ci.id", "id")),
+                            descendente=True, after=after, limit=limit)
 
     def estadisticas_usuario(self, usuario_id: int) -> List[Dict]:
         """Estadísticas detalladas por indicador para un usuario"""
@@ -73,6 +96,7 @@ class ConsultaIndicador(BaseModel):
         """
         return self.ejecutar(query, (usuario_id,)) or []
 
+    @cacheado('consulta_indicador')
     def total_consultas_hoy(self) -> int:
         """Total de consultas realizadas hoy en todo el sistema"""
         query = """
@@ -83,6 +107,7 @@ class ConsultaIndicador(BaseModel):
         resultado = self.ejecutar(query, fetch_one=True)
         return int(resultado['total']) if resultado else 0
 
+    @cacheado('consulta_indicador')
     def top_indicadores_global(self, limite: int = 5) -> List[Dict]:
         """Los indicadores más consultados en todo el sistema"""
         query = """
@@ -1,6 +1,6 @@
 # model/departamento.py
-from model.base_model import BaseModel
-from typing import Optional, List, Dict
+from model.base_model import BaseModel, cacheado, transaccional
+from typing import Optional, List, Dict, Sequence
 
 class Departamento(BaseModel):
     """Modelo para gestión de departamentos"""
@@ -19,8 +19,11 @@ class Departamento(BaseModel):
             print(f"✅ Departamento '{nombre}' creado (ID: {dept_id})")
         return dept_id
     
-    def listar(self) -> List[Dict]:
+    @cacheado('departamento', 'empleado')
+    def listar(self, columnas: Optional[Sequence[str]] = None) -> List[Dict]:
         """Lista todos los departamentos con información del gerente"""
+        if columnas:
+            return self._proyectar('departamento', columnas, orden='nombre')
         query = """
             SELECT d.*, 
                    e.nombre AS gerente_nombre,
@@ -31,29 +34,26 @@ class Departamento(BaseModel):
         """
         return self.ejecutar(query) or []
     
-    def buscar_por_id(self, departamento_id: int) -> Optional[Dict]:
-        """Busca un departamento por su ID"""
-        query = """
-            SELECT d.*, e.nombre AS gerente_nombre
-            FROM departamento d
-            LEFT JOIN empleado e ON d.gerente_id = e.id
-            WHERE d.id = %s
-        """
-        return self.ejecutar(query, (departamento_id,), fetch_one=True)
+    # buscar_por_id / buscar_por_ids (BaseModel, con CacheEntidades)
+    TABLA = 'departamento'
+    _SQL_POR_IDS = """
+        SELECT d.*, e.nombre AS gerente_nombre
+        FROM departamento d
+        LEFT JOIN empleado e ON d.gerente_id = e.id
+        WHERE d.id IN ({ids})
+    """
     
+    @transaccional()
     def asignar_gerente(self, departamento_id: int, gerente_id: Optional[int]) -> bool:
         """Asigna o quita un gerente del departamento"""
         # Verificar que el departamento existe
-        dept = self.buscar_por_id(departamento_id)
-        if not dept:
+        if not self.existe('departamento', departamento_id):
             print(f"❌ Departamento ID {departamento_id} no existe")
             return False
         
         # Si se asigna un gerente, verificar que el empleado existe
         if gerente_id:
-            from model.empleado import Empleado
-            emp = Empleado().buscar_por_id(gerente_id)
-            if not emp:
+            if not self.existe('empleado', gerente_id):
                 print(f"❌ Empleado ID {gerente_id} no existe")
                 return False
         
@@ -64,25 +64,13 @@ class Departamento(BaseModel):
         """Actualiza un departamento"""
         if not campos:
             return False
-        
-        sets = []
-        valores = []
-        for campo, valor in campos.items():
-            if campo in ['nombre']:
-                sets.append(f"{campo} = %s")
-                valores.append(valor)
-        
-        if not sets:
-            return False
-        
-        valores.append(departamento_id)
-        query = f"UPDATE departamento SET {', '.join(sets)} WHERE id = %s"
-        return bool(self.ejecutar(query, tuple(valores)))
+        return self._actualizar_campos('departamento', departamento_id, campos, ('nombre',))
     
+    @transaccional()
     def eliminar(self, departamento_id: int) -> bool:
-        """Elimina un departamento"""
-        # Verificar que no tenga empleados asignados
-        query_check = "SELECT COUNT(*) AS total FROM empleado WHERE departamento_id = %s"
+        """Elimina un departamento (verificación y borrado en la misma transacción)"""
+        # Verificar que no tenga empleados asignados; FOR UPDATE evita que se asigne uno entre medio
+        query_check = "SELECT COUNT(*) AS total FROM empleado WHERE departamento_id = %s FOR UPDATE"
         resultado = self.ejecutar(query_check, (departamento_id,), fetch_one=True)
         
         if resultado and resultado['total'] > 0:
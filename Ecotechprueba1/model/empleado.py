@@ -1,16 +1,23 @@
 # model/empleado.py - Optimizado
-from model.base_model import BaseModel
+from model.base_model import BaseModel, transaccional
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Sequence
 
 class Empleado(BaseModel):
     """Modelo Empleado optimizado"""
     
-    def crear(self, nombre: str, email: str, **kwargs) -> Optional[int]:
-        """Método crear optimizado con parámetros opcionales"""
+    _SQL_CREAR = """
+        INSERT INTO empleado 
+        (nombre, direccion, telefono, email, fecha_contratacion, salario, departamento_id, usuario_id)
+        VALUES (%(nombre)s, %(direccion)s, %(telefono)s, %(email)s, %(fecha_contratacion)s, 
+                %(salario)s, %(departamento_id)s, %(usuario_id)s)
+    """
+    
+    @staticmethod
+    def _preparar(nombre: str, email: str, **kwargs):
+        """Normaliza y valida un empleado → (datos, None) o (None, error)"""
         if not nombre or not email:
-            print("❌ Nombre y email son obligatorios")
-            return None
+            return None, "Nombre y email son obligatorios"
         
         # Parámetros por defecto
         datos = {
@@ -26,18 +33,18 @@ class Empleado(BaseModel):
         
         # Validar email
         if '@' not in datos['email']:
-            print("❌ Email inválido")
+            return None, "Email inválido"
+        return datos, None
+    
+    def crear(self, nombre: str, email: str, **kwargs) -> Optional[int]:
+        """Método crear optimizado con parámetros opcionales"""
+        datos, error = self._preparar(nombre, email, **kwargs)
+        if error:
+            print(f"❌ {error}")
             return None
         
-        query = """
-            INSERT INTO empleado 
-            (nombre, direccion, telefono, email, fecha_contratacion, salario, departamento_id, usuario_id)
-            VALUES (%(nombre)s, %(direccion)s, %(telefono)s, %(email)s, %(fecha_contratacion)s, 
-                    %(salario)s, %(departamento_id)s, %(usuario_id)s)
-        """
-        
         try:
-            empleado_id = self.ejecutar(query, datos)
+            empleado_id = self.ejecutar(self._SQL_CREAR, datos)
             if empleado_id:
                 print(f"✅ Empleado '{datos['nombre']}' creado (ID: {empleado_id})")
             return empleado_id
@@ -45,39 +52,65 @@ class Empleado(BaseModel):
             print(f"❌ Error al crear empleado: {e}")
             return None
     
-    def listar(self) -> List[Dict]:
-        query = """
-            SELECT e.*, d.nombre AS departamento_nombre
-            FROM empleado e
-            LEFT JOIN departamento d ON e.departamento_id = d.id
-            ORDER BY e.nombre
+    def crear_lote(self, empleados: List[Dict], chunk_size: int = 500) -> List[Dict]:
+        """
+        Alta masiva: cada dict con las mismas claves que crear().
+        Devuelve un resultado por empleado: {'ok', 'id', 'error'} (id: ver ejecutar_lote).
         """
-        return self.ejecutar(query) or []
+        def validar(emp: Dict):
+            try:
+                return self._preparar(**emp)
+            except (TypeError, ValueError) as e:
+                return None, f"Datos inválidos: {e}"
+        
+        return self._escribir_lote(self._SQL_CREAR, empleados, validar, "Empleados", chunk_size)
     
-    def buscar_por_id(self, empleado_id: int) -> Optional[Dict]:
-        query = """
+    _SQL_LISTAR = """
+        SELECT e.*, d.nombre AS departamento_nombre
+        FROM empleado e
+        LEFT JOIN departamento d ON e.departamento_id = d.id
+        ORDER BY e.nombre
+    """
+    
+    def listar(self, columnas: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Con columnas=('id', 'nombre') trae solo esas columnas de empleado, sin el JOIN"""
+        if columnas:
+            return self._proyectar('empleado', columnas, orden='nombre')
+        return self.ejecutar(self._SQL_LISTAR) or []
+    
+    def pagina(self, after: Optional[str] = None, limit: int = 20) -> Dict:
+        """Página ordenada por (nombre, id): {'filas': [...], 'siguiente': cursor o None}"""
+        select = """
             SELECT e.*, d.nombre AS departamento_nombre
             FROM empleado e
             LEFT JOIN departamento d ON e.departamento_id = d.id
-            WHERE e.id = %s
         """
-        return self.ejecutar(query, (empleado_id,), fetch_one=True)
+        return self._pagina(select, [], [], (("e.nombre", "nombre"), ("e.id", "id")),
+                            descendente=False, after=after, limit=limit)
+    
+    def iter_listar(self, tamano_lote: int = None) -> Iterator[Dict]:
+        """Como listar(), pero en streaming (memoria constante)"""
+        return self.iterar(self._SQL_LISTAR, tamano_lote=tamano_lote)
+    
+    # buscar_por_id / buscar_por_ids (BaseModel, con CacheEntidades)
+    TABLA = 'empleado'
+    _SQL_POR_IDS = """
+        SELECT e.*, d.nombre AS departamento_nombre
+        FROM empleado e
+        LEFT JOIN departamento d ON e.departamento_id = d.id
+        WHERE e.id IN ({ids})
+    """
+    
+    # Columnas que se pueden modificar vía actualizar()
+    CAMPOS_ACTUALIZABLES = ('nombre', 'direccion', 'telefono', 'email', 'fecha_contratacion',
+                            'salario', 'departamento_id', 'usuario_id')
     
     def actualizar(self, empleado_id: int, **campos) -> bool:
         if not campos:
             return False
-        
-        sets = []
-        valores = []
-        for campo, valor in campos.items():
-            sets.append(f"{campo} = %s")
-            valores.append(valor)
-        
-        valores.append(empleado_id)
-        query = f"UPDATE empleado SET {', '.join(sets)} WHERE id = %s"
-        
-        return bool(self.ejecutar(query, tuple(valores)))
+        return self._actualizar_campos('empleado', empleado_id, campos, self.CAMPOS_ACTUALIZABLES)
     
+    @transaccional()
     def eliminar(self, empleado_id: int) -> bool:
         # Verificar si tiene registros relacionados primero
         query_check = "SELECT 1 FROM registro_tiempo WHERE empleado_id = %s LIMIT 1"
@@ -0,0 +1,99 @@
+# model/filas.py - Filas compactas (tuplas o registros con __slots__) para resultados grandes
+"""
+Un dict por fila cuesta cientos de bytes aunque la fila tenga pocas columnas.
+Para recorridos grandes (exportaciones) BaseModel.iterar_compacto entrega:
+
+  - 'tupla':    la tupla que trae el driver, sin copiar nada; nombres en .columnas
+  - 'registro': tupla con nombre (__slots__ vacío: mismo tamaño que la tupla) que
+                además se lee como dict: fila['horas'], fila.get('horas'), dict(fila)
+
+Las columnas se conocen al ejecutar la consulta (al pedir la primera fila).
+"""
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+FORMATOS = ('tupla', 'registro')
+
+
+class _PorNombre:
+    """Acceso tipo dict sobre una tupla con nombre (solo lectura)"""
+
+    __slots__ = ()
+    _indices: Dict[str, int] = {}
+
+    def __getitem__(self, clave):
+        if type(clave) is str:
+            return tuple.__getitem__(self, self._indices[clave])
+        return tuple.__getitem__(self, clave)
+
+    def get(self, clave: str, defecto: Any = None) -> Any:
+        indice = self._indices.get(clave)
+        return defecto if indice is None else tuple.__getitem__(self, indice)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._columnas
+
+    def __contains__(self, clave) -> bool:
+        return clave in self._indices
+
+
+class Columnas(tuple):
+    """Nombres de las columnas de un resultado, con su posición y el tipo de registro"""
+
+    _tipos: Dict[Tuple[str, ...], type] = {}
+
+    def __new__(cls, nombres: Sequence[str]):
+        columnas = super().__new__(cls, nombres)
+        columnas.indices = {nombre: i for i, nombre in enumerate(columnas)}
+        return columnas
+
+    @classmethod
+    def de_cursor(cls, cursor) -> 'Columnas':
+        return cls(d[0] for d in cursor.description or ())
+
+    def indice(self, nombre: str) -> int:
+        return self.indices[nombre]
+
+    @property
+    def registro(self) -> type:
+        """Clase de registro para estas columnas (una por conjunto de nombres, reutilizada)"""
+        clave = tuple(self)
+        tipo = Columnas._tipos.get(clave)
+        if tipo is None:
+            # rename: alias no válidos como atributo (COUNT(*)) quedan como _0, _1...; por nombre siguen
+            base = namedtuple('Fila', clave, rename=True)
+            tipo = Columnas._tipos[clave] = type('Registro', (_PorNombre, base), {
+                '__slots__': (), '_indices': dict(self.indices), '_columnas': clave,
+            })
+        return tipo
+
+    def convertidor(self, formato: str) -> Optional[Callable[[list], list]]:
+        """Función lote → lote en el formato pedido (None: las tuplas del driver tal cual)"""
+        if formato == 'tupla':
+            return None
+        if formato == 'registro':
+            hacer = self.registro._make
+            return lambda lote: [hacer(fila) for fila in lote]
+        raise ValueError(f"Formato de fila no soportado: {formato} (use {', '.join(FORMATOS)})")
+
+
+class FilasCompactas:
+    """
+    Iterador de filas compactas. columnas queda disponible al pedir la primera fila
+    (antes es None). Cortar la iteración con close() libera la conexión.
+    """
+
+    __slots__ = ('columnas', '_filas')
+
+    def __init__(self):
+        self.columnas: Optional[Columnas] = None
+        self._filas: Optional[Iterator] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._filas)
+
+    def close(self) -> None:
+        self._filas.close()
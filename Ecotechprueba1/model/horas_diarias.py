@@ -0,0 +1,217 @@
+# model/horas_diarias.py - Acumulado de horas por empleado, proyecto y día
+"""
+horas_diarias guarda SUM(horas) y COUNT(*) de registro_tiempo por
+(empleado_id, proyecto_id, fecha). La mantienen triggers sobre registro_tiempo
+(migración 0004): cualquier INSERT/UPDATE/DELETE la ajusta en la misma
+sentencia, sin idas y vueltas extra desde los modelos. Las FK con
+ON DELETE CASCADE cubren los borrados en cascada, que en MySQL no disparan triggers.
+
+Con el log binario activo, MySQL solo deja crear triggers a un usuario con SUPER
+o con log_bin_trust_function_creators=1 (error 1419). Sin ellos la migración sigue
+y RegistroTiempo suma sus inserciones al acumulado (sumar()) dentro de la misma
+transacción; `triggers` los instala después y reconstruye el acumulado.
+
+    python -m model.horas_diarias verificar
+    python -m model.horas_diarias reconstruir
+    python -m model.horas_diarias triggers
+"""
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+from config.database import DatabaseConnection
+from model.base_model import BaseModel, transaccional
+
+SQL_TABLA = """
+    CREATE TABLE IF NOT EXISTS horas_diarias (
+        empleado_id INT NOT NULL,
+        proyecto_id INT NOT NULL,
+        fecha DATE NOT NULL,
+        horas DECIMAL(8,2) NOT NULL DEFAULT 0,
+        n_registros INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (empleado_id, proyecto_id, fecha),
+        FOREIGN KEY (empleado_id) REFERENCES empleado(id) ON DELETE CASCADE,
+        FOREIGN KEY (proyecto_id) REFERENCES proyecto(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+# Cuerpos de los triggers (sintaxis MySQL; el dialecto SQLite traduce el upsert)
+_SUMAR_NEW = """
+    INSERT INTO horas_diarias (empleado_id, proyecto_id, fecha, horas, n_registros)
+    VALUES (NEW.empleado_id, NEW.proyecto_id, NEW.fecha, NEW.horas, 1)
+    ON DUPLICATE KEY UPDATE horas = horas + VALUES(horas), n_registros = n_registros + 1
+"""
+_RESTAR_OLD = """
+    UPDATE horas_diarias SET horas = horas - OLD.horas, n_registros = n_registros - 1
+    WHERE empleado_id = OLD.empleado_id AND proyecto_id = OLD.proyecto_id AND fecha = OLD.fecha
+"""
+_PURGAR_OLD = """
+    DELETE FROM horas_diarias
+    WHERE empleado_id = OLD.empleado_id AND proyecto_id = OLD.proyecto_id AND fecha = OLD.fecha
+      AND n_registros <= 0
+"""
+
+TRIGGERS = ('trg_registro_tiempo_ai', 'trg_registro_tiempo_au', 'trg_registro_tiempo_ad')
+SQL_TRIGGERS = (
+    f"CREATE TRIGGER trg_registro_tiempo_ai AFTER INSERT ON registro_tiempo FOR EACH ROW "
+    f"BEGIN {_SUMAR_NEW}; END",
+    f"CREATE TRIGGER trg_registro_tiempo_au AFTER UPDATE ON registro_tiempo FOR EACH ROW "
+    f"BEGIN {_RESTAR_OLD}; {_PURGAR_OLD}; {_SUMAR_NEW}; END",
+    f"CREATE TRIGGER trg_registro_tiempo_ad AFTER DELETE ON registro_tiempo FOR EACH ROW "
+    f"BEGIN {_RESTAR_OLD}; {_PURGAR_OLD}; END",
+)
+
+AVISO_SIN_TRIGGERS = (
+    "Sin permiso para crear triggers (error 1419): con el log binario activo MySQL exige "
+    "el privilegio SUPER o log_bin_trust_function_creators=1. Mientras tanto RegistroTiempo "
+    "mantiene horas_diarias; para instalarlos después: python -m model.horas_diarias triggers"
+)
+
+# Sin triggers: registros nuevos ya agrupados por día (una fila por empleado, proyecto y fecha)
+_SQL_SUMAR = """
+    INSERT INTO horas_diarias (empleado_id, proyecto_id, fecha, horas, n_registros)
+    VALUES (%s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE horas = horas + VALUES(horas), n_registros = n_registros + VALUES(n_registros)
+"""
+
+SQL_VACIAR = "DELETE FROM horas_diarias"
+SQL_RELLENAR = """
+    INSERT INTO horas_diarias (empleado_id, proyecto_id, fecha, horas, n_registros)
+    SELECT empleado_id, proyecto_id, fecha, SUM(horas), COUNT(*)
+    FROM registro_tiempo
+    GROUP BY empleado_id, proyecto_id, fecha
+"""
+
+# Diferencias entre el acumulado y lo que dice registro_tiempo (en ambos sentidos)
+_SQL_DIFERENCIAS = """
+    SELECT r.empleado_id, r.proyecto_id, r.fecha,
+           r.horas AS horas_esperadas, r.n AS registros_esperados,
+           h.horas AS horas_acumuladas, h.n_registros AS registros_acumulados
+    FROM (
+        SELECT empleado_id, proyecto_id, fecha, SUM(horas) AS horas, COUNT(*) AS n
+        FROM registro_tiempo
+        GROUP BY empleado_id, proyecto_id, fecha
+    ) r
+    LEFT JOIN horas_diarias h
+           ON h.empleado_id = r.empleado_id AND h.proyecto_id = r.proyecto_id AND h.fecha = r.fecha
+    WHERE h.empleado_id IS NULL OR ROUND(h.horas, 2) <> ROUND(r.horas, 2) OR h.n_registros <> r.n
+    UNION ALL
+    SELECT h.empleado_id, h.proyecto_id, h.fecha, NULL, NULL, h.horas, h.n_registros
+    FROM horas_diarias h
+    WHERE NOT EXISTS (SELECT 1 FROM registro_tiempo r
+                      WHERE r.empleado_id = h.empleado_id AND r.proyecto_id = h.proyecto_id
+                        AND r.fecha = h.fecha)
+"""
+
+
+class HorasDiarias(BaseModel):
+    """Mantenimiento del acumulado: verificación y reconstrucción completa"""
+
+    REVISAR_TRIGGERS = 30.0  # segundos que vale un "no hay triggers" (un "sí" vale siempre)
+
+    _con_triggers = False
+    _revisado_en: Optional[float] = None
+
+    @classmethod
+    def mantenida_por_triggers(cls) -> bool:
+        """
+        ¿Existen los triggers de registro_tiempo? Se consulta el catálogo a lo sumo una
+        vez cada REVISAR_TRIGGERS segundos, no en cada escritura; una vez vistos no se
+        vuelve a mirar (nadie los borra). instalar_triggers() espera ese plazo antes
+        de reconstruir, así lo que otro proceso sumó de más mientras tanto se corrige.
+        """
+        ahora = time.monotonic()
+        if cls._con_triggers or (cls._revisado_en is not None and ahora - cls._revisado_en < cls.REVISAR_TRIGGERS):
+            return cls._con_triggers
+        try:
+            with cls.compartido().cursor(primario=True) as cursor:
+                cursor.execute(DatabaseConnection.get_dialecto().SQL_TRIGGERS_DE_TABLA, ('registro_tiempo',))
+                nombres = {f['nombre'] for f in cursor.fetchall()}
+        except Exception:
+            return cls._con_triggers  # sin respuesta de la base: no se decide nada nuevo
+        cls._con_triggers, cls._revisado_en = set(TRIGGERS) <= nombres, ahora
+        return cls._con_triggers
+
+    def sumar(self, registros: Iterable[tuple]) -> None:
+        """
+        Suma registros recién insertados (empleado_id, proyecto_id, fecha, horas) al
+        acumulado, un upsert por día. Llamar dentro de la transacción del INSERT.
+        """
+        por_dia: Dict[tuple, list] = {}
+        for empleado_id, proyecto_id, fecha, horas in registros:
+            acumulado = por_dia.setdefault((empleado_id, proyecto_id, fecha), [0.0, 0])
+            acumulado[0] += float(horas)
+            acumulado[1] += 1
+        if por_dia:
+            self.ejecutar_lote(_SQL_SUMAR, [(*clave, round(horas, 2), n) for clave, (horas, n) in por_dia.items()])
+
+    def instalar_triggers(self) -> Optional[int]:
+        """Crea los triggers que la migración 0004 no pudo crear y reconstruye el acumulado"""
+        dialecto = DatabaseConnection.get_dialecto()
+        try:
+            with self.pool.conexion() as conn:
+                with conn.cursor() as cursor:
+                    for sql in SQL_TRIGGERS:
+                        try:
+                            cursor.execute(dialecto.ddl(sql))
+                        except Exception as e:
+                            if not dialecto.objeto_ya_existe(e):
+                                raise
+                conn.commit()
+        except Exception as e:
+            print(f"❌ {AVISO_SIN_TRIGGERS if dialecto.sin_permiso_trigger(e) else e}")
+            return None
+        type(self)._con_triggers = True
+        if self.REVISAR_TRIGGERS:
+            print(f"⏳ Esperando {self.REVISAR_TRIGGERS:.0f}s a que los procesos en marcha vean los triggers...")
+            time.sleep(self.REVISAR_TRIGGERS)
+        return self.reconstruir()
+
+    def verificar(self) -> List[Dict]:
+        """Filas del acumulado que no cuadran con registro_tiempo (vacía = consistente)"""
+        return self.ejecutar(_SQL_DIFERENCIAS, primario=True) or []
+
+    @transaccional(si_falla=None)
+    def reconstruir(self) -> int:
+        """
+        Recalcula todo el acumulado en una transacción; devuelve cuántas filas quedaron.
+        En MySQL el INSERT ... SELECT bloquea registro_tiempo mientras tanto, así que
+        ningún registro concurrente se pierde ni se cuenta dos veces.
+        """
+        self.ejecutar(SQL_VACIAR)
+        self.ejecutar(SQL_RELLENAR)
+        return self.ejecutar("SELECT COUNT(*) AS filas FROM horas_diarias", fetch_one=True)['filas']
+
+
+def main(argumentos: List[str]) -> int:
+    accion = argumentos[0] if argumentos else 'verificar'
+    modelo = HorasDiarias.compartido()
+    if accion == 'reconstruir':
+        filas = modelo.reconstruir()
+        if filas is None:
+            return 1
+        print(f"✅ horas_diarias reconstruida: {filas} filas")
+        return 0
+    if accion == 'triggers':
+        filas = modelo.instalar_triggers()
+        if filas is None:
+            return 1
+        print(f"✅ Triggers instalados; horas_diarias reconstruida: {filas} filas")
+        return 0
+    if accion == 'verificar':
+        diferencias = modelo.verificar()
+        if not diferencias:
+            print("✅ horas_diarias consistente con registro_tiempo")
+            return 0
+        print(f"❌ {len(diferencias)} diferencias (python -m model.horas_diarias reconstruir):")
+        for d in diferencias[:20]:
+            print(f"   empleado {d['empleado_id']} proyecto {d['proyecto_id']} {d['fecha']}: "
+                  f"esperado {d['horas_esperadas']} h / {d['registros_esperados']} reg, "
+                  f"acumulado {d['horas_acumuladas']} h / {d['registros_acumulados']} reg")
+        return 1
+    print("Uso: python -m model.horas_diarias [verificar|reconstruir|triggers]")
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
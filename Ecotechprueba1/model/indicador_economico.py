@@ -1,6 +1,6 @@
 # model/indicador_economico.py - VERSIÓN CORREGIDA
 # API externa + persistencia + política de retención + nombres oficiales
-from model.base_model import BaseModel
+from model.base_model import BaseModel, cacheado
 from datetime import datetime, date, timedelta
 from typing import Optional, List, Dict, Any
 
@@ -28,6 +28,15 @@ class IndicadorEconomico(BaseModel):
         return codigo.lower().strip() in cls.CODIGOS_VALIDOS
 
     # ====================== GUARDAR / ACTUALIZAR ======================
+    _SQL_GUARDAR = """
+        INSERT INTO indicador_economico (codigo, nombre, fecha, valor, fuente)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            valor = VALUES(valor),
+            fuente = VALUES(fuente),
+            registrado_en = CURRENT_TIMESTAMP
+    """
+
     def guardar(self, codigo: str, fecha: str, valor: float, fuente: str = "https://mindicador.cl") -> bool:
         """
         Guarda o actualiza un valor de indicador.
@@ -47,17 +56,8 @@ class IndicadorEconomico(BaseModel):
 
         nombre = self.NOMBRES_OFICIALES[codigo]
 
-        query = """
-            INSERT INTO indicador_economico (codigo, nombre, fecha, valor, fuente)
-            VALUES (%s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-                valor = VALUES(valor),
-                fuente = VALUES(fuente),
-                registrado_en = CURRENT_TIMESTAMP
-        """
-        
         try:
-            resultado = self.ejecutar(query, (codigo, nombre, fecha, round(float(valor), 4), fuente))
+            resultado = self.ejecutar(self._SQL_GUARDAR, (codigo, nombre, fecha, round(float(valor), 4), fuente))
             
             if resultado:
                 print(f"✅ {nombre} → {fecha}: ${valor:,.4f} guardado correctamente")
@@ -70,6 +70,37 @@ class IndicadorEconomico(BaseModel):
             print(f"❌ Error al guardar indicador: {e}")
             return False
 
+    def guardar_lote(self, valores: List[Dict], fuente: str = "https://mindicador.cl",
+                     chunk_size: int = 500) -> List[Dict]:
+        """
+        Upsert masivo (p.ej. un año de valores): cada dict con codigo, fecha y valor.
+        Un INSERT multi-fila con ON DUPLICATE KEY UPDATE por bloque.
+        Devuelve un resultado por valor: {'ok', 'id', 'error'} (id no aplica en upsert).
+        """
+        def validar(v: Dict):
+            codigo = str(v.get('codigo', '')).lower().strip()
+            if codigo not in self.CODIGOS_VALIDOS:
+                return None, f"Indicador no soportado: {codigo}"
+            if not self._es_fecha_iso(v.get('fecha')):
+                return None, "Fecha inválida (debe ser YYYY-MM-DD)"
+            try:
+                valor = round(float(v['valor']), 4)
+            except (KeyError, TypeError, ValueError):
+                return None, "Valor inválido"
+            return (codigo, self.NOMBRES_OFICIALES[codigo], v['fecha'], valor,
+                    v.get('fuente') or fuente), None
+
+        return self._escribir_lote(self._SQL_GUARDAR, valores, validar, "Indicadores", chunk_size)
+
+    def guardar_consultados(self, valores: List[tuple], fuente: str = "https://mindicador.cl") -> List[Dict]:
+        """
+        Upsert sin mensajes de (codigo, fecha, valor) traídos de la API por
+        AlmacenIndicadores (corre en segundo plano: no debe escribir en la consola).
+        """
+        filas = [(codigo, self.NOMBRES_OFICIALES[codigo], fecha, round(float(valor), 4), fuente)
+                 for codigo, fecha, valor in valores]
+        return self.ejecutar_lote(self._SQL_GUARDAR, filas)
+
     # ====================== CONSULTAS ======================
     def obtener(self, codigo: str, fecha: str) -> Optional[Dict]:
         query = "SELECT * FROM indicador_economico WHERE codigo = %s AND fecha = %s"
@@ -107,6 +138,7 @@ class IndicadorEconomico(BaseModel):
         """
         return self.ejecutar(query, (codigo.lower(), dias)) or []
 
+    @cacheado('indicador_economico')
     def listar_todos_ultimos(self) -> List[Dict]:
         """Último valor de cada indicador (ideal para menú) - CORREGIDO"""
         try:
@@ -129,13 +161,9 @@ class IndicadorEconomico(BaseModel):
             if resultado is None:
                 return []
             
-            # Asegurar que todos los valores sean strings válidos
+            # nombre y fecha ya llegan como texto (NOT NULL, DATE_FORMAT); valor DECIMAL → float
             for item in resultado:
-                if item:
-                    item['nombre'] = str(item.get('nombre', 'Desconocido'))
-                    item['fecha'] = str(item.get('fecha', 'Sin fecha'))
-                    item['valor'] = float(item.get('valor', 0))
-                    
+                item['valor'] = float(item['valor'])
             return resultado
             
         except Exception as e:
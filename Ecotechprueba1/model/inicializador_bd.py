@@ -3,198 +3,144 @@
 INICIALIZADOR DE BASE DE DATOS
 Ubicado en model/ según tu estructura
 """
-import pymysql
-import bcrypt
+import threading
+import traceback
+from typing import Callable, List
 
 class InicializadorBDCompleto:
-    """Clase unificada para creación de BD, tablas y usuarios por defecto"""
+    """Creación de la BD y puesta al día del esquema (tablas, índices y usuarios por defecto)"""
     
     @staticmethod
-    def inicializar():
+    def inicializar(mostrar: Callable[[str], None] = print) -> bool:
         """
-        Método principal que ejecuta toda la inicialización
+        Método principal: crea la base si falta y aplica las migraciones pendientes
+        (model/migraciones.py). Nunca borra tablas; con el esquema al día es una consulta.
+        mostrar recibe los mensajes (print, o una lista si corre en segundo plano).
         Devuelve: True si éxito, False si error
         """
-        print("\n" + "═" * 50)
-        print("   INICIALIZACIÓN DE BASE DE DATOS")
-        print("═" * 50)
+        mostrar("\n" + "═" * 50)
+        mostrar("   INICIALIZACIÓN DE BASE DE DATOS")
+        mostrar("═" * 50)
         
         try:
-            # Configuración de conexión - AJUSTA ESTOS VALORES
-            config = {
-                'host': 'localhost',
-                'user': 'poosuser',      # Cambia según tu MySQL
-                'password': '12345678',   # Cambia según tu MySQL
-                'port': 8889,            # 3306 para XAMPP, 8889 para MAMP
-                'charset': 'utf8mb4'
-            }
-            
-            db_name = 'ecotech_solutions'
-            
-            print("🔌 Conectando a MySQL...")
-            # 1. Conectar a MySQL (sin especificar base de datos)
-            conn = pymysql.connect(**config)
-            cursor = conn.cursor()
-            
-            # 2. Crear base de datos si no existe
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
-            cursor.execute(f"USE {db_name}")
-            print(f"✅ Base de datos '{db_name}' lista")
-            
-            # 3. Crear todas las tablas
-            print("\n📋 Creando tablas...")
-            tablas_sql = InicializadorBDCompleto._obtener_sql_tablas()
-            
-            for tabla, sql in tablas_sql.items():
+            from config.database import DatabaseConnection
+            from model.migraciones import Migrador, MigracionAlterada
+            dialecto = DatabaseConnection.get_dialecto()
+            
+            # La conexión sale del pool compartido: queda caliente para el resto del sistema
+            try:
+                conn = DatabaseConnection.get_connection()
+            except ConnectionError:
+                if dialecto.nombre == 'sqlite':
+                    raise
+                InicializadorBDCompleto._crear_base_mysql(mostrar)
+                conn = DatabaseConnection.get_connection()
+            
+            with conn:
+                migrador = Migrador(conn, dialecto, mostrar=mostrar)
                 try:
-                    cursor.execute(f"DROP TABLE IF EXISTS {tabla}")
-                    cursor.execute(sql)
-                    print(f"   ✅ {tabla}")
-                except Exception as e:
-                    print(f"   ⚠️  {tabla}: {str(e)[:50]}")
-            
-            # 4. Insertar usuarios por defecto
-            print("\n👥 Creando usuarios por defecto...")
-            usuarios = [
-                ("admin", "admin123", "admin"),
-                ("rrhh", "rrhh123", "recursos_humanos"),
-                ("empleado1", "empleado123", "empleado")
-            ]
-            
-            for username, password, rol in usuarios:
-                password_hash = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-                cursor.execute("""
-                    INSERT IGNORE INTO usuario (username, password_hash, rol)
-                    VALUES (%s, %s, %s)
-                """, (username, password_hash, rol))
-            
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            print("\n✅ INICIALIZACIÓN COMPLETADA")
-            print("\n📋 CREDENCIALES:")
-            print("   admin / admin123")
-            print("   rrhh / rrhh123")
-            print("   empleado1 / empleado123")
-            print("═" * 50)
+                    aplicadas = migrador.migrar()
+                except MigracionAlterada as e:
+                    mostrar(f"\n❌ ESQUEMA INCONSISTENTE: {e}")
+                    mostrar("🔧 Agregue una migración nueva en lugar de modificar las ya aplicadas")
+                    return False
+            
+            if not aplicadas:
+                mostrar(f"✅ Esquema al día (versión {migrador.ultima_version})")
+                mostrar("═" * 50)
+                return True
+            
+            mostrar(f"\n✅ INICIALIZACIÓN COMPLETADA (versión {migrador.ultima_version})")
+            if any(m.nombre == 'usuarios_por_defecto' for m in aplicadas):
+                mostrar("\n📋 CREDENCIALES:")
+                mostrar("   admin / admin123")
+                mostrar("   rrhh / rrhh123")
+                mostrar("   empleado1 / empleado123")
+            mostrar("═" * 50)
             
             return True
             
-        except pymysql.err.OperationalError as e:
-            print(f"\n❌ ERROR DE CONEXIÓN: {e}")
-            print("\n🔧 SOLUCIONES:")
-            print("   1. Verifica que MySQL esté ejecutándose")
-            print("   2. Ajusta las credenciales en model/inicializador_bd.py")
-            print("   3. Si usas XAMPP, prueba con: user='root', password='', port=3306")
-            print("   4. Si usas MAMP, prueba con: user='root', password='root', port=8889")
+        except ConnectionError as e:
+            mostrar(f"\n❌ ERROR DE CONEXIÓN: {e}")
+            mostrar("\n🔧 SOLUCIONES:")
+            mostrar("   1. Verifica que MySQL esté ejecutándose")
+            mostrar("   2. Ajusta las credenciales en config/database.py")
+            mostrar("   3. Si usas XAMPP, prueba con: user='root', password='', port=3306")
+            mostrar("   4. Si usas MAMP, prueba con: user='root', password='root', port=8889")
             return False
         except Exception as e:
-            print(f"\n❌ ERROR: {e}")
-            traceback.print_exc()
+            mostrar(f"\n❌ ERROR: {e}")
+            mostrar(traceback.format_exc())
             return False
     
     @staticmethod
-    def _obtener_sql_tablas():
-        """Retorna el SQL para crear todas las tablas"""
-        return {
-            'usuario': """
-                CREATE TABLE usuario (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    username VARCHAR(50) UNIQUE NOT NULL,
-                    password_hash VARCHAR(255) NOT NULL,
-                    rol VARCHAR(20) NOT NULL DEFAULT 'empleado',
-                    creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'departamento': """
-                CREATE TABLE departamento (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nombre VARCHAR(100) NOT NULL,
-                    gerente_id INT NULL
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'empleado': """
-                CREATE TABLE empleado (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nombre VARCHAR(100) NOT NULL,
-                    direccion VARCHAR(200),
-                    telefono VARCHAR(20),
-                    email VARCHAR(100) NOT NULL,
-                    fecha_contratacion DATE NOT NULL,
-                    salario DECIMAL(10, 2) DEFAULT 0,
-                    departamento_id INT,
-                    usuario_id INT,
-                    FOREIGN KEY (departamento_id) REFERENCES departamento(id) ON DELETE SET NULL,
-                    FOREIGN KEY (usuario_id) REFERENCES usuario(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'proyecto': """
-                CREATE TABLE proyecto (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    nombre VARCHAR(100) NOT NULL,
-                    descripcion TEXT,
-                    fecha_inicio DATE NOT NULL,
-                    estado VARCHAR(20) DEFAULT 'activo'
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'asignacion_proyecto': """
-                CREATE TABLE asignacion_proyecto (
-                    empleado_id INT,
-                    proyecto_id INT,
-                    PRIMARY KEY (empleado_id, proyecto_id),
-                    FOREIGN KEY (empleado_id) REFERENCES empleado(id) ON DELETE CASCADE,
-                    FOREIGN KEY (proyecto_id) REFERENCES proyecto(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'registro_tiempo': """
-                CREATE TABLE registro_tiempo (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    empleado_id INT NOT NULL,
-                    proyecto_id INT NOT NULL,
-                    fecha DATE NOT NULL,
-                    horas DECIMAL(5,2) NOT NULL,
-                    descripcion TEXT,
-                    FOREIGN KEY (empleado_id) REFERENCES empleado(id) ON DELETE CASCADE,
-                    FOREIGN KEY (proyecto_id) REFERENCES proyecto(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'indicador_economico': """
-                CREATE TABLE indicador_economico (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    codigo VARCHAR(20) NOT NULL,
-                    nombre VARCHAR(100) NOT NULL,
-                    fecha DATE NOT NULL,
-                    valor DECIMAL(20, 4) NOT NULL,
-                    fuente VARCHAR(200) DEFAULT 'https://mindicador.cl',
-                    registrado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE KEY unq_codigo_fecha (codigo, fecha)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """,
-            
-            'consulta_indicador': """
-                CREATE TABLE consulta_indicador (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    usuario_id INT NOT NULL,
-                    indicador_codigo VARCHAR(20) NOT NULL,
-                    fecha_indicador DATE NOT NULL,
-                    valor DECIMAL(20, 4) NOT NULL,
-                    guardado BOOLEAN DEFAULT 0,
-                    fecha_consulta TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (usuario_id) REFERENCES usuario(id) ON DELETE CASCADE
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """
-        }
+    def _crear_base_mysql(mostrar: Callable[[str], None] = print) -> None:
+        """Primera ejecución en MySQL: crea la base de datos vacía"""
+        import pymysql
+        from config.database import DatabaseConnection
+        config = {k: v for k, v in DatabaseConnection._config.items() if k != 'database'}
+        db_name = DatabaseConnection._config['database']
+        
+        mostrar("🔌 Conectando a MySQL...")
+        try:
+            conn = pymysql.connect(**config)
+        except pymysql.err.OperationalError as e:
+            raise ConnectionError(str(e)) from e
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f"CREATE DATABASE IF NOT EXISTS {db_name} CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+        finally:
+            conn.close()
+        mostrar(f"✅ Base de datos '{db_name}' lista")
+    
+    @staticmethod
+    def en_segundo_plano() -> 'ArranqueEnSegundoPlano':
+        """Inicializa y calienta la conexión en otro hilo (mientras se escribe el login)"""
+        return ArranqueEnSegundoPlano()
+
+class ArranqueEnSegundoPlano:
+    """
+    Corre la inicialización en un hilo aparte junto con lo que la sesión usará
+    enseguida (bcrypt, pool caliente, módulos del menú). Los mensajes se guardan
+    y se muestran en esperar(), para no mezclarse con el prompt de login.
+    """
+    
+    def __init__(self):
+        self.mensajes: List[str] = []
+        self.ok = None
+        self._hilo = threading.Thread(target=self._correr, name='ecotech-arranque', daemon=True)
+        self._hilo.start()
+    
+    def _correr(self) -> None:
+        try:
+            self.ok = InicializadorBDCompleto.inicializar(mostrar=self.mensajes.append)
+            if self.ok:
+                from config.database import DatabaseConnection
+                DatabaseConnection.get_pool().calentar()
+                from model.bus_invalidacion import BusInvalidacion
+                BusInvalidacion.iniciar()  # cachés al tanto de lo que escriben otras instancias
+                import bcrypt  # noqa: F401 – lo necesita la verificación de la contraseña
+                import view.menu_consola  # noqa: F401 – primer menú tras el login
+        except Exception as e:
+            self.mensajes.append(f"❌ ERROR: {e}")
+            self.ok = False if self.ok is None else self.ok
+    
+    def listo(self) -> bool:
+        return not self._hilo.is_alive()
+    
+    def esperar(self) -> bool:
+        """Bloquea hasta terminar, muestra los mensajes pendientes y devuelve si la BD quedó lista"""
+        if not self.listo():
+            print("⏳ Esperando a la base de datos...")
+        self._hilo.join()
+        for mensaje in self.mensajes:
+            print(mensaje)
+        self.mensajes.clear()
+        return bool(self.ok)
+
 
 # Si se ejecuta directamente
 if __name__ == "__main__":
-    import traceback
     if InicializadorBDCompleto.inicializar():
         print("\n✅ Base de datos lista. Ejecuta 'python main.py' para iniciar.")
     else:
@@ -0,0 +1,170 @@
+# model/instrumentacion.py - Métricas por sentencia SQL y log de consultas lentas
+import bisect
+import os
+import sys
+import threading
+from typing import Dict, List, Any
+
+# Límites superiores (ms) de los buckets del histograma: escala geométrica 0.05 ms → ~70 s
+_BUCKETS_MS = [0.05 * 1.25 ** i for i in range(64)]
+
+
+class EstadisticaSentencia:
+    """Acumulados de una sentencia normalizada (histograma de latencia de tamaño fijo)"""
+
+    __slots__ = ('sentencia', 'llamadas', 'errores', 'filas', 'total_ms', 'max_ms', 'buckets')
+
+    def __init__(self, sentencia: str):
+        self.sentencia = sentencia
+        self.llamadas = 0
+        self.errores = 0
+        self.filas = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(_BUCKETS_MS) + 1)
+
+    def agregar(self, ms: float, filas: int, error: bool) -> None:
+        self.llamadas += 1
+        self.filas += filas
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+        if error:
+            self.errores += 1
+        self.buckets[bisect.bisect_left(_BUCKETS_MS, ms)] += 1
+
+    def percentil(self, p: float) -> float:
+        """Cota superior del bucket que contiene el percentil p (0-100)"""
+        objetivo = self.llamadas * p / 100.0
+        acumulado = 0
+        for i, n in enumerate(self.buckets):
+            acumulado += n
+            if n and acumulado >= objetivo:
+                return min(_BUCKETS_MS[i], self.max_ms) if i < len(_BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            'sentencia': self.sentencia,
+            'llamadas': self.llamadas,
+            'errores': self.errores,
+            'filas': self.filas,
+            'total_ms': round(self.total_ms, 3),
+            'promedio_ms': round(self.total_ms / self.llamadas, 3) if self.llamadas else 0.0,
+            'p50_ms': round(self.percentil(50), 3),
+            'p95_ms': round(self.percentil(95), 3),
+            'p99_ms': round(self.percentil(99), 3),
+            'max_ms': round(self.max_ms, 3)
+        }
+
+
+class Instrumentacion:
+    """
+    Instrumentación opcional de BaseModel. Desactivada, el costo por consulta
+    es leer Instrumentacion.activa; activada registra conteos, filas, errores
+    y percentiles por sentencia, y escribe las lentas en un log aparte.
+    """
+
+    activa = os.environ.get('ECOTECH_SQL_STATS', '') == '1'
+    umbral_lento_ms = 200.0
+
+    _stats: Dict[str, EstadisticaSentencia] = {}
+    _lock = threading.Lock()
+    _log_lento = None  # logging se importa recién al activar (no pesa en el arranque)
+    _handler = None
+    archivo = 'consultas_lentas.log'  # None: sin archivo propio (lo decide la config de logging)
+
+    # Módulos internos que se saltan al buscar el método del modelo que llamó
+    _ARCHIVOS_INTERNOS = ('base_model.py', 'instrumentacion.py', 'contextlib.py')
+
+    @classmethod
+    def activar(cls, umbral_ms: float = None, archivo: str = 'consultas_lentas.log') -> None:
+        if umbral_ms is not None:
+            cls.umbral_lento_ms = float(umbral_ms)
+        cls.archivo = archivo
+        cls._logger()
+        cls.activa = True
+
+    @classmethod
+    def desactivar(cls) -> None:
+        cls.activa = False
+
+    @classmethod
+    def registrar(cls, query, segundos: float, filas: int = 0, params=None, error: bool = False) -> None:
+        ms = segundos * 1000.0
+        clave = query.normalizada
+        with cls._lock:
+            stat = cls._stats.get(clave)
+            if stat is None:
+                stat = cls._stats[clave] = EstadisticaSentencia(clave)
+            stat.agregar(ms, filas, error)
+
+        if ms >= cls.umbral_lento_ms:
+            cls._logger().warning(
+                "%.1f ms | %s | %s | params=%s%s",
+                ms, cls._llamador(), clave, cls._redactar(params), " | ERROR" if error else ""
+            )
+
+    @classmethod
+    def volcar(cls, orden: str = 'total_ms') -> List[Dict[str, Any]]:
+        """Estadísticas por sentencia, de la más costosa a la menos"""
+        with cls._lock:
+            filas = [s.a_dict() for s in cls._stats.values()]
+        return sorted(filas, key=lambda f: f[orden], reverse=True)
+
+    @classmethod
+    def reiniciar(cls) -> None:
+        with cls._lock:
+            cls._stats.clear()
+
+    # ====================== AUXILIARES ======================
+    @classmethod
+    def _logger(cls):
+        """
+        Logger de consultas lentas con su archivo. Se arma en el primer uso también
+        cuando se activó por ECOTECH_SQL_STATS=1 (sin pasar por activar()): sin
+        handler propio los avisos irían a stderr, en medio del menú de la consola.
+        """
+        if cls._log_lento is None:
+            import logging
+            cls._log_lento = logging.getLogger('ecotech.consultas_lentas')
+        if cls.archivo and cls._handler is None:
+            import logging
+            with cls._lock:
+                if cls._handler is None:
+                    try:
+                        handler = logging.FileHandler(cls.archivo, encoding='utf-8')
+                    except OSError:
+                        handler = logging.NullHandler()  # sin permiso de escritura: mejor callar que ensuciar la consola
+                    handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+                    cls._log_lento.addHandler(handler)
+                    cls._log_lento.setLevel(logging.INFO)
+                    cls._log_lento.propagate = False
+                    cls._handler = handler
+        return cls._log_lento
+
+    @staticmethod
+    def _redactar(params) -> str:
+        """Solo los tipos de los parámetros, nunca sus valores"""
+        if params is None:
+            return "()"
+        if isinstance(params, dict):
+            return "{" + ", ".join(f"{k}: {type(v).__name__}" for k, v in params.items()) + "}"
+        if isinstance(params, (list, tuple)):
+            return "(" + ", ".join(type(v).__name__ for v in params) + ")"
+        return type(params).__name__
+
+    @classmethod
+    def _llamador(cls) -> str:
+        """Clase.método del modelo que originó la consulta (solo en el camino lento)"""
+        frame = sys._getframe(2)
+        while frame is not None:
+            archivo = os.path.basename(frame.f_code.co_filename)
+            if archivo not in cls._ARCHIVOS_INTERNOS:
+                dueño = frame.f_locals.get('self') or frame.f_locals.get('cls')
+                if dueño is not None:
+                    nombre = dueño.__name__ if isinstance(dueño, type) else type(dueño).__name__
+                    return f"{nombre}.{frame.f_code.co_name}"
+                return f"{archivo}:{frame.f_code.co_name}"
+            frame = frame.f_back
+        return "desconocido"
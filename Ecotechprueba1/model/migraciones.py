@@ -0,0 +1,254 @@
+# model/migraciones.py - Migraciones numeradas del esquema con control de versión
+import hashlib
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from config.dialecto import Dialecto
+from model import bus_invalidacion, carga_historica, horas_diarias
+
+
+class MigracionAlterada(Exception):
+    """Una migración ya aplicada cambió de contenido (checksum distinto)"""
+
+
+class Migracion(NamedTuple):
+    version: int
+    nombre: str
+    sentencias: Tuple[str, ...] = ()
+    funcion: Optional[Callable] = None  # pasos que no son SQL fijo (p.ej. datos con hash)
+
+    @property
+    def checksum(self) -> str:
+        contenido = [self.nombre] + [' '.join(s.split()) for s in self.sentencias]
+        if self.funcion is not None:
+            contenido.append(self.funcion.__name__)
+        return hashlib.sha256('\n'.join(contenido).encode()).hexdigest()
+
+
+def _usuarios_por_defecto(cursor) -> None:
+    # Una base adoptada que ya tiene usuarios no necesita semillas (ni pagar el hash)
+    cursor.execute("SELECT 1 FROM usuario LIMIT 1")
+    if cursor.fetchone():
+        return
+    from model.usuario import _hash_password
+    usuarios = [
+        ("admin", "admin123", "admin"),
+        ("rrhh", "rrhh123", "recursos_humanos"),
+        ("empleado1", "empleado123", "empleado")
+    ]
+    for username, password, rol in usuarios:
+        password_hash = _hash_password(password)
+        cursor.execute("""
+            INSERT IGNORE INTO usuario (username, password_hash, rol)
+            VALUES (%s, %s, %s)
+        """, (username, password_hash, rol))
+
+
+# Esquema de la versión 1, congelado: su checksum ya está registrado en las bases
+# existentes. IF NOT EXISTS adopta las bases creadas por versiones anteriores sin
+# tocar sus datos. SQLite recibe la traducción de Dialecto.ddl() al aplicarse.
+_SQL_ESQUEMA_INICIAL = (
+    """
+    CREATE TABLE IF NOT EXISTS usuario (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        username VARCHAR(50) UNIQUE NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        rol VARCHAR(20) NOT NULL DEFAULT 'empleado',
+        creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS departamento (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(100) NOT NULL,
+        gerente_id INT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS empleado (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(100) NOT NULL,
+        direccion VARCHAR(200),
+        telefono VARCHAR(20),
+        email VARCHAR(100) NOT NULL,
+        fecha_contratacion DATE NOT NULL,
+        salario DECIMAL(10, 2) DEFAULT 0,
+        departamento_id INT,
+        usuario_id INT,
+        FOREIGN KEY (departamento_id) REFERENCES departamento(id) ON DELETE SET NULL,
+        FOREIGN KEY (usuario_id) REFERENCES usuario(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS proyecto (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        nombre VARCHAR(100) NOT NULL,
+        descripcion TEXT,
+        fecha_inicio DATE NOT NULL,
+        estado VARCHAR(20) DEFAULT 'activo'
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS asignacion_proyecto (
+        empleado_id INT,
+        proyecto_id INT,
+        PRIMARY KEY (empleado_id, proyecto_id),
+        FOREIGN KEY (empleado_id) REFERENCES empleado(id) ON DELETE CASCADE,
+        FOREIGN KEY (proyecto_id) REFERENCES proyecto(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS registro_tiempo (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        empleado_id INT NOT NULL,
+        proyecto_id INT NOT NULL,
+        fecha DATE NOT NULL,
+        horas DECIMAL(5,2) NOT NULL,
+        descripcion TEXT,
+        FOREIGN KEY (empleado_id) REFERENCES empleado(id) ON DELETE CASCADE,
+        FOREIGN KEY (proyecto_id) REFERENCES proyecto(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS indicador_economico (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        codigo VARCHAR(20) NOT NULL,
+        nombre VARCHAR(100) NOT NULL,
+        fecha DATE NOT NULL,
+        valor DECIMAL(20, 4) NOT NULL,
+        fuente VARCHAR(200) DEFAULT 'https://mindicador.cl',
+        registrado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE KEY unq_codigo_fecha (codigo, fecha)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS consulta_indicador (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        usuario_id INT NOT NULL,
+        indicador_codigo VARCHAR(20) NOT NULL,
+        fecha_indicador DATE NOT NULL,
+        valor DECIMAL(20, 4) NOT NULL,
+        guardado BOOLEAN DEFAULT 0,
+        fecha_consulta TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (usuario_id) REFERENCES usuario(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """,
+)
+
+
+# ====================== MIGRACIONES ======================
+# Nunca editar una migración ya publicada: agregar una nueva con el siguiente número.
+MIGRACIONES: List[Migracion] = [
+    Migracion(1, 'esquema_inicial', _SQL_ESQUEMA_INICIAL),
+    Migracion(2, 'indices_secundarios', (
+        "CREATE INDEX idx_registro_empleado_fecha ON registro_tiempo (empleado_id, fecha)",
+        "CREATE INDEX idx_registro_proyecto ON registro_tiempo (proyecto_id)",
+        "CREATE INDEX idx_consulta_usuario_fecha ON consulta_indicador (usuario_id, fecha_consulta)",
+        "CREATE INDEX idx_consulta_indicador ON consulta_indicador (indicador_codigo)",
+        "CREATE INDEX idx_empleado_email ON empleado (email)",
+    )),
+    Migracion(3, 'usuarios_por_defecto', funcion=_usuarios_por_defecto),
+    # Acumulado por empleado/proyecto/día mantenido por triggers; se rellena después de
+    # crearlos para no perder registros que entren mientras tanto. Sin permiso para
+    # crearlos (1419) la migración sigue y el acumulado lo mantiene RegistroTiempo
+    Migracion(4, 'horas_diarias', (
+        horas_diarias.SQL_TABLA,
+        *horas_diarias.SQL_TRIGGERS,
+        horas_diarias.SQL_VACIAR,
+        horas_diarias.SQL_RELLENAR,
+    )),
+    # Registro de cambios que leen los demás procesos para invalidar sus cachés
+    Migracion(5, 'cambio_cache', (
+        bus_invalidacion.SQL_TABLA,
+        bus_invalidacion.SQL_INDICE,
+    )),
+    # Marca de avance por indicador de la carga masiva de series anuales
+    Migracion(6, 'carga_indicador', (carga_historica.SQL_TABLA,)),
+]
+
+_SQL_SCHEMA_VERSION = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        nombre VARCHAR(100) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        aplicada_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+
+class Migrador:
+    """
+    Lleva la base a la última migración. Con el esquema al día cuesta una sola
+    consulta (versiones y checksums aplicados); solo si falta algo se crean
+    schema_version y se aplican las pendientes en orden.
+    """
+
+    def __init__(self, conn, dialecto: Dialecto, migraciones: List[Migracion] = None,
+                 mostrar: Callable[[str], None] = print):
+        self.conn = conn
+        self.dialecto = dialecto
+        self.mostrar = mostrar
+        self.migraciones = sorted(migraciones or MIGRACIONES, key=lambda m: m.version)
+
+    @property
+    def ultima_version(self) -> int:
+        return self.migraciones[-1].version if self.migraciones else 0
+
+    def aplicadas(self) -> Optional[Dict[int, str]]:
+        """{versión: checksum} registradas, o None si schema_version todavía no existe"""
+        try:
+            with self.conn.cursor() as cursor:
+                cursor.execute("SELECT version, checksum FROM schema_version ORDER BY version")
+                return {fila['version']: fila['checksum'] for fila in cursor.fetchall()}
+        except Exception:
+            self.conn.rollback()
+            return None
+
+    def migrar(self) -> List[Migracion]:
+        """Aplica las pendientes; devuelve las que aplicó (vacía si ya estaba al día)"""
+        aplicadas = self.aplicadas()
+        self._verificar(aplicadas or {})
+        pendientes = [m for m in self.migraciones if m.version not in (aplicadas or {})]
+        if not pendientes:
+            return []
+
+        with self.conn.cursor() as cursor:
+            if aplicadas is None:
+                cursor.execute(self.dialecto.ddl(_SQL_SCHEMA_VERSION))
+            for migracion in pendientes:
+                self._aplicar(cursor, migracion)
+                self.mostrar(f"   ✅ Migración {migracion.version:04d} {migracion.nombre}")
+        return pendientes
+
+    def _verificar(self, aplicadas: Dict[int, str]) -> None:
+        por_version = {m.version: m for m in self.migraciones}
+        for version, checksum in aplicadas.items():
+            migracion = por_version.get(version)
+            if migracion is None:
+                raise MigracionAlterada(f"La base tiene la migración {version}, desconocida para este código")
+            if migracion.checksum != checksum:
+                raise MigracionAlterada(
+                    f"La migración {version:04d} {migracion.nombre} cambió después de aplicarse"
+                )
+
+    def _aplicar(self, cursor, migracion: Migracion) -> None:
+        sin_triggers = False
+        for sql in migracion.sentencias:
+            try:
+                cursor.execute(self.dialecto.ddl(sql))
+            except Exception as e:
+                if self.dialecto.sin_permiso_trigger(e):
+                    # Sin triggers el acumulado lo mantiene RegistroTiempo (ver model/horas_diarias.py)
+                    if not sin_triggers:
+                        self.mostrar(f"   ⚠️  {horas_diarias.AVISO_SIN_TRIGGERS}")
+                    sin_triggers = True
+                    continue
+                # Reintento tras una migración a medias (MySQL no tiene CREATE INDEX IF NOT EXISTS)
+                if not self.dialecto.objeto_ya_existe(e):
+                    raise
+        if migracion.funcion is not None:
+            migracion.funcion(cursor)
+        cursor.execute(
+            "INSERT INTO schema_version (version, nombre, checksum) VALUES (%s, %s, %s)",
+            (migracion.version, migracion.nombre, migracion.checksum)
+        )
+        self.conn.commit()
@@ -1,8 +1,23 @@
 # model/proyecto.py - Corregido
-from model.base_model import BaseModel
-from model.empleado import Empleado
+from model.base_model import BaseModel, transaccional
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator, NamedTuple, Sequence
+
+
+class Asignado(NamedTuple):
+    """Empleado de un proyecto en la fila de buscar_por_id (inmutable: se comparte con la caché)"""
+    id: int
+    nombre: str
+
+
+_SQL_ASIGNADOS = """
+    SELECT ap.proyecto_id AS _clave, e.id, e.nombre
+    FROM asignacion_proyecto ap
+    JOIN empleado e ON e.id = ap.empleado_id
+    WHERE ap.proyecto_id IN ({ids})
+    ORDER BY e.nombre, e.id
+"""
+
 
 class Proyecto(BaseModel):
     """Modelo Proyecto optimizado"""
@@ -30,61 +45,90 @@ class Proyecto(BaseModel):
             print(f"✅ Proyecto '{nombre}' creado (ID: {proyecto_id})")
         return proyecto_id
     
-    def listar(self, incluir_empleados: bool = False) -> List[Dict]:
-        """Listar optimizado - incluir_empleados es opcional para mejor performance"""
-        if incluir_empleados:
-            query = """
-                SELECT p.*, 
-                       GROUP_CONCAT(e.nombre SEPARATOR ', ') AS empleados_asignados
-                FROM proyecto p
-                LEFT JOIN asignacion_proyecto ap ON p.id = ap.proyecto_id
-                LEFT JOIN empleado e ON ap.empleado_id = e.id
-                GROUP BY p.id
-                ORDER BY p.fecha_inicio DESC
-            """
-        else:
-            query = "SELECT * FROM proyecto ORDER BY fecha_inicio DESC, nombre"
-        
-        return self.ejecutar(query) or []
+    _SQL_LISTAR = "SELECT * FROM proyecto ORDER BY fecha_inicio DESC, nombre"
     
-    def buscar_por_id(self, proyecto_id: int) -> Optional[Dict]:
-        query = """
-            SELECT p.*,
-                   GROUP_CONCAT(e.id) AS empleados_ids,
-                   GROUP_CONCAT(e.nombre SEPARATOR ', ') AS empleados_nombres
-            FROM proyecto p
-            LEFT JOIN asignacion_proyecto ap ON p.id = ap.proyecto_id
-            LEFT JOIN empleado e ON ap.empleado_id = e.id
-            WHERE p.id = %s
-            GROUP BY p.id
+    def listar(self, incluir_empleados: bool = False, columnas: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        incluir_empleados=True agrega a cada proyecto 'empleados' (lista completa) y
+        'empleados_asignados' (nombres separados por coma): una consulta más en total
+        """
+        if columnas:
+            return self._proyectar('proyecto', columnas, orden='fecha_inicio DESC, nombre')
+        proyectos = self.ejecutar(self._SQL_LISTAR) or []
+        return self.con_empleados(proyectos) if incluir_empleados else proyectos
+    
+    def con_empleados(self, proyectos: List[Dict]) -> List[Dict]:
+        """
+        Agrega los empleados de cada proyecto con el cargador del alcance actual: una
+        consulta IN por bloque, sin GROUP_CONCAT (que MySQL corta en group_concat_max_len)
+        """
+        from model.cargador import Cargadores
+        listas = Cargadores.actual().empleados_de_proyecto.cargar_varios(p['id'] for p in proyectos)
+        for proyecto, empleados in zip(proyectos, listas):
+            proyecto['empleados'] = list(empleados)
+            proyecto['empleados_asignados'] = ', '.join(e['nombre'] for e in empleados) or None
+        return proyectos
+    
+    def pagina(self, after: Optional[str] = None, limit: int = 20) -> Dict:
+        """Página por (fecha_inicio, id) descendente: {'filas': [...], 'siguiente': cursor o None}"""
+        return self._pagina("SELECT p.* FROM proyecto p", [], [],
+                            (("p.fecha_inicio", "fecha_inicio"), ("p.id", "id")),
+                            descendente=True, after=after, limit=limit)
+    
+    def iter_listar(self, incluir_empleados: bool = False, tamano_lote: int = None) -> Iterator[Dict]:
+        """Como listar(), pero en streaming (memoria constante); empleados por lote de filas"""
+        filas = self.iterar(self._SQL_LISTAR, tamano_lote=tamano_lote)
+        if not incluir_empleados:
+            return filas
+        return self._iter_con_empleados(filas, tamano_lote or self.TAMANO_LOTE)
+    
+    def _iter_con_empleados(self, filas: Iterable[Dict], tamano_lote: int) -> Iterator[Dict]:
+        lote = []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= tamano_lote:
+                yield from self.con_empleados(lote)
+                lote = []
+        if lote:
+            yield from self.con_empleados(lote)
+    
+    # buscar_por_id / buscar_por_ids (BaseModel, con CacheEntidades); con columnas=(...)
+    # solo esas columnas de proyecto, sin los asignados
+    TABLA = 'proyecto'
+    _SQL_POR_IDS = "SELECT p.* FROM proyecto p WHERE p.id IN ({ids})"
+    
+    def _completar(self, cursor, filas: List[Dict]) -> None:
+        """
+        'asignados': tupla de Asignado(id, nombre); empleados_ids / empleados_nombres se
+        mantienen como texto (antes salían de GROUP_CONCAT) para quien los muestre tal cual
         """
-        return self.ejecutar(query, (proyecto_id,), fetch_one=True)
+        from model.asignacion_proyecto import agrupar
+        ids = [f['id'] for f in filas]
+        grupos = {}
+        for inicio in range(0, len(ids), self.TAMANO_IN):
+            bloque = ids[inicio:inicio + self.TAMANO_IN]
+            cursor.execute(_SQL_ASIGNADOS.format(ids=', '.join(['%s'] * len(bloque))), tuple(bloque))
+            grupos.update(agrupar(cursor.fetchall()))
+        for fila in filas:
+            asignados = tuple(Asignado(e['id'], e['nombre']) for e in grupos.get(fila['id'], ()))
+            fila['asignados'] = asignados
+            fila['empleados_ids'] = ','.join(str(a.id) for a in asignados) or None
+            fila['empleados_nombres'] = ', '.join(a.nombre for a in asignados) or None
     
     def actualizar(self, proyecto_id: int, **campos) -> bool:
         if not campos:
             return False
-        
-        sets = []
-        valores = []
-        for campo, valor in campos.items():
-            if campo in ['nombre', 'descripcion', 'fecha_inicio', 'estado']:
-                sets.append(f"{campo} = %s")
-                valores.append(valor)
-        
-        if not sets:
-            return False
-        
-        valores.append(proyecto_id)
-        query = f"UPDATE proyecto SET {', '.join(sets)} WHERE id = %s"
-        return bool(self.ejecutar(query, tuple(valores)))
+        return self._actualizar_campos('proyecto', proyecto_id, campos,
+                                       ('nombre', 'descripcion', 'fecha_inicio', 'estado'))
     
+    @transaccional()
     def asignar_empleado(self, proyecto_id: int, empleado_id: int) -> bool:
         # Verificar existencia
-        if not Empleado().buscar_por_id(empleado_id):
+        if not self.existe('empleado', empleado_id):
             print(f"❌ Empleado ID {empleado_id} no existe")
             return False
         
-        if not self.buscar_por_id(proyecto_id):
+        if not self.existe('proyecto', proyecto_id):
             print(f"❌ Proyecto ID {proyecto_id} no existe")
             return False
         
@@ -95,8 +139,9 @@ class Proyecto(BaseModel):
         query = "DELETE FROM asignacion_proyecto WHERE empleado_id = %s AND proyecto_id = %s"
         return bool(self.ejecutar(query, (empleado_id, proyecto_id)))
     
+    @transaccional()
     def eliminar(self, proyecto_id: int) -> bool:
-        if not self.buscar_por_id(proyecto_id):
+        if not self.existe('proyecto', proyecto_id):
             print("❌ Proyecto no encontrado")
             return False
         
@@ -104,11 +149,5 @@ class Proyecto(BaseModel):
         return bool(self.ejecutar(query, (proyecto_id,)))
     
     def empleados_en_proyecto(self, proyecto_id: int) -> List[Dict]:
-        query = """
-            SELECT e.*
-            FROM empleado e
-            JOIN asignacion_proyecto ap ON e.id = ap.empleado_id
-            WHERE ap.proyecto_id = %s
-            ORDER BY e.nombre
-        """
-        return self.ejecutar(query, (proyecto_id,)) or []
\ No newline at end of file
+        from model.asignacion_proyecto import AsignacionProyecto
+        return AsignacionProyecto.compartido().empleados_del_proyecto(proyecto_id)
\ No newline at end of file
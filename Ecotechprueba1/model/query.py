@@ -0,0 +1,179 @@
+# model/query.py - Consultas precompiladas y caché de sentencias
+import re
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+# Columnas conocidas por tabla → lista blanca para identificadores dinámicos
+ESQUEMA = {
+    'usuario': ('id', 'username', 'password_hash', 'rol', 'creado_en'),
+    'departamento': ('id', 'nombre', 'gerente_id'),
+    'empleado': ('id', 'nombre', 'direccion', 'telefono', 'email', 'fecha_contratacion',
+                 'salario', 'departamento_id', 'usuario_id'),
+    'proyecto': ('id', 'nombre', 'descripcion', 'fecha_inicio', 'estado'),
+    'asignacion_proyecto': ('empleado_id', 'proyecto_id'),
+    'registro_tiempo': ('id', 'empleado_id', 'proyecto_id', 'fecha', 'horas', 'descripcion'),
+    'horas_diarias': ('empleado_id', 'proyecto_id', 'fecha', 'horas', 'n_registros'),
+    'indicador_economico': ('id', 'codigo', 'nombre', 'fecha', 'valor', 'fuente', 'registrado_en'),
+    'consulta_indicador': ('id', 'usuario_id', 'indicador_codigo', 'fecha_indicador', 'valor',
+                           'guardado', 'fecha_consulta'),
+    'cambio_cache': ('id', 'tabla', 'fila_id', 'insercion', 'origen', 'publicado'),
+    'carga_indicador': ('codigo', 'desde', 'hasta', 'valores', 'actualizado'),
+}
+
+# Caché de sentencias por texto (dict simple: la búsqueda cuesta un hash ya memorizado)
+_CACHE = {}
+_CACHE_MAX = 1024
+
+_RE_NOMBRADO = re.compile(r'%\((\w+)\)s')
+# INSERT ... VALUES (...) [ON DUPLICATE KEY UPDATE ...] → prefijo, tupla de valores, sufijo
+_RE_INSERT_VALUES = re.compile(
+    r'^(\s*(?:INSERT|REPLACE)\b.+?\bVALUES\s*)(\((?:[^()]|%\(\w+\)s)*\))(\s*(?:ON\s+DUPLICATE\b.*)?);?\s*$',
+    re.IGNORECASE | re.DOTALL
+)
+_RE_POSICIONAL = re.compile(r'(?<!%)%s')
+# Tabla que modifica una escritura (para invalidar cachés)
+_RE_TABLA_ESCRITA = re.compile(
+    r'^\s*(?:(?:INSERT|REPLACE)(?:\s+IGNORE)?(?:\s+INTO)?|UPDATE|DELETE\s+FROM)\s+`?(\w+)',
+    re.IGNORECASE
+)
+# UPDATE/DELETE de una sola fila por clave primaria (para invalidar solo esa fila)
+_RE_POR_ID = re.compile(r'\bWHERE\s+(?:\w+\.)?id\s*=\s*%s', re.IGNORECASE)
+_RE_OR = re.compile(r'\bOR\b', re.IGNORECASE)
+# Normalización para agrupar métricas: listas IN y tuplas VALUES repetidas colapsan
+_RE_LISTA_IN = re.compile(r'\bIN\s*\(\s*%s(?:\s*,\s*%s)*\s*\)', re.IGNORECASE)
+_RE_TUPLAS_REPETIDAS = re.compile(r'(\([^()]*\))(?:\s*,\s*\1)+')
+
+
+class Query:
+    """
+    Sentencia SQL analizada una sola vez: tipo y forma de parámetros se
+    conocen de antemano, así ejecutar() no vuelve a tocar el texto.
+    """
+
+    LECTURA = 'lectura'
+    INSERCION = 'insercion'
+    MODIFICACION = 'modificacion'  # UPDATE, DELETE y demás
+
+    __slots__ = ('texto', 'tipo', 'es_lectura', 'es_insercion', 'es_upsert', 'n_params', 'nombres',
+                 'normalizada', 'tabla_escrita', 'param_id', '_partes', '_multifila')
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        verbo = texto.lstrip()[:6].upper()
+        if verbo.startswith(('SELECT', 'WITH', 'SHOW')):
+            self.tipo = self.LECTURA
+        elif verbo.startswith(('INSERT', 'REPLAC')):
+            self.tipo = self.INSERCION
+        else:
+            self.tipo = self.MODIFICACION
+        self.es_lectura = self.tipo == self.LECTURA
+        self.es_insercion = self.tipo == self.INSERCION
+        # INSERT IGNORE / ON DUPLICATE KEY: lastrowid no identifica cada fila
+        mayus = texto.upper() if self.es_insercion else ''
+        self.es_upsert = 'IGNORE' in mayus or 'ON DUPLICATE KEY' in mayus
+        tabla = None if self.es_lectura else _RE_TABLA_ESCRITA.match(texto)
+        self.tabla_escrita = tabla.group(1).lower() if tabla else None
+        self.nombres = tuple(_RE_NOMBRADO.findall(texto))
+        self.n_params = len(_RE_POSICIONAL.findall(texto))
+        # Posición del parámetro con el id de la fila modificada (None: puede tocar varias)
+        self.param_id = None
+        if self.tipo == self.MODIFICACION and self.tabla_escrita and not self.nombres:
+            por_id = _RE_POR_ID.search(texto)
+            if por_id and not _RE_OR.search(texto, por_id.end()):
+                self.param_id = len(_RE_POSICIONAL.findall(texto, 0, por_id.start()))
+        normalizada = _RE_LISTA_IN.sub('IN (...)', ' '.join(texto.split()))
+        self.normalizada = _RE_TUPLAS_REPETIDAS.sub(r'\1, ...', normalizada)
+        partes = _RE_INSERT_VALUES.match(texto) if self.es_insercion else None
+        if partes and 'DUPLICATE' in partes.group(1).upper():
+            partes = None  # VALUES(col) del ON DUPLICATE, no la tupla de valores
+        self._partes = partes
+        self._multifila = {}
+
+    @property
+    def admite_multifila(self) -> bool:
+        return self._partes is not None
+
+    def multifila(self, n: int) -> 'Query':
+        """Misma inserción con n tuplas en VALUES y marcadores posicionales (cacheada por n)"""
+        query = self._multifila.get(n)
+        if query is None:
+            prefijo, valores, sufijo = self._partes.groups()
+            valores = _RE_NOMBRADO.sub('%s', valores)
+            query = self._multifila[n] = Query(prefijo + ', '.join([valores] * n) + sufijo)
+        return query
+
+    def aplanar(self, filas) -> tuple:
+        """Parámetros de varias filas (tuplas o dicts) en una sola tupla posicional"""
+        if self.nombres:
+            nombres = self.nombres
+            return tuple([fila[n] for fila in filas for n in nombres])
+        return tuple([v for fila in filas for v in fila])
+
+    @staticmethod
+    def compilar(texto) -> 'Query':
+        """Devuelve la Query cacheada para ese texto (o la misma si ya es Query)"""
+        if type(texto) is Query:
+            return texto
+        query = _CACHE.get(texto)
+        if query is None:
+            if len(_CACHE) >= _CACHE_MAX:
+                _CACHE.clear()  # textos dinámicos fuera de control: empezar de nuevo
+            query = _CACHE[texto] = Query(texto)
+        return query
+
+    def __repr__(self):
+        return f"Query({self.tipo}, {self.normalizada[:60]!r})"
+
+
+# ====================== IDENTIFICADORES DINÁMICOS ======================
+def validar_tabla(tabla: str) -> str:
+    if tabla not in ESQUEMA:
+        raise ValueError(f"Tabla no permitida: {tabla}")
+    return tabla
+
+
+def validar_columnas(tabla: str, columnas: Iterable[str]) -> Tuple[str, ...]:
+    permitidas = ESQUEMA[validar_tabla(tabla)]
+    columnas = tuple(columnas)
+    for columna in columnas:
+        if columna not in permitidas:
+            raise ValueError(f"Columna no permitida en {tabla}: {columna}")
+    return columnas
+
+
+_UPDATES = {}
+_PROYECCIONES = {}
+
+
+def query_actualizar(tabla: str, columnas: Tuple[str, ...]) -> Query:
+    """UPDATE ... SET c1 = %s, c2 = %s WHERE id = %s, cacheado por conjunto de columnas"""
+    clave = (tabla, columnas)
+    query = _UPDATES.get(clave)
+    if query is None:
+        validar_columnas(tabla, columnas)
+        sets = ', '.join(f"{c} = %s" for c in columnas)
+        query = _UPDATES[clave] = Query(f"UPDATE {tabla} SET {sets} WHERE id = %s")
+    return query
+
+
+def query_proyeccion(tabla: str, columnas: Tuple[str, ...], por_id: bool = False,
+                     orden: str = '') -> Query:
+    """SELECT c1, c2 FROM tabla [WHERE id = %s] [ORDER BY ...], cacheado por columnas"""
+    clave = (tabla, columnas, por_id, orden)
+    query = _PROYECCIONES.get(clave)
+    if query is None:
+        validar_columnas(tabla, columnas)
+        texto = f"SELECT {', '.join(columnas)} FROM {tabla}"
+        if por_id:
+            texto += " WHERE id = %s"
+        if orden:
+            texto += f" ORDER BY {orden}"  # lo fija el modelo, nunca el usuario
+        query = _PROYECCIONES[clave] = Query(texto)
+    return query
+
+
+@lru_cache(maxsize=256)
+def query_generica(plantilla: str, tabla: str, columna: str = 'id') -> Query:
+    """Consultas de BaseModel con tabla/columna validadas y texto cacheado"""
+    validar_columnas(tabla, (columna,))
+    return Query(plantilla.format(tabla=tabla, columna=columna))
@@ -1,58 +1,170 @@
 # model/registro_tiempo.py - Corregido
-from model.base_model import BaseModel
-from datetime import datetime, date
-from typing import List, Dict, Optional
+from model.base_model import BaseModel, cacheado, transaccional
+from model.filas import FilasCompactas
+from model.horas_diarias import HorasDiarias
+from typing import List, Dict, Optional, Iterator
 
 class RegistroTiempo(BaseModel):
     """Modelo optimizado para registro de horas"""
     
+    _SQL_INSERTAR = """
+        INSERT INTO registro_tiempo 
+        (empleado_id, proyecto_id, fecha, horas, descripcion)
+        VALUES (%s, %s, %s, %s, %s)
+    """
+    
+    # Tope de horas por empleado y día, sumando todos sus proyectos
+    HORAS_MAX_DIA = 24
+    
+    # Validación dentro del propio INSERT: una sola ida y vuelta.
+    # Sin empleado, sin proyecto (o sin asignación) o pasado el tope, el SELECT
+    # no produce filas y no se inserta nada. En MySQL el SELECT sobre registro_tiempo
+    # bloquea el rango (empleado, fecha) del índice: dos registros simultáneos
+    # del mismo día no pueden superar el tope entre los dos.
+    _SQL_REGISTRAR = """
+        INSERT INTO registro_tiempo (empleado_id, proyecto_id, fecha, horas, descripcion)
+        SELECT e.id, p.id, %s, %s, %s
+        FROM empleado e
+        JOIN proyecto p ON p.id = %s
+        WHERE e.id = %s
+          AND ROUND((SELECT COALESCE(SUM(r.horas), 0) FROM registro_tiempo r
+                     WHERE r.empleado_id = e.id AND r.fecha = %s) + %s, 2) <= %s
+    """
+    _SQL_REGISTRAR_ASIGNADO = _SQL_REGISTRAR + """
+          AND EXISTS (SELECT 1 FROM asignacion_proyecto a
+                      WHERE a.empleado_id = e.id AND a.proyecto_id = p.id)
+    """
+    # Solo cuando el INSERT no insertó: explica por qué
+    _SQL_MOTIVO_RECHAZO = """
+        SELECT (SELECT COUNT(*) FROM empleado WHERE id = %s) AS empleado,
+               (SELECT COUNT(*) FROM proyecto WHERE id = %s) AS proyecto,
+               (SELECT COUNT(*) FROM asignacion_proyecto
+                WHERE empleado_id = %s AND proyecto_id = %s) AS asignado,
+               (SELECT COALESCE(SUM(horas), 0) FROM registro_tiempo
+                WHERE empleado_id = %s AND fecha = %s) AS horas_dia
+    """
+    
     def registrar(self, empleado_id: int, proyecto_id: int, 
-                  fecha: str, horas: float, descripcion: str = "") -> Optional[int]:
-        """Registro optimizado con validaciones"""
-        # Validaciones rápidas
-        if not (0 < horas <= 24):
+                  fecha: str, horas: float, descripcion: str = "",
+                  exigir_asignacion: bool = False) -> Optional[int]:
+        """
+        Registra horas en una sola sentencia (INSERT ... SELECT) que valida empleado,
+        proyecto, el tope diario de HORAS_MAX_DIA y, con exigir_asignacion=True,
+        que el empleado esté asignado al proyecto.
+        """
+        # Validaciones rápidas (sobre el valor redondeado, el que se guarda: 0.004 → 0.00)
+        horas = round(horas, 2)
+        if not (0 < horas <= self.HORAS_MAX_DIA):
             print("❌ Horas deben estar entre 0.1 y 24")
             return None
         
-        try:
-            datetime.strptime(fecha, "%Y-%m-%d")
-        except ValueError:
+        if not self._es_fecha_iso(fecha):
             print("❌ Formato de fecha inválido (YYYY-MM-DD)")
             return None
         
-        # Verificar existencia (consultas separadas para claridad)
-        from model.empleado import Empleado
-        from model.proyecto import Proyecto
-        
-        if not Empleado().buscar_por_id(empleado_id):
-            print(f"❌ Empleado ID {empleado_id} no existe")
-            return None
-        
-        if not Proyecto().buscar_por_id(proyecto_id):
-            print(f"❌ Proyecto ID {proyecto_id} no existe")
-            return None
-        
-        # Insertar
-        query = """
-            INSERT INTO registro_tiempo 
-            (empleado_id, proyecto_id, fecha, horas, descripcion)
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        
-        registro_id = self.ejecutar(query, (
-            empleado_id, proyecto_id, fecha, 
-            round(horas, 2), descripcion.strip() or None
-        ))
+        query = self._SQL_REGISTRAR_ASIGNADO if exigir_asignacion else self._SQL_REGISTRAR
+        params = (fecha, horas, descripcion.strip() or None,
+                  proyecto_id, empleado_id, fecha, horas, self.HORAS_MAX_DIA)
+        if HorasDiarias.mantenida_por_triggers():
+            registro_id = self.ejecutar(query, params)
+        else:
+            registro_id = self._insertar_sumando(query, params, (empleado_id, proyecto_id, fecha, horas))
         
         if registro_id:
             print(f"✅ Horas registradas (ID: {registro_id})")
             return registro_id
+        if registro_id == 0:
+            print(f"❌ {self._motivo_rechazo(empleado_id, proyecto_id, fecha, horas, exigir_asignacion)}")
         return None
     
-    def listar_por_empleado(self, empleado_id: int, **kwargs) -> List[Dict]:
-        fecha_desde = kwargs.get('fecha_desde')
-        fecha_hasta = kwargs.get('fecha_hasta')
+    def _motivo_rechazo(self, empleado_id: int, proyecto_id: int, fecha: str,
+                        horas: float, exigir_asignacion: bool) -> str:
+        estado = self.ejecutar(self._SQL_MOTIVO_RECHAZO, (
+            empleado_id, proyecto_id, empleado_id, proyecto_id, empleado_id, fecha
+        ), fetch_one=True)
+        if not estado:
+            return "No se pudo registrar las horas"
+        if not estado['empleado']:
+            return f"Empleado ID {empleado_id} no existe"
+        if not estado['proyecto']:
+            return f"Proyecto ID {proyecto_id} no existe"
+        if exigir_asignacion and not estado['asignado']:
+            return f"Empleado ID {empleado_id} no está asignado al proyecto {proyecto_id}"
+        disponibles = max(0.0, self.HORAS_MAX_DIA - float(estado['horas_dia']))
+        return (f"Tope de {self.HORAS_MAX_DIA} h diarias: el {fecha} ya tiene "
+                f"{float(estado['horas_dia']):.2f} h (quedan {disponibles:.2f}, se pidieron {horas:.2f})")
+    
+    def registrar_lote(self, registros: List[Dict], chunk_size: int = 500) -> List[Dict]:
+        """
+        Carga masiva de horas (p.ej. un mes de planillas).
+        Cada dict: empleado_id, proyecto_id, fecha, horas y descripcion opcional.
+        Empleados y proyectos se validan con una consulta IN por tabla, y el tope
+        diario con una consulta agrupada de las horas ya cargadas en esas fechas.
+        Devuelve un resultado por registro: {'ok', 'id', 'error'} (id: ver ejecutar_lote).
+        """
+        empleados = self.existen('empleado', (r.get('empleado_id') for r in registros))
+        proyectos = self.existen('proyecto', (r.get('proyecto_id') for r in registros))
+        horas_dia = self._horas_por_dia(
+            empleados, [r.get('fecha') for r in registros if self._es_fecha_iso(r.get('fecha'))]
+        )
         
+        def validar(r: Dict):
+            try:
+                horas = round(float(r.get('horas', 0)), 2)  # se valida lo que se guarda
+            except (TypeError, ValueError):
+                return None, "Horas inválidas"
+            if not (0 < horas <= self.HORAS_MAX_DIA):
+                return None, "Horas deben estar entre 0.1 y 24"
+            if not self._es_fecha_iso(r.get('fecha')):
+                return None, "Formato de fecha inválido (YYYY-MM-DD)"
+            if r.get('empleado_id') not in empleados:
+                return None, f"Empleado ID {r.get('empleado_id')} no existe"
+            if r.get('proyecto_id') not in proyectos:
+                return None, f"Proyecto ID {r.get('proyecto_id')} no existe"
+            clave = (r['empleado_id'], r['fecha'])
+            acumuladas = horas_dia.get(clave, 0.0)
+            if round(acumuladas + horas, 2) > self.HORAS_MAX_DIA:
+                return None, f"Supera el tope de {self.HORAS_MAX_DIA} h del {r['fecha']} ({acumuladas:.2f} h ya cargadas)"
+            horas_dia[clave] = acumuladas + horas
+            descripcion = (r.get('descripcion') or "").strip() or None
+            return (r['empleado_id'], r['proyecto_id'], r['fecha'], horas, descripcion), None
+        
+        escribir = None if HorasDiarias.mantenida_por_triggers() else self._insertar_lote_sumando
+        return self._escribir_lote(self._SQL_INSERTAR, registros, validar, "Registros de horas",
+                                   chunk_size, escribir)
+    
+    # Sin triggers en registro_tiempo (ver model/horas_diarias.py) cada inserción suma al
+    # acumulado en su misma transacción
+    @transaccional(si_falla=None)
+    def _insertar_sumando(self, query, params, registro: tuple) -> Optional[int]:
+        registro_id = self.ejecutar(query, params)
+        if registro_id:
+            HorasDiarias.compartido().sumar([registro])
+        return registro_id
+    
+    @transaccional(si_falla=None)
+    def _insertar_lote_sumando(self, query, filas: List[tuple], chunk_size: int) -> List[Dict]:
+        """El lote es todo o nada: así el acumulado no puede quedar con filas que no se guardaron"""
+        resultados = self.ejecutar_lote(query, filas, chunk_size)
+        HorasDiarias.compartido().sumar(fila[:4] for fila in filas)
+        return resultados
+    
+    def _horas_por_dia(self, empleados: set, fechas: List[str]) -> Dict[tuple, float]:
+        """{(empleado_id, 'YYYY-MM-DD'): horas ya registradas} para esos empleados y fechas"""
+        if not empleados or not fechas:
+            return {}
+        marcadores = ', '.join(['%s'] * len(empleados))
+        query = f"""
+            SELECT empleado_id, fecha, SUM(horas) AS horas
+            FROM registro_tiempo
+            WHERE empleado_id IN ({marcadores}) AND fecha BETWEEN %s AND %s
+            GROUP BY empleado_id, fecha
+        """
+        filas = self.ejecutar(query, (*empleados, min(fechas), max(fechas))) or []
+        return {(f['empleado_id'], str(f['fecha'])): float(f['horas']) for f in filas}
+    
+    @staticmethod
+    def _query_por_empleado(empleado_id: int, fecha_desde=None, fecha_hasta=None):
         query = """
             SELECT rt.*, p.nombre AS proyecto_nombre
             FROM registro_tiempo rt
@@ -69,13 +181,63 @@ class RegistroTiempo(BaseModel):
             params.append(fecha_hasta)
 
         query += " ORDER BY rt.fecha DESC, rt.id DESC"
-        return self.ejecutar(query, tuple(params)) or []
+        return query, tuple(params)
+    
+    def listar_por_empleado(self, empleado_id: int, **kwargs) -> List[Dict]:
+        query, params = self._query_por_empleado(
+            empleado_id, kwargs.get('fecha_desde'), kwargs.get('fecha_hasta'))
+        return self.ejecutar(query, params) or []
+    
+    def pagina_por_empleado(self, empleado_id: int, after: Optional[str] = None,
+                            limit: int = 20, **kwargs) -> Dict:
+        """Página de registros por (fecha, id) descendente: {'filas': [...], 'siguiente': cursor o None}"""
+        condiciones, params = ["rt.empleado_id = %s"], [empleado_id]
+        if kwargs.get('fecha_desde'):
+            condiciones.append("rt.fecha >= %s")
+            params.append(kwargs['fecha_desde'])
+        if kwargs.get('fecha_hasta'):
+            condiciones.append("rt.fecha <= %s")
+            params.append(kwargs['fecha_hasta'])
+        
+        select = """
+            SELECT rt.*, p.nombre AS proyecto_nombre
+            FROM registro_tiempo rt
+            JOIN proyecto p ON rt.proyecto_id = p.id
+        """
+        return self._pagina(select, condiciones, params, (("rt.fecha", "fecha"), ("rt.id", "id")),
+                            descendente=True, after=after, limit=limit)
+    
+    def iter_por_empleado(self, empleado_id: int, tamano_lote: int = None, **kwargs) -> Iterator[Dict]:
+        """Como listar_por_empleado(), pero en streaming (memoria constante)"""
+        query, params = self._query_por_empleado(
+            empleado_id, kwargs.get('fecha_desde'), kwargs.get('fecha_hasta'))
+        return self.iterar(query, params, tamano_lote=tamano_lote)
+    
+    def iter_exportar(self, fecha_desde: Optional[str] = None, fecha_hasta: Optional[str] = None,
+                      formato: str = 'tupla', tamano_lote: int = None) -> FilasCompactas:
+        """
+        Todos los registros (opcionalmente en un rango) para exportar, en streaming y en
+        filas compactas (model/filas.py): columnas en el .columnas del resultado
+        """
+        query = "SELECT id, empleado_id, proyecto_id, fecha, horas, descripcion FROM registro_tiempo"
+        condiciones, params = [], []
+        if fecha_desde:
+            condiciones.append("fecha >= %s")
+            params.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append("fecha <= %s")
+            params.append(fecha_hasta)
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        query += " ORDER BY id"
+        return self.iterar_compacto(query, tuple(params), formato=formato, tamano_lote=tamano_lote)
     
     def total_horas_empleado(self, empleado_id: int, **kwargs) -> float:
+        """Suma sobre horas_diarias: una fila por día y proyecto, no por registro"""
         fecha_desde = kwargs.get('fecha_desde')
         fecha_hasta = kwargs.get('fecha_hasta')
         
-        query = "SELECT COALESCE(SUM(horas), 0) AS total FROM registro_tiempo WHERE empleado_id = %s"
+        query = "SELECT COALESCE(SUM(horas), 0) AS total FROM horas_diarias WHERE empleado_id = %s"
         params = [empleado_id]
 
         if fecha_desde:
@@ -89,19 +251,20 @@ class RegistroTiempo(BaseModel):
         return float(resultado['total']) if resultado else 0.0
     
     @classmethod
+    @cacheado('horas_diarias')
     def estadisticas_globales(cls) -> Dict:
-        """Estadísticas optimizadas con menos consultas"""
-        model = cls()
+        """Estadísticas optimizadas con menos consultas (sobre el acumulado horas_diarias)"""
+        model = cls.compartido()
         
         # Consulta principal para múltiples estadísticas
         query = """
             SELECT 
-                COUNT(DISTINCT rt.empleado_id) AS empleados_con_horas,
-                COUNT(DISTINCT rt.proyecto_id) AS proyectos_activos,
-                COALESCE(SUM(rt.horas), 0) AS total_horas,
-                MIN(rt.fecha) AS fecha_primer,
-                MAX(rt.fecha) AS fecha_ultimo
-            FROM registro_tiempo rt
+                COUNT(DISTINCT hd.empleado_id) AS empleados_con_horas,
+                COUNT(DISTINCT hd.proyecto_id) AS proyectos_activos,
+                COALESCE(SUM(hd.horas), 0) AS total_horas,
+                MIN(hd.fecha) AS fecha_primer,
+                MAX(hd.fecha) AS fecha_ultimo
+            FROM horas_diarias hd
         """
         
         stats = model.ejecutar(query, fetch_one=True) or {}
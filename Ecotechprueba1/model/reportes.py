@@ -0,0 +1,145 @@
+# model/reportes.py - Reportes de horas agregados en la base (una consulta por reporte)
+from typing import List, NamedTuple, Optional, Tuple, Type
+
+from model.base_model import BaseModel, cacheado
+
+
+class HorasEmpleado(NamedTuple):
+    id: int
+    nombre: str
+    departamento: Optional[str]
+    total_horas: float
+    dias_trabajados: int
+
+    @property
+    def promedio_dia(self) -> float:
+        """Horas por día con registro (0 si no registró nada)"""
+        return self.total_horas / self.dias_trabajados if self.dias_trabajados else 0.0
+
+
+class HorasProyecto(NamedTuple):
+    id: int
+    nombre: str
+    estado: Optional[str]
+    total_horas: float
+    empleados: int
+
+
+class HorasDepartamento(NamedTuple):
+    id: Optional[int]  # None → empleados sin departamento
+    nombre: str
+    empleados: int
+    total_horas: float
+
+
+class HorasMes(NamedTuple):
+    mes: str  # 'YYYY-MM'
+    total_horas: float
+    empleados: int
+    proyectos: int
+
+
+class Reportes(BaseModel):
+    """
+    Reportes de horas calculados con GROUP BY: el acumulado horas_diarias (una fila
+    por empleado, proyecto y día) se agrega una vez y luego se une a las tablas
+    maestras, así el costo es una consulta sin importar cuántos empleados o registros haya.
+    Todos aceptan un rango opcional fecha_desde / fecha_hasta (YYYY-MM-DD, inclusivo).
+    """
+
+    @staticmethod
+    def _rango(fecha_desde: Optional[str], fecha_hasta: Optional[str]) -> Tuple[str, tuple]:
+        condiciones, params = [], []
+        if fecha_desde:
+            condiciones.append("fecha >= %s")
+            params.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append("fecha <= %s")
+            params.append(fecha_hasta)
+        return (" WHERE " + " AND ".join(condiciones) if condiciones else ""), tuple(params)
+
+    def _filas(self, tipo: Type[NamedTuple], query: str, params: tuple) -> list:
+        # SUM llega como Decimal (MySQL) o int (SQLite sin decimales): las columnas float se normalizan
+        flotantes = [c for c, t in tipo.__annotations__.items() if t is float]
+        filas = []
+        for fila in self.ejecutar(query, params) or []:
+            for c in flotantes:
+                fila[c] = float(fila[c] or 0)
+            filas.append(tipo._make([fila[c] for c in tipo._fields]))
+        return filas
+
+    @cacheado('horas_diarias', 'empleado', 'departamento')
+    def horas_por_empleado(self, fecha_desde: Optional[str] = None,
+                           fecha_hasta: Optional[str] = None) -> List[HorasEmpleado]:
+        """Todos los empleados (también los que no registraron horas), por nombre"""
+        filtro, params = self._rango(fecha_desde, fecha_hasta)
+        query = f"""
+            SELECT e.id, e.nombre, d.nombre AS departamento,
+                   COALESCE(r.total_horas, 0) AS total_horas,
+                   COALESCE(r.dias_trabajados, 0) AS dias_trabajados
+            FROM empleado e
+            LEFT JOIN departamento d ON d.id = e.departamento_id
+            LEFT JOIN (
+                SELECT empleado_id, SUM(horas) AS total_horas, COUNT(DISTINCT fecha) AS dias_trabajados
+                FROM horas_diarias{filtro}
+                GROUP BY empleado_id
+            ) r ON r.empleado_id = e.id
+            ORDER BY e.nombre, e.id
+        """
+        return self._filas(HorasEmpleado, query, params)
+
+    @cacheado('horas_diarias', 'proyecto')
+    def horas_por_proyecto(self, fecha_desde: Optional[str] = None,
+                           fecha_hasta: Optional[str] = None) -> List[HorasProyecto]:
+        """Todos los proyectos con sus horas y cuántos empleados las cargaron"""
+        filtro, params = self._rango(fecha_desde, fecha_hasta)
+        query = f"""
+            SELECT p.id, p.nombre, p.estado,
+                   COALESCE(r.total_horas, 0) AS total_horas,
+                   COALESCE(r.empleados, 0) AS empleados
+            FROM proyecto p
+            LEFT JOIN (
+                SELECT proyecto_id, SUM(horas) AS total_horas, COUNT(DISTINCT empleado_id) AS empleados
+                FROM horas_diarias{filtro}
+                GROUP BY proyecto_id
+            ) r ON r.proyecto_id = p.id
+            ORDER BY p.fecha_inicio DESC, p.nombre
+        """
+        return self._filas(HorasProyecto, query, params)
+
+    @cacheado('horas_diarias', 'empleado', 'departamento')
+    def horas_por_departamento(self, fecha_desde: Optional[str] = None,
+                               fecha_hasta: Optional[str] = None) -> List[HorasDepartamento]:
+        """Horas de los empleados de cada departamento; los sin departamento van juntos al final"""
+        filtro, params = self._rango(fecha_desde, fecha_hasta)
+        query = f"""
+            SELECT d.id, COALESCE(d.nombre, 'Sin departamento') AS nombre,
+                   COUNT(e.id) AS empleados,
+                   COALESCE(SUM(r.total_horas), 0) AS total_horas
+            FROM empleado e
+            LEFT JOIN departamento d ON d.id = e.departamento_id
+            LEFT JOIN (
+                SELECT empleado_id, SUM(horas) AS total_horas
+                FROM horas_diarias{filtro}
+                GROUP BY empleado_id
+            ) r ON r.empleado_id = e.id
+            GROUP BY d.id, d.nombre
+            ORDER BY d.id IS NULL, nombre
+        """
+        return self._filas(HorasDepartamento, query, params)
+
+    @cacheado('horas_diarias')
+    def horas_por_mes(self, fecha_desde: Optional[str] = None,
+                      fecha_hasta: Optional[str] = None) -> List[HorasMes]:
+        """Un renglón por mes con horas registradas, en orden cronológico"""
+        filtro, params = self._rango(fecha_desde, fecha_hasta)
+        query = f"""
+            SELECT DATE_FORMAT(fecha, '%%Y-%%m') AS mes,
+                   SUM(horas) AS total_horas,
+                   COUNT(DISTINCT empleado_id) AS empleados,
+                   COUNT(DISTINCT proyecto_id) AS proyectos
+            FROM horas_diarias{filtro}
+            GROUP BY mes
+            ORDER BY mes
+        """
+        return self._filas(HorasMes, query, params)
@@ -1,19 +1,30 @@
 # model/usuario.py - Corregido
 from model.base_model import BaseModel
-import bcrypt
 from typing import Dict, Optional, List
 
+
+def _hash_password(password: str) -> str:
+    import bcrypt  # extensión nativa: se carga recién al primer uso, no en el arranque
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=10)).decode('utf-8')
+
+
+def _verificar_password(password: str, password_hash: str) -> bool:
+    import bcrypt
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
 class Usuario(BaseModel):
     """Modelo Usuario optimizado"""
     
+    # buscar_por_id / buscar_por_ids (BaseModel, con CacheEntidades): sin el hash de la contraseña
+    TABLA = 'usuario'
+    _SQL_POR_IDS = "SELECT id, username, rol, creado_en FROM usuario WHERE id IN ({ids})"
+    
     def crear_admin(self) -> bool:
         """Crea usuario admin por defecto si no existe"""
         try:
-            if not self.existe('admin'):
-                password_hash = bcrypt.hashpw(
-                    b'admin123', 
-                    bcrypt.gensalt(rounds=10)
-                ).decode('utf-8')
+            if not self.existe_username('admin'):
+                password_hash = _hash_password('admin123')
                 
                 query = """
                     INSERT INTO usuario (username, password_hash, rol) 
@@ -24,7 +35,7 @@ class Usuario(BaseModel):
             print(f"Error al crear admin: {e}")
         return False
     
-    def existe(self, username: str) -> bool:
+    def existe_username(self, username: str) -> bool:
         query = "SELECT 1 FROM usuario WHERE username = %s LIMIT 1"
         return bool(self.ejecutar(query, (username,), fetch_one=True))
     
@@ -34,10 +45,7 @@ class Usuario(BaseModel):
                 print(f"❌ Rol inválido: {rol}")
                 return None
                 
-            password_hash = bcrypt.hashpw(
-                password.encode('utf-8'), 
-                bcrypt.gensalt(rounds=10)
-            ).decode('utf-8')
+            password_hash = _hash_password(password)
             
             query = """
                 INSERT INTO usuario (username, password_hash, rol) 
@@ -56,7 +64,7 @@ class Usuario(BaseModel):
             return None
         
         try:
-            if bcrypt.checkpw(password.encode('utf-8'), resultado['password_hash'].encode('utf-8')):
+            if _verificar_password(password, resultado['password_hash']):
                 return {
                     'id': resultado['id'],
                     'username': resultado['username'],
@@ -71,10 +79,7 @@ class Usuario(BaseModel):
     
     def cambiar_contraseña(self, usuario_id: int, nueva_contraseña: str) -> bool:
         try:
-            password_hash = bcrypt.hashpw(
-                nueva_contraseña.encode('utf-8'), 
-                bcrypt.gensalt(rounds=10)
-            ).decode('utf-8')
+            password_hash = _hash_password(nueva_contraseña)
             
             query = "UPDATE usuario SET password_hash = %s WHERE id = %s"
             return bool(self.ejecutar(query, (password_hash, usuario_id)))